@@ -1,24 +1,43 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel
-
-from app.models.cv_model import CVBase, CVCreateUpdate
+from pydantic import BaseModel, Field
+from pymongo.errors import DuplicateKeyError
+
+from app.models.cv_model import CVBase, CVBatch, CVBatchRequest, CVBulkPatch, CVCreateUpdate, CVPage
+from app.services.cv_export import EXPORT_FORMATS, export_cvs, parquet_available
+from app.services.cv_import import import_cvs, iter_csv_rows, iter_ndjson_rows
+from app.services.suggest import SUGGEST_FIELDS, service as suggest_service
+from app.services.vocabulary import LANGUAGES, SKILLS, vocabulary
+from app.utils.pagination import KEYSET_SORT_FIELDS, InvalidCursor
+from app.utils.serialization import FastJSONResponse
+from app.utils.text_search import fold, text_filter
 from app.services.cv_service import (
+    CV_FIELDS,
+    FACET_FIELDS,
+    facet_counts,
     list_cvs,
+    list_cvs_page,
     get_cv,
+    get_cvs_by_ids,
     create_cv,
     update_cv,
     delete_cv,
+    patch_cvs,
     get_top_skills,
     get_top_locations,
     get_education_distribution,
     get_experience_stats,
+    get_top_languages,
     match_candidates,
     count_cvs,
 )
 
-router = APIRouter()
+# CV documents leave cv_helper in API shape: handlers returning them send a
+# FastJSONResponse directly (response_model only documents the schema)
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 
@@ -27,15 +46,26 @@ router = APIRouter()
 
 # ---------------- Dashboard ----------------
 @router.get("/dashboard")
-def get_dashboard():
+async def get_dashboard():
     try:
-        total_cvs = count_cvs()  # ✅ fast count
-        top_skills = get_top_skills(limit=5)
-        top_locations = get_top_locations(limit=5)
-        education_distribution = get_education_distribution()
-        skills_distribution = get_top_skills(limit=50)
-        experience_levels = get_experience_stats()
-        recent = list_cvs({}, skip=0, limit=5, sort_by="created_at", sort_order=-1)
+        # Independent queries, run concurrently on the event loop
+        (
+            total_cvs,
+            top_skills,
+            top_locations,
+            education_distribution,
+            skills_distribution,
+            experience_levels,
+            recent,
+        ) = await asyncio.gather(
+            count_cvs(),  # ✅ fast count
+            get_top_skills(limit=5),
+            get_top_locations(limit=5),
+            get_education_distribution(),
+            get_top_skills(limit=50),
+            get_experience_stats(),
+            list_cvs({}, skip=0, limit=5, sort_by="created_at", sort_order=-1),
+        )
 
         return {
             "total_cvs": total_cvs,
@@ -52,40 +82,66 @@ def get_dashboard():
 
 # ---------------- Analytics ----------------
 @router.get("/analytics/skills")
-def analytics_skills(limit: int = 10):
-    return get_top_skills(limit)
+async def analytics_skills(limit: int = 10):
+    return await get_top_skills(limit)
 
 
 @router.get("/analytics/locations")
-def analytics_locations(limit: int = 10):
-    return get_top_locations(limit)
+async def analytics_locations(limit: int = 10):
+    return await get_top_locations(limit)
+
+
+@router.get("/analytics/languages")
+async def analytics_languages(limit: int = 10):
+    return await get_top_languages(limit)
 
 
 @router.get("/analytics/education")
-def analytics_education():
-    return get_education_distribution()
+async def analytics_education():
+    return await get_education_distribution()
 
 
 @router.get("/analytics/experience")
-def analytics_experience():
-    return get_experience_stats()
+async def analytics_experience():
+    return await get_experience_stats()
 
 
 # ---------------- Candidate Matching ----------------
 class JobDescription(BaseModel):
     skills: List[str]
-    min_experience: int = 0
-    top_n: int = 5
+    min_experience: int = Field(0, ge=0)
+    top_n: int = Field(5, ge=1, le=100)
+    required_skills: List[str] = []  # candidates must have all of these
+    weights: Dict[str, float] = {}  # per-skill weight, default 1
 
 
 @router.post("/match")
-def match_candidates_to_job(job: JobDescription):
-    return match_candidates(job.skills, job.min_experience, job.top_n)
+async def match_candidates_to_job(job: JobDescription):
+    return await match_candidates(
+        job.skills,
+        job.min_experience,
+        job.top_n,
+        required_skills=job.required_skills,
+        weights=job.weights,
+    )
+
+
+# ---------------- Autocomplete ----------------
+@router.get("/suggest")
+async def suggest_values(
+    field: str = Query(..., pattern=f"^({'|'.join(SUGGEST_FIELDS)})$", description="Field to complete"),
+    prefix: str = Query("", max_length=100, description="Case- and accent-insensitive prefix"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Most common existing values starting with `prefix`, with CV counts (in-memory, no database access)."""
+    suggestions = suggest_service.suggest(field, prefix, limit)
+    if suggestions is None:
+        raise HTTPException(status_code=503, detail="Suggestions are warming up, retry shortly", headers={"Retry-After": "1"})
+    return suggestions
 
 
 # ---------------- CV CRUD + Filters ----------------
-@router.get("/", response_model=List[CVBase])
-def get_all_cvs(
+async def cv_filters(
     search: str = Query(None),
     full_name: str = Query(None),
     email: str = Query(None),
@@ -96,66 +152,60 @@ def get_all_cvs(
     languages_mode: str = Query("or", regex="^(and|or)$", description="Language filter mode"),
     education: str = Query(None),
     experience: str = Query(None),
+    text_match: str = Query("contains", pattern="^(contains|prefix)$", description="How full_name, location, education and experience match"),
     min_experience_years: Optional[int] = Query(None, ge=0),
     max_experience_years: Optional[int] = Query(None, ge=0),
     created_from: Optional[str] = Query(None, description="Filter CVs created after this date (YYYY-MM-DD)"),
     created_to: Optional[str] = Query(None, description="Filter CVs created before this date (YYYY-MM-DD)"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
-    sort_by: str = Query("created_at"),
-    order: str = Query("desc"),
-):
+) -> Dict[str, Any]:
+    """Mongo filter from the list query parameters (shared by list and export)."""
     filters = {}
 
     # Full-text search
     if search:
         filters["$text"] = {"$search": search}
+    # Case/accent-insensitive text filters on the indexed shadow fields
     if full_name:
-        filters["full_name"] = {"$regex": full_name, "$options": "i"}
+        filters.update(text_filter("full_name", full_name, text_match))
     if email:
-        filters["email"] = {"$regex": f"^{email}$", "$options": "i"}
+        filters["_search.email"] = fold(email)
     if location:
-        filters["location"] = {"$regex": location, "$options": "i"}
+        filters.update(text_filter("location", location, text_match))
 
-    # ---- Skills filter
+    # ---- Skills filter (on interned IDs: any alias or spelling matches)
     if skills:
-        skill_list = [s.strip() for s in skills.split(",")]
+        skill_ids = vocabulary.ids(SKILLS, skills.split(","))
         if skills_mode == "and":
-            filters["skills"] = {"$all": skill_list}
+            filters["skill_ids"] = {"$all": skill_ids}
         else:
-            filters["skills"] = {"$in": skill_list}
+            filters["skill_ids"] = {"$in": skill_ids}
 
     # ---- Languages filter
     if languages:
-        lang_list = [l.strip() for l in languages.split(",")]
+        language_ids = vocabulary.ids(LANGUAGES, languages.split(","))
         if languages_mode == "and":
-            filters["languages"] = {"$all": lang_list}
+            filters["language_ids"] = {"$all": language_ids}
         else:
-            filters["languages"] = {"$in": lang_list}
+            filters["language_ids"] = {"$in": language_ids}
 
     # ---- OR filters for nested fields
+    # (education covers degree + school, experience covers title + company)
     or_filters = []
     if education:
-        or_filters.extend([
-            {"education.degree": {"$regex": education, "$options": "i"}},
-            {"education.school": {"$regex": education, "$options": "i"}},
-        ])
+        or_filters.append(text_filter("education", education, text_match))
     if experience:
-        or_filters.extend([
-            {"experience.title": {"$regex": experience, "$options": "i"}},
-            {"experience.company": {"$regex": experience, "$options": "i"}},
-        ])
+        or_filters.append(text_filter("experience", experience, text_match))
     if or_filters:
         filters["$or"] = or_filters
 
-    # ---- Experience years range
-    if min_experience_years or max_experience_years:
+    # ---- Experience years range (indexed, precomputed from durations)
+    if min_experience_years is not None or max_experience_years is not None:
         exp_filter = {}
         if min_experience_years is not None:
-            exp_filter["$gte"] = min_experience_years
+            exp_filter["$gte"] = min_experience_years * 12
         if max_experience_years is not None:
-            exp_filter["$lte"] = max_experience_years
-        filters["experience.years"] = exp_filter
+            exp_filter["$lte"] = max_experience_years * 12
+        filters["total_experience_months"] = exp_filter
 
     # ---- Date range
     date_filter = {}
@@ -172,37 +222,184 @@ def get_all_cvs(
     if date_filter:
         filters["created_at"] = date_filter
 
+    return filters
+
+
+async def cv_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (the _id is always included), "
+        "e.g. full_name,location,skills. Default: every field",
+    ),
+) -> Optional[List[str]]:
+    """Sparse fieldset: becomes the Mongo projection and trims the response."""
+    if not fields:
+        return None
+    selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in CV_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(CV_FIELDS)}",
+        )
+    return selected or None
+
+
+@router.get("/", response_model=Union[List[CVBase], CVPage], response_model_exclude_unset=True)
+async def get_all_cvs(
+    filters: Dict[str, Any] = Depends(cv_filters),
+    fields: Optional[List[str]] = Depends(cv_fields),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    sort_by: str = Query("created_at"),
+    order: str = Query("desc"),
+    paginate: str = Query("offset", pattern="^(offset|cursor)$", description="offset = skip/limit list, cursor = {items, next_cursor}"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (implies paginate=cursor)"),
+    facets: Optional[str] = Query(None, description=f"Comma-separated facets to count over all matches ({', '.join(FACET_FIELDS)}); the response becomes {{items, facets}}"),
+    facet_limit: int = Query(10, ge=1, le=100, description="Values returned per facet"),
+):
+    search = "$text" in filters
+    facet_names = [f.strip() for f in facets.split(",") if f.strip()] if facets else []
+    unknown = [f for f in facet_names if f not in FACET_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown facets: {', '.join(unknown)}. Allowed: {', '.join(FACET_FIELDS)}")
+
+    async def counts():
+        return await facet_counts(filters, facet_names, facet_limit) if facet_names else None
+
     # Sorting
     sort_order = -1 if order.lower() == "desc" else 1
-    cvs = list_cvs(filters, skip, limit, sort_by, sort_order, search=bool(search))
 
-    return cvs
+    # Keyset pagination
+    if paginate == "cursor" or cursor:
+        if sort_by not in KEYSET_SORT_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Cursor pagination supports sort_by in {', '.join(KEYSET_SORT_FIELDS)}")
+        if sort_by == "score" and not search:
+            raise HTTPException(status_code=400, detail="sort_by=score requires a search query")
+        try:
+            (items, next_cursor), facet_results = await asyncio.gather(
+                list_cvs_page(filters, limit, sort_by, sort_order, cursor=cursor, fields=fields), counts()
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        page = {"items": items, "next_cursor": next_cursor}
+        if facet_results is not None:
+            page["facets"] = facet_results
+        return FastJSONResponse(page)
+
+    cvs, facet_results = await asyncio.gather(
+        list_cvs(filters, skip, limit, sort_by, sort_order, search=search, fields=fields), counts()
+    )
+    if facet_results is not None:
+        return FastJSONResponse({"items": cvs, "facets": facet_results})
+
+    return FastJSONResponse(cvs)
+
+
+# ---------------- Bulk import ----------------
+@router.post("/bulk")
+async def bulk_import_cvs(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Defaults to the Content-Type (text/csv or NDJSON)"),
+    batch_size: int = Query(1000, ge=1, le=10000),
+    max_errors: int = Query(1000, ge=0, le=100000, description="Row errors listed in the report"),
+):
+    """Stream an NDJSON or CSV body of CVs; returns a per-row error report."""
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "ndjson"
+    parse = iter_csv_rows if format == "csv" else iter_ndjson_rows
+    return await import_cvs(parse(request.stream()), batch_size=batch_size, max_errors=max_errors)
+
+
+@router.patch("/bulk")
+async def bulk_patch_cvs(patch: CVBulkPatch):
+    """Partial updates of many CVs in one bulk_write, e.g.
+    {"operations": [{"ids": [...], "add_to_set": {"skills": ["Kubernetes"]}}]}.
+    Returns matched/modified counts, the ids that were not found and those
+    that kept being written concurrently (`conflicts`, not patched)."""
+    return await patch_cvs(patch)
+
+
+# ---------------- Streaming export ----------------
+@router.get("/export")
+async def export_all_cvs(
+    filters: Dict[str, Any] = Depends(cv_filters),
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    sort_by: str = Query("created_at", pattern="^(created_at|updated_at|full_name)$"),
+    order: str = Query("desc"),
+    batch_size: int = Query(1000, ge=1, le=10000, description="Documents fetched per cursor round trip"),
+):
+    """Stream every CV matching the list filters from a single cursor."""
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    media_type, extension = EXPORT_FORMATS[format]
+    sort_order = -1 if order.lower() == "desc" else 1
+    filename = f"cvs-{datetime.utcnow():%Y%m%d-%H%M%S}.{extension}"
+    return StreamingResponse(
+        export_cvs(filters, format, sort_by, sort_order, batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ---------------- Batch read ----------------
+MAX_BATCH_IDS = 500
+
 
+async def _batch(ids: List[str], fields: Optional[List[str]]):
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per batch")
+    items, missing = await get_cvs_by_ids(ids, fields)
+    return FastJSONResponse({"items": items, "missing": missing})
 
-@router.get("/{cv_id}", response_model=CVBase)
-def get_cv_by_id(cv_id: str):
-    cv = get_cv(cv_id)
+
+@router.get("/batch", response_model=CVBatch, response_model_exclude_unset=True)
+async def get_cvs_batch(
+    ids: str = Query(..., description=f"Comma-separated CV ids (at most {MAX_BATCH_IDS})"),
+    fields: Optional[List[str]] = Depends(cv_fields),
+):
+    """Resolve many CVs in one query; items keep the order of `ids`."""
+    return await _batch([i.strip() for i in ids.split(",") if i.strip()], fields)
+
+
+@router.post("/batch", response_model=CVBatch, response_model_exclude_unset=True)
+async def post_cvs_batch(body: CVBatchRequest, fields: Optional[List[str]] = Depends(cv_fields)):
+    """Same as GET /batch, for id lists too long for a URL."""
+    return await _batch(body.ids, fields)
+
+
+@router.get("/{cv_id}", response_model=CVBase, response_model_exclude_unset=True)
+async def get_cv_by_id(cv_id: str, fields: Optional[List[str]] = Depends(cv_fields)):
+    cv = await get_cv(cv_id, fields)
     if not cv:
         raise HTTPException(status_code=404, detail="CV not found")
-    return cv
+    return FastJSONResponse(cv)
 
 
 @router.post("/", response_model=CVBase)
-def create_cv_route(cv_data: CVCreateUpdate):
-    return create_cv(cv_data)
+async def create_cv_route(cv_data: CVCreateUpdate):
+    try:
+        created = await create_cv(cv_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Email already exists")
+    return FastJSONResponse(created)
 
 
 @router.put("/{cv_id}", response_model=CVBase)
-def update_cv_route(cv_id: str, updated_data: CVCreateUpdate):
-    updated = update_cv(cv_id, updated_data)
+async def update_cv_route(cv_id: str, updated_data: CVCreateUpdate):
+    try:
+        updated = await update_cv(cv_id, updated_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Email already exists")
     if not updated:
         raise HTTPException(status_code=404, detail="CV not found")
-    return updated
+    return FastJSONResponse(updated)
 
 
 @router.delete("/{cv_id}", response_model=dict)
-def delete_cv_route(cv_id: str):
-    deleted = delete_cv(cv_id)
+async def delete_cv_route(cv_id: str):
+    deleted = await delete_cv(cv_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="CV not found")
     return deleted
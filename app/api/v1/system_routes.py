@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core.database import get_pool_stats
+from app.core.principal_cache import principal_cache
+from app.dependencies.roles import require_roles
+from app.services.match_engine import engine as match_engine
+from app.services.password_hasher import hasher
+from app.services.query_cache import cache as query_cache
+from app.services.query_profiler import profiler as query_profiler
+from app.services.suggest import service as suggest_service
+
+router = APIRouter(tags=["System"])
+
+
+# ---- MongoDB connection pool
+@router.get("/pool")
+async def pool_stats():
+    """Connection pool counters for this worker's shared MongoDB client."""
+    return get_pool_stats()
+
+
+# ---- In-memory match engine
+@router.get("/match-engine")
+async def match_engine_status():
+    index = match_engine.index
+    return {"ready": match_engine.ready, "candidates": len(index) if index is not None else 0}
+
+
+# ---- Autocomplete index
+@router.get("/suggest-index")
+async def suggest_index_status():
+    return suggest_service.stats()
+
+
+# ---- Authenticated principal cache
+@router.get("/principal-cache")
+async def principal_cache_stats():
+    """Hit/miss counters of get_current_user's per-worker cache."""
+    return principal_cache.stats()
+
+
+# ---- Password hashing pool
+@router.get("/password-hasher")
+async def password_hasher_stats():
+    return hasher.stats()
+
+
+# ---- Query result cache
+@router.get("/query-cache")
+async def query_cache_stats():
+    """Hit ratio and latency of the list/analytics query cache (this worker)."""
+    return query_cache.stats()
+
+
+# ---- Slow queries (QUERY_PROFILER_ENABLED)
+@router.get("/slow-queries", dependencies=[Depends(require_roles("admin"))])
+async def slow_queries(limit: int = Query(50, ge=1, le=500)):
+    """Recent slow queries and per-shape totals, with explain() findings
+    (COLLSCAN, in-memory SORT, docs examined per returned document)."""
+    return query_profiler.report(limit)
+
+
+@router.delete("/slow-queries", dependencies=[Depends(require_roles("admin"))])
+async def reset_slow_queries():
+    query_profiler.reset()
+    return {"message": "Slow query log cleared"}
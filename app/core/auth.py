@@ -2,7 +2,9 @@ from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from app.services.user_service import get_user_by_email, verify_password
+from app.core.config import AUTH_STATELESS
+from app.core.principal_cache import principal_cache
+from app.services.user_service import get_user_by_email, authenticate_user
 from app.models.user_model import UserOut
 
 # Secret & algorithm
@@ -22,6 +24,19 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def token_claims(user: dict) -> dict:
+    """Claims for a user document; enough to rebuild UserOut in stateless mode."""
+    claims = {
+        "sub": user["email"],
+        "role": user.get("role", "candidate"),
+        "uid": str(user["_id"]),
+        "name": user["full_name"],
+    }
+    if user.get("created_at"):
+        claims["created_at"] = user["created_at"].isoformat()
+    return claims
+
+
 def decode_access_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -30,16 +45,13 @@ def decode_access_token(token: str):
         return None
 
 
-# ---- Auth helpers ----
-def authenticate_user(email: str, password: str):
-    user = get_user_by_email(email)
-    if not user or not verify_password(password, user["password"]):
-        return None
-    return user
-
-
 # ---- Dependency: get current user ----
-def get_current_user(token: str = Depends(oauth2_scheme)) -> UserOut:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserOut:
+    # Same token seen recently: no decode, no database round trip
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached
+
     payload = decode_access_token(token)
     if not payload:
         raise HTTPException(
@@ -57,14 +69,28 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserOut:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = get_user_by_email(email)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    if AUTH_STATELESS and all(claim in payload for claim in ("uid", "name", "created_at")):
+        # Signed claims are trusted as is (tokens issued before the profile
+        # claims existed still fall back to the lookup below)
+        current_user = UserOut(
+            id=payload["uid"],
+            full_name=payload["name"],
+            email=email,
+            role=role,
+            created_at=payload["created_at"],
+        )
+    else:
+        user = await get_user_by_email(email)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        current_user = UserOut(**{
+            "id": str(user["_id"]),
+            "full_name": user["full_name"],
+            "email": user["email"],
+            "role": role,  # use role from token
+            "created_at": user["created_at"],
+        })
 
-    return UserOut(**{
-        "id": str(user["_id"]),
-        "full_name": user["full_name"],
-        "email": user["email"],
-        "role": role,  # use role from token
-        "created_at": user["created_at"],
-    })
+    principal_cache.put(email, token, current_user, expires_at=payload.get("exp"))
+    return current_user
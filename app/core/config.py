@@ -1,16 +1,89 @@
 # app/core/config.py
 import os
 from dotenv import load_dotenv
-from pymongo import MongoClient
 
 load_dotenv()
 
+
+def _env_int(name: str, default: int | None) -> int | None:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "cv_database")
-
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
+# "mongo", or "memory" for the in-process repositories (tests, benchmarks; see app/repositories/)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mongo").strip().lower()
 
 # Collections
-user_collection = db["users"]
-cv_collection = db["cvs"]
+USER_COLLECTION = os.getenv("USER_COLLECTION", "users")
+CV_COLLECTION = os.getenv("CV_COLLECTION", "candidates")
+
+# Connection pool (one shared client per worker process)
+MONGO_MAX_POOL_SIZE = _env_int("MONGO_MAX_POOL_SIZE", 100)
+MONGO_MIN_POOL_SIZE = _env_int("MONGO_MIN_POOL_SIZE", 0)
+MONGO_MAX_IDLE_TIME_MS = _env_int("MONGO_MAX_IDLE_TIME_MS", None)
+MONGO_CONNECT_TIMEOUT_MS = _env_int("MONGO_CONNECT_TIMEOUT_MS", 5000)
+MONGO_SERVER_SELECTION_TIMEOUT_MS = _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+MONGO_SOCKET_TIMEOUT_MS = _env_int("MONGO_SOCKET_TIMEOUT_MS", None)
+MONGO_WAIT_QUEUE_TIMEOUT_MS = _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", None)
+# Comma-separated, in order of preference, e.g. "zstd,snappy,zlib"
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+
+# Startup
+MONGO_ENSURE_INDEXES = _env_bool("MONGO_ENSURE_INDEXES", True)
+
+# Materialized analytics counters (see app/services/analytics_store.py)
+CV_STATS_COLLECTION = os.getenv("CV_STATS_COLLECTION", "cv_stats")
+
+# In-process skill matching engine (see app/services/match_engine.py)
+MATCH_ENGINE_ENABLED = _env_bool("MATCH_ENGINE_ENABLED", True)
+# Seconds between full index rebuilds; the index only follows this worker's own
+# writes, so with several workers set this to bound staleness (0 = build once)
+MATCH_ENGINE_REFRESH_SECONDS = _env_int("MATCH_ENGINE_REFRESH_SECONDS", 0)
+
+# In-process autocomplete for GET /cv/suggest (see app/services/suggest.py)
+SUGGEST_ENABLED = _env_bool("SUGGEST_ENABLED", True)
+# Seconds between re-reads of the suggestable fields, for values added by other workers (0 = never)
+SUGGEST_REFRESH_SECONDS = _env_int("SUGGEST_REFRESH_SECONDS", 0)
+
+# Skill/language alias dictionary extending the built-in one (JSON, see app/services/vocabulary.py)
+VOCABULARY_FILE = os.getenv("VOCABULARY_FILE", "")
+
+# Bulk import: processes validating batches in parallel (1 = a thread, no pool)
+IMPORT_WORKERS = _env_int("IMPORT_WORKERS", os.cpu_count() or 1)
+
+# Authentication: cached principals (see app/core/principal_cache.py)
+PRINCIPAL_CACHE_SIZE = _env_int("PRINCIPAL_CACHE_SIZE", 10000)  # 0 = off
+PRINCIPAL_CACHE_TTL_SECONDS = _env_int("PRINCIPAL_CACHE_TTL_SECONDS", 60)
+# Trust the signed token claims and never load the user per request
+AUTH_STATELESS = _env_bool("AUTH_STATELESS", False)
+
+# Password hashing (see app/services/password_hasher.py)
+BCRYPT_ROUNDS = _env_int("BCRYPT_ROUNDS", 12)
+PASSWORD_HASH_WORKERS = _env_int("PASSWORD_HASH_WORKERS", 2)  # 0 = threadpool
+PASSWORD_HASH_QUEUE = _env_int("PASSWORD_HASH_QUEUE", 32)  # waiting hashes before 503
+
+# Query result cache for lists and analytics (see app/services/query_cache.py)
+# The memory backend is per process: a write invalidates only the worker that
+# served it, the others keep returning stale results for up to the TTL.
+# Deployments with several workers should use the redis backend.
+QUERY_CACHE_BACKEND = os.getenv("QUERY_CACHE_BACKEND", "memory")  # memory | redis | off
+QUERY_CACHE_REDIS_URL = os.getenv("QUERY_CACHE_REDIS_URL", "redis://localhost:6379/0")
+QUERY_CACHE_SIZE = _env_int("QUERY_CACHE_SIZE", 1000)
+QUERY_CACHE_TTL_SECONDS = _env_int("QUERY_CACHE_TTL_SECONDS", 30)  # 0 = off
+
+# Prometheus metrics at /metrics (see app/core/metrics.py)
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+
+# Slow-query capture with explain (see app/services/query_profiler.py)
+QUERY_PROFILER_ENABLED = _env_bool("QUERY_PROFILER_ENABLED", False)
+QUERY_PROFILER_THRESHOLD_MS = _env_int("QUERY_PROFILER_THRESHOLD_MS", 100)
+QUERY_PROFILER_BUFFER = _env_int("QUERY_PROFILER_BUFFER", 200)  # recent slow queries kept
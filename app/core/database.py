@@ -1,9 +1,160 @@
-from pymongo import MongoClient
-from app.core.config import MONGO_URI, DB_NAME
+"""Shared MongoDB client.
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
+There is exactly one AsyncMongoClient (and therefore one connection pool)
+per worker process. It is created and warmed in the FastAPI lifespan via
+`connect()`; code running outside the app (scripts, tests) gets it lazily
+from `get_client()`. Nothing here touches the network at import time.
 
-# Collections
-user_collection = db["users"]
-cv_collection = db["cvs"]
\ No newline at end of file
+Services do not use it directly: they go through the repositories of
+app/repositories/mongo.py (see app/core/storage.py).
+"""
+from threading import Lock
+
+from pymongo import AsyncMongoClient, monitoring
+
+from app.core import config, metrics
+
+
+# ---- Pool statistics (fed by PyMongo's CMAP events) ----
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.pools = 0
+        self.open_connections = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.total_checkouts = 0
+        self.checkout_failures = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.pool_clears = 0
+
+    def _add(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def pool_created(self, event):
+        self._add(pools=1)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add(pool_clears=1)
+
+    def pool_closed(self, event):
+        self._add(pools=-1)
+
+    def connection_created(self, event):
+        self._add(open_connections=1, connections_created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(open_connections=-1, connections_closed=1)
+
+    def connection_check_out_started(self, event):
+        self._add(waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(waiting=-1, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._add(waiting=-1, checked_out=1, total_checkouts=1)
+
+    def connection_checked_in(self, event):
+        self._add(checked_out=-1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pools": self.pools,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "available": max(self.open_connections - self.checked_out, 0),
+                "waiting": self.waiting,
+                "total_checkouts": self.total_checkouts,
+                "checkout_failures": self.checkout_failures,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "pool_clears": self.pool_clears,
+            }
+
+
+pool_stats = PoolStatsListener()
+
+metrics.gauge_callback("mongodb_pool_connections_open", "Open pooled connections", lambda: pool_stats.open_connections)
+metrics.gauge_callback("mongodb_pool_connections_checked_out", "Connections in use", lambda: pool_stats.checked_out)
+metrics.gauge_callback("mongodb_pool_waiting", "Operations waiting for a connection", lambda: pool_stats.waiting)
+
+_client: AsyncMongoClient | None = None
+
+
+def client_options() -> dict:
+    """Pool settings for the shared client, read from the environment."""
+    options = {
+        "maxPoolSize": config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": config.MONGO_MIN_POOL_SIZE,
+        "connectTimeoutMS": config.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": config.MONGO_SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "maxIdleTimeMS": config.MONGO_MAX_IDLE_TIME_MS,
+        "event_listeners": [pool_stats, metrics.mongo_listener] if config.METRICS_ENABLED else [pool_stats],
+    }
+    if config.MONGO_COMPRESSORS:
+        options["compressors"] = config.MONGO_COMPRESSORS
+    return {k: v for k, v in options.items() if v is not None}
+
+
+def get_client() -> AsyncMongoClient:
+    """Return the shared client, creating it (without connecting) on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncMongoClient(config.MONGO_URI, **client_options())
+    return _client
+
+
+def get_database():
+    return get_client()[config.DB_NAME]
+
+
+def get_cv_collection():
+    return get_database()[config.CV_COLLECTION]
+
+
+def get_user_collection():
+    return get_database()[config.USER_COLLECTION]
+
+
+def get_stats_collection():
+    return get_database()[config.CV_STATS_COLLECTION]
+
+
+async def connect() -> AsyncMongoClient:
+    """Create the shared client and open its first connection (lifespan startup)."""
+    client = get_client()
+    await client.admin.command("ping")
+    return client
+
+
+async def close():
+    """Close the shared client (lifespan shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+        pool_stats.reset()
+
+
+def get_pool_stats() -> dict:
+    stats = pool_stats.snapshot()
+    stats["max_pool_size"] = config.MONGO_MAX_POOL_SIZE
+    stats["min_pool_size"] = config.MONGO_MIN_POOL_SIZE
+    stats["connected"] = _client is not None
+    return stats
@@ -0,0 +1,198 @@
+"""Index registry: every MongoDB index the app relies on, in one place.
+
+Specs are declarative (key pattern plus options: unique, partial filter,
+collation, text weights) and grouped by collection. They are compared
+with the live indexes (`diff`), created when missing (`build`, also run
+at startup when MONGO_ENSURE_INDEXES is on) and, from the CLI, indexes
+that are no longer declared can be dropped:
+
+    python -m scripts.manage_indexes diff
+    python -m scripts.manage_indexes build [--replace]
+    python -m scripts.manage_indexes drop [--yes]
+
+Compound indexes follow the list query shapes (cv_filters + sort_by):
+equality/multikey filter first, then the default sort (created_at, _id),
+so a filtered first page is an index range scan with no in-memory sort.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from pymongo import IndexModel
+
+from app.core.config import CV_COLLECTION, CV_STATS_COLLECTION, USER_COLLECTION
+from app.utils.text_search import SEARCH_FIELDS, SEARCH_PREFIX
+
+logger = logging.getLogger(__name__)
+
+Keys = List[Tuple[str, Any]]
+
+
+class IndexSpec:
+    def __init__(
+        self,
+        keys: Union[str, Sequence[Tuple[str, Any]]],
+        name: Optional[str] = None,
+        unique: bool = False,
+        partial: Optional[dict] = None,
+        collation: Optional[dict] = None,
+        **options: Any,
+    ):
+        self.keys: Keys = [(keys, 1)] if isinstance(keys, str) else list(keys)
+        self.name = name or "_".join(f"{field}_{direction}" for field, direction in self.keys)
+        self.unique = unique
+        self.partial = partial
+        self.collation = collation
+        self.options = options  # passed through to createIndexes (weights, sparse, ...)
+
+    @property
+    def is_text(self) -> bool:
+        return any(direction == "text" for _, direction in self.keys)
+
+    def model(self) -> IndexModel:
+        options: Dict[str, Any] = {"name": self.name, **self.options}
+        if self.unique:
+            options["unique"] = True
+        if self.partial:
+            options["partialFilterExpression"] = self.partial
+        if self.collation:
+            options["collation"] = self.collation
+        return IndexModel(self.keys, **options)
+
+    def matches(self, info: dict) -> bool:
+        """Whether a live index (a list_indexes document) is this spec."""
+        if self.is_text:
+            # Text key patterns are stored as {_fts, _ftsx}: compare the indexed fields
+            fields = {field for field, direction in self.keys if direction == "text"}
+            if set(info.get("weights", {})) != fields:
+                return False
+        elif list(info["key"].items()) != self.keys:
+            return False
+        if bool(info.get("unique")) != self.unique:
+            return False
+        if info.get("partialFilterExpression") != self.partial:
+            return False
+        live_collation = info.get("collation")
+        if self.collation:
+            # The server fills in every collation default: compare what was declared
+            return live_collation is not None and all(live_collation.get(k) == v for k, v in self.collation.items())
+        return live_collation is None
+
+    def describe(self) -> dict:
+        document = self.model().document
+        return {**document, "key": dict(document["key"])}
+
+
+def _search_indexes() -> List[IndexSpec]:
+    specs = []
+    for name in SEARCH_FIELDS:
+        if name == "location":
+            # Location is the most used filter: it carries the default sort
+            specs.append(IndexSpec([(f"{SEARCH_PREFIX}.location", 1), ("created_at", 1), ("_id", 1)]))
+        else:
+            specs.append(IndexSpec(f"{SEARCH_PREFIX}.{name}"))
+        specs.append(IndexSpec(f"{SEARCH_PREFIX}.{name}_tri"))
+    specs.append(IndexSpec(f"{SEARCH_PREFIX}.email"))
+    return specs
+
+
+INDEXES: Dict[str, List[IndexSpec]] = {
+    CV_COLLECTION: [
+        IndexSpec("email", unique=True),
+        IndexSpec([
+            ("full_name", "text"),
+            ("email", "text"),
+            ("location", "text"),
+            ("education.degree", "text"),
+            ("education.school", "text"),
+            ("experience.title", "text"),
+            ("experience.company", "text"),
+            ("skills", "text"),
+            ("languages", "text"),
+        ]),
+        # Keyset pagination: (sort key, _id) serves both sort directions.
+        # The default list order also carries the summary fields, so
+        # ?fields=full_name,location is answered from the index alone (covered)
+        IndexSpec([("created_at", 1), ("_id", 1), ("full_name", 1), ("location", 1)]),
+        IndexSpec([("updated_at", 1), ("_id", 1)]),
+        IndexSpec([("full_name", 1), ("_id", 1)]),
+        # Tag filters on the interned IDs (multikey) followed by the default sort
+        IndexSpec([("skill_ids", 1), ("created_at", 1), ("_id", 1)]),
+        IndexSpec([("language_ids", 1), ("created_at", 1), ("_id", 1)]),
+        # Experience range filters, matching and stats
+        IndexSpec("total_experience_months"),
+        # Normalized shadow fields: prefix range scans + trigram lookups
+        *_search_indexes(),
+    ],
+    USER_COLLECTION: [
+        # Login and get_current_user look users up by email
+        IndexSpec("email", unique=True),
+    ],
+    CV_STATS_COLLECTION: [
+        IndexSpec([("facet", 1), ("value", 1)], unique=True),
+        IndexSpec([("facet", 1), ("count", -1)]),
+    ],
+}
+
+
+async def _live_indexes(collection) -> List[dict]:
+    return [info async for info in await collection.list_indexes() if info["name"] != "_id_"]
+
+
+async def diff(database, names: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    """Per collection: declared indexes that are missing, live indexes whose
+    definition differs from the spec of the same name, and live indexes
+    that are not declared (candidates for `drop`)."""
+    result = {}
+    for name in names or INDEXES:
+        specs = INDEXES[name]
+        live = await _live_indexes(database[name])
+        by_name = {info["name"]: info for info in live}
+        missing, changed = [], []
+        for spec in specs:
+            info = by_name.get(spec.name)
+            if info is None:
+                if not any(spec.matches(other) for other in live):
+                    missing.append(spec)
+            elif not spec.matches(info):
+                changed.append(spec)
+        extra = [info for info in live if not any(spec.matches(info) for spec in specs)
+                 and info["name"] not in {spec.name for spec in changed}]
+        result[name] = {"missing": missing, "changed": changed, "extra": extra}
+    return result
+
+
+async def build(database, names: Optional[Sequence[str]] = None, replace: bool = False) -> List[str]:
+    """Create missing indexes; with `replace`, rebuild those whose definition
+    changed. Returns the names of the indexes created."""
+    created = []
+    for name, report in (await diff(database, names)).items():
+        collection = database[name]
+        specs = list(report["missing"])
+        if report["changed"]:
+            if replace:
+                for spec in report["changed"]:
+                    await collection.drop_index(spec.name)
+                specs += report["changed"]
+            else:
+                logger.warning("Indexes differ from their spec on %s (rebuild with --replace): %s",
+                               name, ", ".join(spec.name for spec in report["changed"]))
+        if specs:
+            created += await collection.create_indexes([spec.model() for spec in specs])
+    return created
+
+
+async def drop_extra(database, names: Optional[Sequence[str]] = None) -> List[str]:
+    """Drop live indexes that no spec declares (superseded or hand-made)."""
+    dropped = []
+    for name, report in (await diff(database, names)).items():
+        for info in report["extra"]:
+            await database[name].drop_index(info["name"])
+            dropped.append(f"{name}.{info['name']}")
+    return dropped
+
+
+async def ensure(collection, name: Optional[str] = None):
+    """Create the declared indexes of one collection (idempotent). `name`
+    selects the specs when the collection is a staging copy."""
+    specs = INDEXES[name or collection.name]
+    await collection.create_indexes([spec.model() for spec in specs])
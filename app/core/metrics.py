@@ -0,0 +1,249 @@
+"""Prometheus metrics, exposed at GET /metrics (text format 0.0.4).
+
+Self-contained (no prometheus_client): counters, gauges and fixed-bucket
+histograms keyed by label tuples, updated from the event loop thread
+only, so recording is a dict lookup plus a bisect.
+
+Sources:
+- MetricsMiddleware (pure ASGI): request latency per route template,
+  requests by status, in-flight requests, errors by handler
+- MongoMetricsListener (PyMongo command + CMAP events): command latency
+  per collection and command, command failures, pool checkout wait
+- callback gauges registered by other modules (pool occupancy, ...)
+"""
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from pymongo import monitoring
+from starlette.requests import Request
+from starlette.responses import Response
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_label_text(self.labelnames, k)} {_number(v)}" for k, v in self.values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, labels: Labels, value: float):
+        self.values[labels] = value
+
+
+class CallbackGauge:
+    """Gauge read from `fn()` at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float]):
+        self.name, self.help, self.fn = name, help, fn
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_number(self.fn())}"]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last = +Inf), sum]
+        self.series: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REGISTRY: list = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def gauge_callback(name: str, help: str, fn: Callable[[], float]):
+    return register(CallbackGauge(name, help, fn))
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# ---- HTTP
+HTTP_REQUESTS = register(Counter("http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")))
+HTTP_LATENCY = register(Histogram("http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")))
+HTTP_IN_FLIGHT = register(Gauge("http_requests_in_flight", "HTTP requests being served"))
+HTTP_ERRORS = register(Counter("http_request_errors_total", "5xx responses and unhandled exceptions by handler", ("handler", "exception")))
+
+# ---- MongoDB
+MONGO_LATENCY = register(Histogram("mongodb_command_duration_seconds", "MongoDB command latency", ("collection", "command")))
+MONGO_FAILURES = register(Counter("mongodb_command_failures_total", "Failed MongoDB commands", ("collection", "command")))
+MONGO_CHECKOUT = register(Histogram("mongodb_pool_checkout_duration_seconds", "Time waiting for a pooled connection"))
+MONGO_CHECKOUT_FAILURES = register(Counter("mongodb_pool_checkout_failures_total", "Failed connection checkouts", ("reason",)))
+
+
+class MetricsMiddleware:
+    """Pure ASGI (no BaseHTTPMiddleware task/stream overhead)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        exception = ""
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            status, exception = 500, type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            # Route templates keep label cardinality bounded (no raw ids)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.observe((method, template), elapsed)
+            HTTP_REQUESTS.inc((method, template, str(status)))
+            if status >= 500:
+                handler = getattr(getattr(route, "endpoint", None), "__name__", template)
+                HTTP_ERRORS.inc((handler, exception))
+
+
+def _collection(event: monitoring.CommandStartedEvent) -> str:
+    command = event.command
+    if event.command_name == "getMore":
+        return command.get("collection", "")
+    target = command.get(event.command_name)
+    return target if isinstance(target, str) else ""
+
+
+class MongoMetricsListener(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    def __init__(self):
+        # (request id, connection) -> collection, until the command completes
+        self._pending: Dict[tuple, str] = {}
+
+    # -- commands
+    def started(self, event):
+        self._pending[(event.request_id, event.connection_id)] = _collection(event)
+
+    def succeeded(self, event):
+        collection = self._pending.pop((event.request_id, event.connection_id), "")
+        MONGO_LATENCY.observe((collection, event.command_name), event.duration_micros / 1e6)
+
+    def failed(self, event):
+        labels = (self._pending.pop((event.request_id, event.connection_id), ""), event.command_name)
+        MONGO_LATENCY.observe(labels, event.duration_micros / 1e6)
+        MONGO_FAILURES.inc(labels)
+
+    # -- pool
+    def connection_checked_out(self, event):
+        if event.duration is not None:
+            MONGO_CHECKOUT.observe((), event.duration)
+
+    def connection_check_out_failed(self, event):
+        MONGO_CHECKOUT_FAILURES.inc((str(event.reason),))
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+mongo_listener = MongoMetricsListener()
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
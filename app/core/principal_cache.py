@@ -0,0 +1,104 @@
+"""Per-worker cache of authenticated principals.
+
+get_current_user used to decode the JWT and load the user from Mongo on
+every request. Entries here are keyed by the sha256 of the token and
+indexed by subject, so a hit skips both the decode and the lookup, and
+invalidate(subject) drops every token of a user. An entry never outlives
+the token's `exp`, nor PRINCIPAL_CACHE_TTL_SECONDS, which bounds how
+stale a name or role can get when another worker changed the user.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from app.core.config import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS
+
+
+def token_hash(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class PrincipalCache:
+    """Bounded LRU with per-entry expiry (unix seconds)."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60, clock: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        # token hash -> (subject, expires_at, principal), oldest first
+        self._entries: "OrderedDict[bytes, Tuple[str, float, Any]]" = OrderedDict()
+        self._by_subject: Dict[str, Set[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[Any]:
+        """Cached principal for this exact token, or None."""
+        digest = token_hash(token)
+        entry = self._entries.get(digest)
+        if entry is not None:
+            if entry[1] > self.clock():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[2]
+            self._discard(digest)
+        self.misses += 1
+        return None
+
+    def put(self, subject: str, token: str, principal: Any, expires_at: Optional[float] = None):
+        """Cache `principal` until the token's exp or the TTL, whichever is first."""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        deadline = self.clock() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        digest = token_hash(token)
+        self._discard(digest)
+        self._entries[digest] = (subject, deadline, principal)
+        self._by_subject.setdefault(subject, set()).add(digest)
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, subject: str):
+        """Drop every cached token of a subject (the user record changed)."""
+        digests = self._by_subject.pop(subject, ())
+        for digest in digests:
+            self._entries.pop(digest, None)
+        if digests:
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._by_subject.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _discard(self, digest: bytes):
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        digests = self._by_subject.get(entry[0])
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_subject[entry[0]]
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
@@ -0,0 +1,41 @@
+"""Storage backend selection.
+
+Services get their repositories here, never a driver collection. The
+backend follows STORAGE_BACKEND ("mongo" or "memory", see
+app/repositories/) and is created on first use; `use()` swaps it (tests,
+benchmarks).
+"""
+from app.core import config
+from app.repositories.base import CVRepository, StatsRepository, Storage, UserRepository
+
+_storage: Storage | None = None
+
+
+def get_storage() -> Storage:
+    global _storage
+    if _storage is None:
+        if config.STORAGE_BACKEND == "memory":
+            from app.repositories.memory import MemoryStorage
+            _storage = MemoryStorage()
+        else:
+            from app.repositories.mongo import MongoStorage
+            _storage = MongoStorage()
+    return _storage
+
+
+def use(storage: Storage | None):
+    """Replace the backend (None: pick it again from the config on next use)."""
+    global _storage
+    _storage = storage
+
+
+def get_cv_repository() -> CVRepository:
+    return get_storage().cvs
+
+
+def get_stats_repository() -> StatsRepository:
+    return get_storage().stats
+
+
+def get_user_repository() -> UserRepository:
+    return get_storage().users
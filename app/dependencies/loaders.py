@@ -0,0 +1,10 @@
+from app.services.cv_loader import CVLoader
+
+
+async def get_cv_loader() -> CVLoader:
+    """
+    Request-scoped CV dataloader (FastAPI caches it per request, so every
+    dependency and the handler share one instance).
+    Example: loader: CVLoader = Depends(get_cv_loader)
+    """
+    return CVLoader()
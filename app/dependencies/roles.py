@@ -7,7 +7,7 @@ def require_roles(*allowed_roles: str):
     Dependency to restrict access to certain roles.
     Example: Depends(require_roles("admin", "recruiter"))
     """
-    def role_checker(current_user: UserOut = Depends(get_current_user)):
+    async def role_checker(current_user: UserOut = Depends(get_current_user)):
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
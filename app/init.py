@@ -1,15 +1,18 @@
+from app.services.vocabulary import LANGUAGES, SKILLS, vocabulary
+
+
 def sanitize_cv_data(cv_data: dict) -> dict:
     # Trim spaces in strings
     for key, value in cv_data.items():
         if isinstance(value, str):
             cv_data[key] = value.strip()
 
-    # Clean skills and languages: strip, capitalize, remove duplicates
+    # Canonical skills and languages (alias dictionary), duplicates removed
     if "skills" in cv_data and isinstance(cv_data["skills"], list):
-        cv_data["skills"] = list({skill.strip().capitalize() for skill in cv_data["skills"]})
+        cv_data["skills"] = vocabulary.canonicalize(SKILLS, cv_data["skills"])
 
     if "languages" in cv_data and isinstance(cv_data["languages"], list):
-        cv_data["languages"] = list({lang.strip().capitalize() for lang in cv_data["languages"]})
+        cv_data["languages"] = vocabulary.canonicalize(LANGUAGES, cv_data["languages"])
 
     # Clean education and experience entries
     if "education" in cv_data:
@@ -24,6 +27,6 @@ def sanitize_cv_data(cv_data: dict) -> dict:
                 if isinstance(v, str):
                     exp[k] = v.strip()
             if "technologies" in exp and isinstance(exp["technologies"], list):
-                exp["technologies"] = list({tech.strip().capitalize() for tech in exp["technologies"]})
+                exp["technologies"] = vocabulary.canonicalize(SKILLS, exp["technologies"])
 
     return cv_data
@@ -1,15 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import cv_routes, test_errors, user_routes 
+from app.api.v1 import cv_routes, system_routes, test_errors, user_routes
+from app.core import metrics, storage
+from app.core.config import METRICS_ENABLED
+from app.services import analytics_store, cv_import, password_hasher, suggest
+from app.services.match_engine import engine as match_engine
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.exceptions import RequestValidationError
 from app.utils import error_handler
 from fastapi.security import OAuth2PasswordBearer
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Backend connection (one shared MongoDB pool per worker), opened before the first request
+    await storage.get_storage().connect()
+    # First start (or wiped stats): one worker materializes the dashboard counters
+    await analytics_store.materialize_if_empty()
+    match_engine.start()
+    suggest.service.start()
+    yield
+    await suggest.service.stop()
+    await match_engine.stop()
+    cv_import.shutdown()
+    password_hasher.hasher.shutdown()
+    await storage.get_storage().close()
+
+
 app = FastAPI(
     title="CV API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS pour autoriser le frontend à appeler l’API
@@ -21,6 +43,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latency/error metrics for Prometheus (outermost, so it times everything)
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.add_route("/metrics", metrics.metrics_endpoint, methods=["GET"], include_in_schema=False)
+
 # Security scheme for Swagger
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
 
@@ -33,4 +60,5 @@ app.add_exception_handler(Exception, error_handler.generic_exception_handler)
 app.include_router(cv_routes.router, prefix="/api/v1/cv", tags=["CV"])
 app.include_router(test_errors.router, prefix="/api/v1")
 app.include_router(user_routes.router, prefix="/api/v1/users")
+app.include_router(system_routes.router, prefix="/api/v1/system")
 
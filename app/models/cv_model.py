@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 import re
 
@@ -21,6 +21,7 @@ class Experience(BaseModel):
     title: Optional[str] = None
     company: Optional[str] = None
     duration: Optional[str] = None
+    duration_months: Optional[int] = None  # parsed from duration at write time
     technologies: Optional[List[str]] = []
 
 # --------------------------
@@ -36,6 +37,7 @@ class CVBase(BaseModel):
     experience: Optional[List[Experience]] = []
     skills: Optional[List[str]] = []
     languages: Optional[List[str]] = []
+    total_experience_months: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -45,6 +47,29 @@ class CVBase(BaseModel):
         "arbitrary_types_allowed": True,
     }
 
+# --------------------------
+# Cursor-paginated list response
+# --------------------------
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class CVPage(BaseModel):
+    items: List[CVBase] = []
+    next_cursor: Optional[str] = None
+    # Only with `facets=`: top values over the whole matched set
+    facets: Optional[Dict[str, List[FacetCount]]] = None
+
+# --------------------------
+# Batch read (GET/POST /batch)
+# --------------------------
+class CVBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+
+class CVBatch(BaseModel):
+    items: List[CVBase] = []
+    missing: List[str] = []  # unknown or malformed ids, in request order
+
 # --------------------------
 # Model for creating/updating (frontend form)
 # --------------------------
@@ -79,3 +104,36 @@ class CVCreateUpdate(BaseModel):
 # --------------------------
 # Model for blank CV (for /new route)
 # --------------------------
+
+# --------------------------
+# Bulk partial update (PATCH /bulk)
+# --------------------------
+TagField = Literal["skills", "languages"]
+
+class CVPatchOperation(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+    set: Optional[CVCreateUpdate] = None  # only the fields sent are written
+    add_to_set: Dict[TagField, List[str]] = {}
+    pull: Dict[TagField, List[str]] = {}
+
+    @model_validator(mode="after")
+    def check_paths(self):
+        set_fields = set(self.set.model_fields_set) if self.set is not None else set()
+        added, pulled = set(self.add_to_set), set(self.pull)
+        if not (set_fields or added or pulled):
+            raise ValueError("Operation has nothing to update")
+        # MongoDB rejects an update touching the same path twice
+        conflicts = (set_fields & added) | (set_fields & pulled) | (added & pulled)
+        if conflicts:
+            raise ValueError(f"Conflicting updates on: {', '.join(sorted(conflicts))}")
+        return self
+
+
+class CVBulkPatch(BaseModel):
+    operations: List[CVPatchOperation] = Field(..., min_length=1, max_length=100)
+
+    @model_validator(mode="after")
+    def check_size(self):
+        if sum(len(op.ids) for op in self.operations) > 10000:
+            raise ValueError("At most 10000 ids per request")
+        return self
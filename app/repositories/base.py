@@ -0,0 +1,160 @@
+"""Storage interface the services are written against.
+
+Services never hold a driver collection: they get these repositories
+from app/core/storage.py, which picks the implementation with
+STORAGE_BACKEND:
+
+- "mongo": app/repositories/mongo.py, MongoDB through the shared client
+- "memory": app/repositories/memory.py, indexed in-process dicts
+  (tests, benchmarks; no server needed)
+
+Filters are MongoDB filter documents, limited to the dialect the list
+endpoints build (cv_filters, text_filter, keyset_filter): equality on
+dotted paths through arrays (None also matches a missing field), $in,
+$all, $ne, $gt/$gte/$lt/$lte, $regex (+ $options), $or/$and and
+{"$text": {"$search": ...}}. Projections are inclusion or
+exclusion dicts. Sorting on (SCORE, -1) orders by $text relevance, best
+first, and returns it in each document's "score".
+
+Errors are PyMongo's: DuplicateKeyError when a write breaks the unique
+email, BulkWriteError (details["writeErrors"], by input index) from an
+insert_many.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+SCORE = "score"
+
+Sort = Sequence[Tuple[str, int]]
+
+
+class CVRepository(ABC):
+    # ---- Reads
+    @abstractmethod
+    async def find(self, filter: dict, projection: Optional[dict] = None, sort: Optional[Sort] = None,
+                   skip: int = 0, limit: int = 0) -> List[dict]:
+        """Matching CVs, sorted, skip/limit applied (limit 0 = all)."""
+
+    @abstractmethod
+    async def find_one(self, filter: dict, projection: Optional[dict] = None, sort: Optional[Sort] = None) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def scan(self, filter: dict, projection: Optional[dict] = None, sort: Optional[Sort] = None,
+             batch_size: int = 1000) -> AsyncIterator[dict]:
+        """Every matching CV from one cursor (exports, index rebuilds); close
+        it with aclose() when stopping early."""
+
+    @abstractmethod
+    async def page(self, filter: dict, sort_by: str, sort_order: int, after: Optional[Tuple[Any, Any]],
+                   projection: Optional[dict], limit: int) -> List[dict]:
+        """Keyset page: up to `limit` CVs in (sort_by, _id) order, strictly
+        after the (value, _id) position `after`. sort_by may be SCORE."""
+
+    @abstractmethod
+    async def count(self, filter: dict) -> int:
+        ...
+
+    @abstractmethod
+    async def facets(self, filter: dict, paths: Mapping[str, str], limit: int) -> Dict[str, List[dict]]:
+        """{name: [{"value", "count"}, ...]}: the top `limit` values at each
+        path over the matching CVs, one count per array element."""
+
+    @abstractmethod
+    async def match(self, weights: Mapping[Any, int], required: Sequence[Any], min_months: int, limit: int,
+                    projection: Optional[dict] = None) -> List[dict]:
+        """Top `limit` CVs by the summed weights of their skill_ids (ties by
+        _id), each with its "match_score". Only CVs with every `required`
+        skill ID, at least `min_months` of experience and a positive score."""
+
+    # ---- Writes
+    @abstractmethod
+    async def insert(self, document: dict):
+        """Store a new CV; its generated _id is set on `document`."""
+
+    @abstractmethod
+    async def insert_many(self, documents: List[dict]):
+        """Unordered insert: every document that can be stored is."""
+
+    @abstractmethod
+    async def update(self, filter: dict, fields: dict) -> Optional[dict]:
+        """$set `fields` (dotted paths allowed) on the first matching CV.
+        Returns it as it was before, or None."""
+
+    @abstractmethod
+    async def update_each(self, writes: Sequence[Tuple[dict, dict]]) -> Tuple[int, int]:
+        """(filter, fields) pairs, each an update() of one CV, sent
+        together. Returns the (matched, modified) counts."""
+
+    @abstractmethod
+    async def delete(self, filter: dict) -> Optional[dict]:
+        """Delete the first matching CV and return it, or None."""
+
+
+class StatsRepository(ABC):
+    """Materialized counters, one per (facet, value) (see analytics_store)."""
+
+    @abstractmethod
+    async def increment(self, delta: Mapping[Tuple[str, Any], int]):
+        ...
+
+    @abstractmethod
+    async def top(self, facet: str, limit: Optional[int] = None) -> List[dict]:
+        """[{"value", "count"}, ...] of a facet, positive counts only, largest first."""
+
+    @abstractmethod
+    async def get(self, facet: str, value: Any) -> Optional[int]:
+        """A counter, or None if it was never written."""
+
+    @abstractmethod
+    async def replace_all(self, counts: Mapping[Tuple[str, Any], int], batch_size: int = 1000):
+        """Swap every counter for `counts` at once (rebuilds)."""
+
+    @abstractmethod
+    async def acquire_lock(self, owner: str, seconds: float) -> bool:
+        """Take the rebuild lock (shared by every worker) unless another owner
+        holds it. It expires after `seconds`, so a crashed owner's is taken over."""
+
+    @abstractmethod
+    async def release_lock(self, owner: str):
+        ...
+
+
+class UserRepository(ABC):
+    @abstractmethod
+    async def find(self, skip: int = 0, limit: int = 0) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def find_one(self, filter: dict) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def count(self, filter: dict) -> int:
+        ...
+
+    @abstractmethod
+    async def insert(self, document: dict):
+        """Store a new user; its generated _id is set on `document`."""
+
+    @abstractmethod
+    async def update(self, filter: dict, fields: dict) -> Optional[dict]:
+        """$set `fields` on the first matching user. Returns it as it was before, or None."""
+
+    @abstractmethod
+    async def delete(self, filter: dict) -> Optional[dict]:
+        """Delete the first matching user and return it, or None."""
+
+
+class Storage(ABC):
+    """One backend's repositories, plus its lifespan hooks."""
+
+    cvs: CVRepository
+    stats: StatsRepository
+    users: UserRepository
+
+    async def connect(self):
+        """Lifespan startup."""
+
+    async def close(self):
+        """Lifespan shutdown."""
@@ -0,0 +1,663 @@
+"""In-process repositories (STORAGE_BACKEND=memory): tests and benchmarks
+run the services without a MongoDB server.
+
+Documents are kept in dicts keyed by _id. Every field that leads an index
+declared in app/core/indexes.py gets a hash index (multikey for arrays),
+so equality, $in and $all conditions on them (tag IDs, trigrams, email,
+_id) select their candidates without a scan; the rest of the filter is
+checked on the candidates only. Unique indexes raise DuplicateKeyError
+as on the server, and $text scores over the fields of the declared text
+index.
+
+Filters are evaluated for the dialect documented in
+app/repositories/base.py and nothing more: anything else raises
+NotImplementedError. Facets, matching and counters are computed
+directly, not through an aggregation engine.
+
+Data lives as long as the MemoryStorage object (close() keeps it, like
+a server).
+"""
+import copy
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core.config import CV_COLLECTION, USER_COLLECTION
+from app.core.indexes import INDEXES
+from app.repositories.base import SCORE, CVRepository, Sort, StatsRepository, Storage, UserRepository
+from app.utils.pagination import keyset_filter
+
+_MISSING = object()
+
+
+# --------------------------
+# Values: paths, ordering, equality
+# --------------------------
+def _store_copy(value: Any) -> Any:
+    """What a BSON round trip gives back: millisecond naive UTC datetimes,
+    tuples as lists, no shared mutable state with the caller."""
+    if isinstance(value, dict):
+        return {key: _store_copy(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_store_copy(item) for item in value]
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+def resolve(doc: Any, path: str) -> List[Any]:
+    """Values at a dotted path; arrays of sub-documents are traversed."""
+    values = [doc]
+    for part in path.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, dict):
+                if part in value:
+                    found.append(value[part])
+            elif isinstance(value, list):
+                found += [item[part] for item in value if isinstance(item, dict) and part in item]
+        values = found
+    return values
+
+
+def _expanded(values: List[Any]) -> List[Any]:
+    """Array fields match on the array itself and on each element."""
+    out = []
+    for value in values:
+        out.append(value)
+        if isinstance(value, list):
+            out.extend(value)
+    return out
+
+
+def _bracket(value: Any) -> int:
+    # BSON comparison order of the types the app stores
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def sort_key(value: Any, descending: bool = False) -> Tuple[int, Any]:
+    if isinstance(value, list):
+        # Arrays sort by their smallest (ascending) or largest (descending) element
+        if not value:
+            return (1, 0)
+        keys = [sort_key(item) for item in value]
+        return max(keys) if descending else min(keys)
+    bracket = _bracket(value)
+    if bracket == 1:
+        return (1, 0)
+    if bracket == 4:
+        return (4, str(sorted(value.items())))
+    return (bracket, value)
+
+
+def sort_docs(docs: Iterable[dict], sort: Sort) -> List[dict]:
+    docs = list(docs)
+    # Stable sorts from the last key to the first give the compound order
+    for field, direction in reversed(list(sort)):
+        if field == SCORE:
+            docs.sort(key=lambda d: d.get(SCORE, 0.0), reverse=direction == -1)
+            continue
+        descending = direction == -1
+        docs.sort(key=lambda d: sort_key(_sort_value(d, field), descending), reverse=descending)
+    return docs
+
+
+def _sort_value(doc: dict, field: str) -> Any:
+    if "." not in field:
+        return doc.get(field)
+    found = resolve(doc, field)
+    return found[0] if len(found) == 1 else (found or None)
+
+
+def _equals(value: Any, expected: Any) -> bool:
+    return _bracket(value) == _bracket(expected) and value == expected
+
+
+def _compare(values: List[Any], expected: Any, test) -> bool:
+    bracket = _bracket(expected)
+    return any(_bracket(v) == bracket and test(v, expected) for v in _expanded(values))
+
+
+def _regex(pattern: str, options: str = "") -> re.Pattern:
+    flags = 0
+    for option, flag in (("i", re.IGNORECASE), ("m", re.MULTILINE), ("s", re.DOTALL), ("x", re.VERBOSE)):
+        if option in options:
+            flags |= flag
+    return re.compile(pattern, flags)
+
+
+# --------------------------
+# Filters
+# --------------------------
+def _match_value(values: List[Any], expected: Any) -> bool:
+    if expected is None:
+        return not values or any(v is None for v in _expanded(values))
+    return any(_equals(v, expected) for v in _expanded(values))
+
+
+def _match_operators(values: List[Any], condition: dict) -> bool:
+    for operator, expected in condition.items():
+        if operator == "$ne":
+            ok = not _match_value(values, expected)
+        elif operator == "$gt":
+            ok = _compare(values, expected, lambda a, b: a > b)
+        elif operator == "$gte":
+            ok = _compare(values, expected, lambda a, b: a >= b)
+        elif operator == "$lt":
+            ok = _compare(values, expected, lambda a, b: a < b)
+        elif operator == "$lte":
+            ok = _compare(values, expected, lambda a, b: a <= b)
+        elif operator == "$in":
+            ok = any(_match_value(values, item) for item in expected)
+        elif operator == "$all":
+            ok = bool(expected) and all(_match_value(values, item) for item in expected)
+        elif operator == "$regex":
+            pattern = _regex(expected, condition.get("$options", ""))
+            ok = any(isinstance(v, str) and pattern.search(v) for v in _expanded(values))
+        elif operator == "$options":
+            continue
+        else:
+            raise NotImplementedError(f"{operator} is outside the repository filter dialect")
+        if not ok:
+            return False
+    return True
+
+
+def _is_operator_dict(condition: Any) -> bool:
+    return isinstance(condition, dict) and bool(condition) and all(k.startswith("$") for k in condition)
+
+
+def matches(doc: dict, filter: Optional[dict]) -> bool:
+    """Whether `doc` satisfies a filter ($text is checked by the caller)."""
+    for key, condition in (filter or {}).items():
+        if key == "$and":
+            ok = all(matches(doc, part) for part in condition)
+        elif key == "$or":
+            ok = any(matches(doc, part) for part in condition)
+        elif key == "$text":
+            continue
+        elif key.startswith("$"):
+            raise NotImplementedError(f"{key} is outside the repository filter dialect")
+        elif _is_operator_dict(condition):
+            ok = _match_operators(resolve(doc, key), condition)
+        else:
+            ok = _match_value(resolve(doc, key), condition)
+        if not ok:
+            return False
+    return True
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def text_score(doc: dict, fields: Sequence[str], search: str) -> float:
+    """$text relevance of `doc` (0 = no match): matched terms weighted by
+    how often they occur, without stemming."""
+    terms = set(_words(search))
+    counts: Counter = Counter()
+    for field in fields:
+        for value in _expanded(resolve(doc, field)):
+            if isinstance(value, str):
+                counts.update(word for word in _words(value) if word in terms)
+    return sum(1 + 0.5 * (n - 1) for n in counts.values())
+
+
+# --------------------------
+# Projection and updates
+# --------------------------
+def _include(doc: dict, parts: List[str]) -> Any:
+    value = doc.get(parts[0], _MISSING)
+    if value is _MISSING or len(parts) == 1:
+        return value
+    if isinstance(value, list):
+        # a.b on an array of sub-documents keeps the array shape
+        return [inner for inner in (_include(item, parts[1:]) if isinstance(item, dict) else _MISSING for item in value)
+                if inner is not _MISSING]
+    if isinstance(value, dict):
+        inner = _include(value, parts[1:])
+        return _MISSING if inner is _MISSING else inner
+    return _MISSING
+
+
+def _merge(target: dict, parts: List[str], value: Any):
+    """Place an included value back under its path, next to its siblings."""
+    head = parts[0]
+    if len(parts) == 1:
+        target[head] = value
+    elif isinstance(value, list):
+        current = target.get(head)
+        items = [{parts[1]: item} if len(parts) == 2 else item for item in value]
+        if isinstance(current, list) and len(current) == len(items):
+            target[head] = [{**old, **new} for old, new in zip(current, items)]
+        else:
+            target[head] = items
+    else:
+        _merge(target.setdefault(head, {}), parts[1:], value)
+
+
+def _unset(doc: dict, parts: List[str]):
+    if parts[0] not in doc:
+        return
+    if len(parts) == 1:
+        del doc[parts[0]]
+        return
+    inner = doc[parts[0]]
+    for target in (inner if isinstance(inner, list) else [inner]):
+        if isinstance(target, dict):
+            _unset(target, parts[1:])
+
+
+def project(doc: dict, projection: Optional[dict]) -> dict:
+    """A copy of `doc` shaped by an inclusion or exclusion projection."""
+    if not projection:
+        return copy.deepcopy(doc)
+    flags = dict(projection)
+    include_id = flags.pop("_id", 1)
+    if any(flags.values()):
+        out: dict = {"_id": doc["_id"]} if include_id else {}
+        for path, flag in flags.items():
+            if flag:
+                parts = path.split(".")
+                value = _include(doc, parts)
+                if value is not _MISSING:
+                    # Siblings under an array are merged item by item (education.degree + education.school)
+                    _merge(out, parts, copy.deepcopy(value) if not isinstance(value, list) or len(parts) == 1
+                           else [copy.deepcopy(item) for item in value])
+        if SCORE in doc and SCORE not in flags:
+            out[SCORE] = doc[SCORE]
+        return out
+    out = copy.deepcopy(doc)
+    if not include_id:
+        out.pop("_id", None)
+    for path in flags:
+        _unset(out, path.split("."))
+    return out
+
+
+def _set_path(doc: dict, path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        if not isinstance(doc.get(part), dict):
+            doc[part] = {}
+        doc = doc[part]
+    doc[parts[-1]] = value
+
+
+# --------------------------
+# Indexed document store
+# --------------------------
+def _hashable(value: Any) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def _lookup(condition: Any) -> Optional[Tuple[str, List[Any]]]:
+    """("any" | "all", values) when a condition can be answered by a hash index."""
+    if not isinstance(condition, dict):
+        return ("any", [condition]) if condition is not None and _hashable(condition) else None
+    if not _is_operator_dict(condition):
+        return None
+    for operator, mode in (("$in", "any"), ("$all", "all")):
+        values = condition.get(operator)
+        if values is not None and values and all(v is not None and _hashable(v) for v in values):
+            return mode, list(values)
+    return None
+
+
+class Table:
+    """Documents of one collection, with hash indexes on `indexed` fields
+    and unique constraints on `unique` ones."""
+
+    def __init__(self, name: str, indexed: Iterable[str] = (), unique: Iterable[str] = (),
+                 text_fields: Sequence[str] = ()):
+        self.name = name
+        self.unique = list(unique)
+        self.text_fields = list(text_fields)
+        self.docs: Dict[Any, dict] = {}  # _id -> stored document, in insertion order
+        self._hash: Dict[str, Dict[Any, Set[Any]]] = {field: {} for field in {*indexed, *self.unique}}
+
+    @classmethod
+    def declared(cls, collection: str) -> "Table":
+        """A table indexed like the collection's specs in app/core/indexes.py."""
+        specs = INDEXES.get(collection, [])
+        text = [field for spec in specs if spec.is_text for field, _ in spec.keys]
+        indexed = [spec.keys[0][0] for spec in specs if not spec.is_text]
+        unique = [spec.keys[0][0] for spec in specs if spec.unique and len(spec.keys) == 1]
+        return cls(collection, indexed, unique, text)
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ---- Index maintenance
+    def _keys(self, doc: dict, field: str) -> Set[Any]:
+        values = _expanded(resolve(doc, field))
+        return {value for value in values if _hashable(value)}
+
+    def _index(self, doc: dict, remove: bool = False):
+        for field, buckets in self._hash.items():
+            for value in self._keys(doc, field):
+                if remove:
+                    bucket = buckets.get(value)
+                    if bucket is not None:
+                        bucket.discard(doc["_id"])
+                        if not bucket:
+                            del buckets[value]
+                else:
+                    buckets.setdefault(value, set()).add(doc["_id"])
+
+    def _check_unique(self, doc: dict):
+        for field in self.unique:
+            for value in self._keys(doc, field):
+                others = self._hash[field].get(value, set()) - {doc["_id"]}
+                if others:
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error collection: {self.name} index: {field}_1 dup key: {{{field}: {value!r}}}",
+                        11000,
+                        {"code": 11000, "keyPattern": {field: 1}, "keyValue": {field: value}},
+                    )
+
+    # ---- Reads
+    def _candidates(self, filter: dict) -> Optional[Set[Any]]:
+        """_ids that may match, from the most selective index lookup (None = scan)."""
+        best: Optional[Set[Any]] = None
+        for field, condition in filter.items():
+            if field == "$and":
+                found = [self._candidates(part) for part in condition]
+                found = [ids for ids in found if ids is not None]
+            elif field == "$or":
+                found = [self._candidates(part) for part in condition]
+                found = [set().union(*found)] if found and all(ids is not None for ids in found) else []
+            elif field.startswith("$"):
+                continue
+            else:
+                lookup = _lookup(condition)
+                if lookup is None:
+                    continue
+                mode, values = lookup
+                if field == "_id":
+                    found = [{value for value in values if value in self.docs}] if mode == "any" else []
+                elif field in self._hash:
+                    buckets = [self._hash[field].get(value, set()) for value in values]
+                    found = [set.intersection(*buckets) if mode == "all" else set().union(*buckets)]
+                else:
+                    continue
+            for ids in found:
+                if best is None or len(ids) < len(best):
+                    best = ids
+        return best
+
+    def select(self, filter: Optional[dict]) -> List[dict]:
+        """Stored documents matching `filter`, in insertion order; with
+        $text, working copies carrying their SCORE."""
+        filter = _store_copy(filter or {})  # datetimes compare at stored (millisecond) precision
+        ids = self._candidates(filter)
+        if ids is None:
+            docs: Iterable[dict] = self.docs.values()
+        else:
+            docs = [doc for _id, doc in self.docs.items() if _id in ids] if len(ids) * 8 > len(self.docs) \
+                else sorted((self.docs[_id] for _id in ids), key=self._order)
+        text = filter.get("$text")
+        if text is not None and not self.text_fields:
+            raise NotImplementedError(f"{self.name} has no text index")
+        selected = []
+        for doc in docs:
+            if not matches(doc, filter):
+                continue
+            if text is not None:
+                score = text_score(doc, self.text_fields, text["$search"])
+                if not score:
+                    continue
+                doc = {**doc, SCORE: score}
+            selected.append(doc)
+        return selected
+
+    def _order(self, doc: dict) -> int:
+        return self._positions()[doc["_id"]]
+
+    def _positions(self) -> Dict[Any, int]:
+        positions = getattr(self, "_position_cache", None)
+        if positions is None or len(positions) != len(self.docs):
+            positions = self._position_cache = {_id: i for i, _id in enumerate(self.docs)}
+        return positions
+
+    def first(self, filter: dict) -> Optional[dict]:
+        for doc in self.select(filter):
+            return self.docs[doc["_id"]]
+        return None
+
+    # ---- Writes
+    def insert(self, document: dict):
+        if "_id" not in document:
+            document["_id"] = ObjectId()  # the caller's dict gets its _id, like PyMongo
+        if document["_id"] in self.docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_", 11000,
+                                    {"code": 11000, "keyPattern": {"_id": 1}})
+        stored = _store_copy(document)
+        self._check_unique(stored)
+        self.docs[stored["_id"]] = stored
+        self._index(stored)
+
+    def set(self, doc: dict, fields: dict) -> bool:
+        """$set `fields` on a stored document. Returns whether it changed."""
+        updated = copy.deepcopy(doc)
+        for path, value in fields.items():
+            _set_path(updated, path, _store_copy(value))
+        if updated == doc:
+            return False
+        self._index(doc, remove=True)
+        try:
+            self._check_unique(updated)
+        except DuplicateKeyError:
+            self._index(doc)
+            raise
+        self.docs[doc["_id"]] = updated
+        self._index(updated)
+        return True
+
+    def delete(self, doc: dict):
+        self._index(doc, remove=True)
+        del self.docs[doc["_id"]]
+        self._position_cache = None
+
+
+# --------------------------
+# Repositories
+# --------------------------
+class MemoryCVRepository(CVRepository):
+    def __init__(self):
+        self.table = Table.declared(CV_COLLECTION)
+
+    async def find(self, filter, projection=None, sort=None, skip=0, limit=0):
+        docs = self.table.select(filter)
+        if sort:
+            docs = sort_docs(docs, sort)
+        docs = docs[skip:skip + limit] if limit else docs[skip:]
+        return [project(doc, projection) for doc in docs]
+
+    async def find_one(self, filter, projection=None, sort=None):
+        docs = await self.find(filter, projection, sort, limit=1)
+        return docs[0] if docs else None
+
+    async def scan(self, filter, projection=None, sort=None, batch_size=1000) -> AsyncIterator[dict]:
+        docs = self.table.select(filter)
+        for doc in sort_docs(docs, sort) if sort else docs:
+            yield project(doc, projection)
+
+    async def page(self, filter, sort_by, sort_order, after, projection, limit):
+        docs = self.table.select(filter)
+        if after:
+            position = _store_copy(keyset_filter(sort_by, sort_order, *after))
+            docs = [doc for doc in docs if matches(doc, position)]
+        docs = sort_docs(docs, [(sort_by, sort_order), ("_id", sort_order)])
+        return [project(doc, projection) for doc in docs[:limit]]
+
+    async def count(self, filter):
+        return len(self.table.select(filter))
+
+    async def facets(self, filter, paths, limit):
+        counts = {name: Counter() for name in paths}
+        for doc in self.table.select(filter):
+            for name, path in paths.items():
+                counts[name].update(value for value in _expanded(resolve(doc, path))
+                                    if not isinstance(value, list) and value not in (None, ""))
+        return {
+            name: [{"value": value, "count": count}
+                   for value, count in sorted(counter.items(), key=lambda item: (-item[1], sort_key(item[0])))[:limit]]
+            for name, counter in counts.items()
+        }
+
+    async def match(self, weights, required, min_months, limit, projection=None):
+        conditions: List[dict] = [{"skill_ids": {"$in": list(weights)}}] if weights else []
+        if required:
+            conditions.append({"skill_ids": {"$all": list(required)}})
+        if min_months > 0:
+            conditions.append({"total_experience_months": {"$gte": min_months}})
+        scored = []
+        for doc in self.table.select({"$and": conditions} if conditions else {}):
+            skill_ids = set(doc.get("skill_ids") or [])
+            score = sum(weight for skill_id, weight in weights.items() if skill_id in skill_ids)
+            if score > 0:
+                scored.append((score, doc))
+        scored.sort(key=lambda item: (-item[0], sort_key(item[1]["_id"])))
+        return [{**project(doc, projection), "match_score": score} for score, doc in scored[:limit]]
+
+    async def insert(self, document):
+        self.table.insert(document)
+
+    async def insert_many(self, documents):
+        errors = []
+        for index, document in enumerate(documents):
+            try:
+                self.table.insert(document)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": e.code, "errmsg": str(e)})
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(documents) - len(errors)})
+
+    async def update(self, filter, fields):
+        doc = self.table.first(filter)
+        if doc is None:
+            return None
+        self.table.set(doc, fields)
+        return copy.deepcopy(doc)
+
+    async def update_each(self, writes):
+        matched = modified = 0
+        errors = []
+        for index, (filter, fields) in enumerate(writes):
+            doc = self.table.first(filter)
+            if doc is None:
+                continue
+            try:
+                modified += self.table.set(doc, fields)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": e.code, "errmsg": str(e)})
+                continue
+            matched += 1
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nMatched": matched, "nModified": modified})
+        return matched, modified
+
+    async def delete(self, filter):
+        doc = self.table.first(filter)
+        if doc is not None:
+            self.table.delete(doc)
+        return doc
+
+
+class MemoryStatsRepository(StatsRepository):
+    def __init__(self):
+        self.counts: Dict[Tuple[str, Any], int] = {}
+        self._lock: Optional[Tuple[str, datetime]] = None  # (owner, expires_at)
+
+    async def increment(self, delta):
+        for key, amount in delta.items():
+            if amount:
+                self.counts[key] = self.counts.get(key, 0) + amount
+
+    async def top(self, facet, limit=None):
+        rows = [{"value": value, "count": count} for (f, value), count in self.counts.items() if f == facet and count > 0]
+        rows.sort(key=lambda row: row["count"], reverse=True)
+        return rows[:limit] if limit else rows
+
+    async def get(self, facet, value):
+        return self.counts.get((facet, value))
+
+    async def replace_all(self, counts, batch_size=1000):
+        self.counts = dict(counts)
+
+    async def acquire_lock(self, owner, seconds):
+        now = datetime.utcnow()
+        if self._lock is not None and self._lock[0] != owner and self._lock[1] >= now:
+            return False
+        self._lock = (owner, now + timedelta(seconds=seconds))
+        return True
+
+    async def release_lock(self, owner):
+        if self._lock is not None and self._lock[0] == owner:
+            self._lock = None
+
+
+class MemoryUserRepository(UserRepository):
+    def __init__(self):
+        self.table = Table.declared(USER_COLLECTION)
+
+    async def find(self, skip=0, limit=0):
+        docs = list(self.table.docs.values())
+        docs = docs[skip:skip + limit] if limit else docs[skip:]
+        return [copy.deepcopy(doc) for doc in docs]
+
+    async def find_one(self, filter):
+        doc = self.table.first(filter)
+        return copy.deepcopy(doc) if doc is not None else None
+
+    async def count(self, filter):
+        return len(self.table.select(filter))
+
+    async def insert(self, document):
+        self.table.insert(document)
+
+    async def update(self, filter, fields):
+        doc = self.table.first(filter)
+        if doc is None:
+            return None
+        self.table.set(doc, fields)
+        return copy.deepcopy(doc)
+
+    async def delete(self, filter):
+        doc = self.table.first(filter)
+        if doc is not None:
+            self.table.delete(doc)
+        return doc
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        self.cvs = MemoryCVRepository()
+        self.stats = MemoryStatsRepository()
+        self.users = MemoryUserRepository()
@@ -0,0 +1,274 @@
+"""MongoDB repositories (STORAGE_BACKEND=mongo).
+
+Collections are taken from the shared client at call time (see
+app/core/database.py), so nothing connects at import and DB_NAME can be
+changed between calls (benchmarks). Reads go through query_profiler.track,
+so slow ones are captured and explained.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.core import database, indexes
+from app.core.config import CV_STATS_COLLECTION, MONGO_ENSURE_INDEXES
+from app.repositories.base import SCORE, CVRepository, Sort, StatsRepository, Storage, UserRepository
+from app.services import query_profiler
+from app.utils.pagination import keyset_filter
+
+TEXT_SCORE = {"$meta": "textScore"}
+# CV fields holding arrays: a facet on them (or below them) counts each element
+ARRAY_FIELDS = ("skills", "languages", "education", "experience")
+
+
+def _text_score(projection: Optional[dict], sort: Optional[Sort]) -> Tuple[Optional[dict], Optional[list]]:
+    """Projection and sort with SCORE as the $text relevance ($meta)."""
+    if not sort:
+        return projection, None
+    if not any(field == SCORE for field, _ in sort):
+        return projection, list(sort)
+    return {**(projection or {}), SCORE: TEXT_SCORE}, [(field, TEXT_SCORE if field == SCORE else order) for field, order in sort]
+
+
+def facet_pipeline(filter: dict, paths: Mapping[str, str], limit: int) -> List[Dict[str, Any]]:
+    """One $facet pass: top `limit` values at each path over every CV
+    matching `filter`. Counted like the analytics counters (one per array
+    element, education entries included)."""
+    branches = {}
+    for name, path in paths.items():
+        head = path.split(".")[0]
+        branch: List[Dict[str, Any]] = [{"$unwind": f"${head}"}] if head in ARRAY_FIELDS else []
+        branch += [
+            {"$match": {path: {"$nin": [None, ""]}}},
+            {"$group": {"_id": f"${path}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": limit},
+        ]
+        branches[name] = branch
+    pipeline: List[Dict[str, Any]] = [{"$match": filter}] if filter else []
+    pipeline += [
+        {"$project": {path: 1 for path in set(paths.values())}},
+        {"$facet": branches},
+    ]
+    return pipeline
+
+
+def match_pipeline(weights: Mapping[Any, int], required: Sequence[Any], min_months: int, limit: int,
+                   projection: Optional[dict] = None) -> List[Dict[str, Any]]:
+    match: Dict[str, Any] = {}
+    if min_months > 0:
+        # Index-backed range on the precomputed months
+        match["total_experience_months"] = {"$gte": min_months}
+    if required:
+        match["skill_ids"] = {"$all": list(required)}
+    pipeline: List[Dict[str, Any]] = [{"$match": match}] if match else []
+    pipeline += [
+        {"$addFields": {"match_score": {"$add": [0] + [
+            {"$cond": [{"$in": [skill_id, {"$ifNull": ["$skill_ids", []]}]}, weight, 0]}
+            for skill_id, weight in weights.items()
+        ]}}},
+        {"$match": {"match_score": {"$gt": 0}}},
+        {"$sort": {"match_score": -1, "_id": 1}},
+        {"$limit": limit},
+    ]
+    if projection:
+        pipeline.append({"$project": projection})
+    return pipeline
+
+
+# --------------------------
+# CVs
+# --------------------------
+class MongoCVRepository(CVRepository):
+    @property
+    def collection(self):
+        return database.get_cv_collection()
+
+    async def _aggregate(self, operation: str, pipeline: List[dict]) -> List[dict]:
+        collection = self.collection
+        async with query_profiler.track(operation, collection, query_profiler.aggregate_command(collection, pipeline)):
+            cursor = await collection.aggregate(pipeline)
+            return await cursor.to_list()
+
+    async def find(self, filter, projection=None, sort=None, skip=0, limit=0):
+        collection = self.collection
+        projection, sort = _text_score(projection, sort)
+        cursor = collection.find(filter, projection, skip=skip, limit=limit)
+        if sort:
+            cursor = cursor.sort(sort)
+        command = query_profiler.find_command(collection, filter, projection, sort, skip, limit)
+        async with query_profiler.track("find_cvs", collection, command):
+            return await cursor.to_list()
+
+    async def find_one(self, filter, projection=None, sort=None):
+        return await self.collection.find_one(filter, projection, sort=list(sort) if sort else None)
+
+    async def scan(self, filter, projection=None, sort=None, batch_size=1000) -> AsyncIterator[dict]:
+        cursor = self.collection.find(filter, projection, batch_size=batch_size)
+        if sort:
+            cursor = cursor.sort(list(sort))
+        try:
+            async for doc in cursor:
+                yield doc
+        finally:
+            # Release the server cursor when the caller stops early
+            await cursor.close()
+
+    async def page(self, filter, sort_by, sort_order, after, projection, limit):
+        if sort_by == SCORE:
+            # Text score only exists inside the query, so the keyset predicate
+            # is applied after $addFields in an aggregation
+            pipeline: List[Dict[str, Any]] = [{"$match": filter}, {"$addFields": {SCORE: TEXT_SCORE}}]
+            if after:
+                pipeline.append({"$match": keyset_filter(SCORE, sort_order, *after)})
+            pipeline += [{"$sort": {SCORE: sort_order, "_id": sort_order}}, {"$limit": limit}]
+            if projection:
+                pipeline.append({"$project": projection})
+            return await self._aggregate("list_cvs_page", pipeline)
+        query = filter
+        if after:
+            position = keyset_filter(sort_by, sort_order, *after)
+            query = {"$and": [filter, position]} if filter else position
+        collection = self.collection
+        sort = [(sort_by, sort_order), ("_id", sort_order)]
+        command = query_profiler.find_command(collection, query, projection, sort, limit=limit)
+        async with query_profiler.track("list_cvs_page", collection, command):
+            return await collection.find(query, projection).sort(sort).limit(limit).to_list()
+
+    async def count(self, filter):
+        return await self.collection.count_documents(filter)
+
+    async def facets(self, filter, paths, limit):
+        results = await self._aggregate("facet_counts", facet_pipeline(filter, paths, limit))
+        counts = results[0] if results else {}
+        return {name: [{"value": r["_id"], "count": r["count"]} for r in counts.get(name, [])] for name in paths}
+
+    async def match(self, weights, required, min_months, limit, projection=None):
+        return await self._aggregate("match_candidates", match_pipeline(weights, required, min_months, limit, projection))
+
+    async def insert(self, document):
+        # insert_one adds the generated _id to the document
+        await self.collection.insert_one(document)
+
+    async def insert_many(self, documents):
+        await self.collection.insert_many(documents, ordered=False)
+
+    async def update(self, filter, fields):
+        return await self.collection.find_one_and_update(filter, {"$set": fields}, return_document=ReturnDocument.BEFORE)
+
+    async def update_each(self, writes):
+        if not writes:
+            return 0, 0
+        result = await self.collection.bulk_write([UpdateOne(f, {"$set": fields}) for f, fields in writes], ordered=False)
+        return result.matched_count, result.modified_count
+
+    async def delete(self, filter):
+        return await self.collection.find_one_and_delete(filter)
+
+
+# --------------------------
+# Analytics counters
+# --------------------------
+class MongoStatsRepository(StatsRepository):
+    @property
+    def collection(self):
+        return database.get_stats_collection()
+
+    @property
+    def locks(self):
+        return database.get_database()[f"{CV_STATS_COLLECTION}_lock"]
+
+    async def increment(self, delta):
+        operations = [
+            UpdateOne({"facet": facet, "value": value}, {"$inc": {"count": amount}}, upsert=True)
+            for (facet, value), amount in delta.items()
+            if amount
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def top(self, facet, limit=None):
+        stats = self.collection
+        query = {"facet": facet, "count": {"$gt": 0}}
+        projection = {"_id": 0, "value": 1, "count": 1}
+        cursor = stats.find(query, projection).sort("count", -1)
+        if limit:
+            cursor = cursor.limit(limit)
+        command = query_profiler.find_command(stats, query, projection, {"count": -1}, limit=limit or 0)
+        async with query_profiler.track("analytics", stats, command):
+            return await cursor.to_list()
+
+    async def get(self, facet, value):
+        doc = await self.collection.find_one({"facet": facet, "value": value})
+        return int(doc["count"]) if doc else None
+
+    async def replace_all(self, counts, batch_size=1000):
+        # Own staging collection, so concurrent rebuilds never share one
+        staging = database.get_database()[f"{CV_STATS_COLLECTION}_rebuild_{uuid.uuid4().hex}"]
+        try:
+            docs = [{"facet": facet, "value": value, "count": count} for (facet, value), count in counts.items()]
+            for start in range(0, len(docs), batch_size):
+                await staging.insert_many(docs[start:start + batch_size], ordered=False)
+            await indexes.ensure(staging, CV_STATS_COLLECTION)
+            await staging.rename(CV_STATS_COLLECTION, dropTarget=True)
+        except BaseException:
+            await staging.drop()
+            raise
+
+    async def acquire_lock(self, owner, seconds):
+        now = datetime.utcnow()
+        lock = {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}
+        try:
+            await self.locks.insert_one({"_id": "rebuild", **lock})
+        except DuplicateKeyError:
+            taken = await self.locks.find_one_and_update({"_id": "rebuild", "expires_at": {"$lt": now}}, {"$set": lock})
+            return taken is not None
+        return True
+
+    async def release_lock(self, owner):
+        await self.locks.delete_one({"_id": "rebuild", "owner": owner})
+
+
+# --------------------------
+# Users
+# --------------------------
+class MongoUserRepository(UserRepository):
+    @property
+    def collection(self):
+        return database.get_user_collection()
+
+    async def find(self, skip=0, limit=0):
+        return await self.collection.find().skip(skip).limit(limit).to_list()
+
+    async def find_one(self, filter):
+        return await self.collection.find_one(filter)
+
+    async def count(self, filter):
+        return await self.collection.count_documents(filter)
+
+    async def insert(self, document):
+        await self.collection.insert_one(document)
+
+    async def update(self, filter, fields):
+        return await self.collection.find_one_and_update(filter, {"$set": fields}, return_document=ReturnDocument.BEFORE)
+
+    async def delete(self, filter):
+        return await self.collection.find_one_and_delete(filter)
+
+
+class MongoStorage(Storage):
+    def __init__(self):
+        self.cvs = MongoCVRepository()
+        self.stats = MongoStatsRepository()
+        self.users = MongoUserRepository()
+
+    async def connect(self):
+        # One shared MongoDB pool per worker, opened before the first request
+        await database.connect()
+        if MONGO_ENSURE_INDEXES:
+            await indexes.build(database.get_database())
+
+    async def close(self):
+        await database.close()
@@ -0,0 +1,163 @@
+"""Materialized CV analytics.
+
+Instead of aggregating the whole CV collection on every dashboard load,
+counters are kept in the stats repository (a small collection on
+MongoDB), one per (facet, value):
+
+    {"facet": "skill", "value": "Python", "count": 1234}
+
+create/update/delete apply deltas through cv_events; reads are indexed
+lookups on (facet, count). `rebuild()` recomputes everything from the CVs
+and atomically swaps it in, for repair;
+`materialize_if_empty()` runs it once on first start, in a single worker.
+"""
+import uuid
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence
+
+from app.core.storage import get_cv_repository, get_stats_repository
+from app.services import cv_events
+
+# Facets
+TOTAL = "total"
+SKILL = "skill"
+LOCATION = "location"
+DEGREE = "degree"
+LANGUAGE = "language"
+EXPERIENCE_YEARS = "experience_years"  # histogram: value = whole years, count = CVs
+EXPERIENCE_SUM = "experience_sum"      # single row: value = "months", count = sum of months
+
+# Dashboard experience levels, in whole years: (label, from, to exclusive)
+EXPERIENCE_LEVELS = [("0-1", 0, 1), ("1-3", 1, 3), ("3-5", 3, 5), ("5-10", 5, 10), ("10+", 10, None)]
+
+# A first-start rebuild lock left by a crashed worker is taken over after this long
+REBUILD_LOCK_SECONDS = 600
+
+# Fields the counters are derived from (projection for rebuild)
+SOURCE_FIELDS = {"skills": 1, "location": 1, "education.degree": 1, "languages": 1, "total_experience_months": 1}
+
+
+def counters_for(cv: Optional[dict]) -> Counter:
+    """Counter contributions of a single CV document."""
+    counts: Counter = Counter()
+    if not cv:
+        return counts
+    counts[(TOTAL, "cvs")] += 1
+    for skill in cv.get("skills") or []:
+        counts[(SKILL, skill)] += 1
+    if cv.get("location"):
+        counts[(LOCATION, cv["location"])] += 1
+    for edu in cv.get("education") or []:
+        if edu.get("degree"):
+            counts[(DEGREE, edu["degree"])] += 1
+    for lang in cv.get("languages") or []:
+        counts[(LANGUAGE, lang)] += 1
+    months = cv.get("total_experience_months")
+    if isinstance(months, int) and not isinstance(months, bool):
+        counts[(EXPERIENCE_YEARS, months // 12)] += 1
+        counts[(EXPERIENCE_SUM, "months")] += months
+    return counts
+
+
+def delta_for(changes: Iterable[cv_events.Change]) -> Counter:
+    delta: Counter = Counter()
+    for before, after in changes:
+        delta.update(counters_for(after))
+        delta.subtract(counters_for(before))
+    return delta
+
+
+# --------------------------
+# Write path
+# --------------------------
+async def apply_delta(delta: Counter):
+    await get_stats_repository().increment(delta)
+
+
+@cv_events.subscribe
+async def on_cv_changes(changes: Sequence[cv_events.Change]):
+    await apply_delta(delta_for(changes))
+
+
+# --------------------------
+# Read path (indexed, no collection scans)
+# --------------------------
+async def top_values(facet: str, limit: Optional[int] = None) -> List[dict]:
+    return await get_stats_repository().top(facet, limit)
+
+
+async def total_cvs() -> int:
+    return await get_stats_repository().get(TOTAL, "cvs") or 0
+
+
+async def experience_stats() -> dict:
+    """Min/max/avg years of experience per CV, plus a level histogram.
+
+    Min and max are the ends of the total_experience_months index; the
+    average and levels come from the counters.
+    """
+    cvs = get_cv_repository()
+    has_value = {"total_experience_months": {"$ne": None}}
+    projection = {"_id": 0, "total_experience_months": 1}
+    lowest = await cvs.find_one(has_value, projection, sort=[("total_experience_months", 1)])
+    if not lowest:
+        return {}
+    highest = await cvs.find_one(has_value, projection, sort=[("total_experience_months", -1)])
+
+    histogram = await top_values(EXPERIENCE_YEARS)
+    counted = sum(row["count"] for row in histogram)
+    total = await get_stats_repository().get(EXPERIENCE_SUM, "months")
+    levels = []
+    for label, start, end in EXPERIENCE_LEVELS:
+        count = sum(row["count"] for row in histogram if row["value"] >= start and (end is None or row["value"] < end))
+        levels.append({"level": label, "count": count})
+    return {
+        "_id": None,
+        "min_years": round(lowest["total_experience_months"] / 12, 1),
+        "max_years": round(highest["total_experience_months"] / 12, 1),
+        "avg_years": round(total / counted / 12, 1) if total and counted else None,
+        "levels": levels,
+    }
+
+
+async def is_empty() -> bool:
+    return await get_stats_repository().get(TOTAL, "cvs") is None
+
+
+# --------------------------
+# Maintenance
+# --------------------------
+async def rebuild(batch_size: int = 1000) -> int:
+    """Recompute every counter from the CVs and swap it in.
+
+    Writes that land while the rebuild is running may be lost; run it
+    again (or during a quiet period) if exact counts matter.
+    """
+    totals: Counter = Counter()
+    async for cv in get_cv_repository().scan({}, SOURCE_FIELDS, batch_size=batch_size):
+        totals.update(counters_for(cv))
+    totals.setdefault((TOTAL, "cvs"), 0)
+    await get_stats_repository().replace_all(totals, batch_size)
+    return totals[(TOTAL, "cvs")]
+
+
+async def materialize_if_empty() -> bool:
+    """First start: rebuild the counters if there are none, in one worker only.
+
+    The worker that takes the rebuild lock rebuilds; the others start
+    right away and serve empty dashboards until the swap. Returns whether
+    this worker rebuilt.
+    """
+    if not await is_empty():
+        return False
+    stats = get_stats_repository()
+    owner = uuid.uuid4().hex
+    if not await stats.acquire_lock(owner, REBUILD_LOCK_SECONDS):
+        return False
+    try:
+        if not await is_empty():
+            return False
+        await rebuild()
+        return True
+    finally:
+        await stats.release_lock(owner)
@@ -0,0 +1,45 @@
+"""In-process notifications for CV writes.
+
+Services that keep derived state (stats counters, in-memory indexes, ...)
+subscribe a handler; cv_service publishes every write as a batch of
+(before, after) raw MongoDB documents: (None, doc) for inserts,
+(doc, None) for deletes. Handlers run after the write succeeded, so a
+failing handler is logged and never fails the request; each derived
+store has its own rebuild path for repair.
+
+Handlers run by ascending priority, then in subscription order, so what
+must see the derived stores already updated (the query cache
+invalidation) subscribes with priority LAST, whatever the import order.
+"""
+import logging
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Change = Tuple[Optional[dict], Optional[dict]]
+Handler = Callable[[Sequence[Change]], Awaitable[None]]
+
+DEFAULT = 0
+LAST = 100
+
+_handlers: List[Tuple[int, Handler]] = []
+
+
+def subscribe(handler: Optional[Handler] = None, *, priority: int = DEFAULT):
+    """Register a handler (usable as a decorator, with or without arguments)."""
+    def register(handler: Handler) -> Handler:
+        if all(registered is not handler for _, registered in _handlers):
+            _handlers.append((priority, handler))
+            _handlers.sort(key=lambda entry: entry[0])  # stable: subscription order within a priority
+        return handler
+    return register if handler is None else register(handler)
+
+
+async def publish(changes: Sequence[Change]):
+    if not changes:
+        return
+    for _, handler in _handlers:
+        try:
+            await handler(changes)
+        except Exception:
+            logger.exception("CV change handler %s failed", getattr(handler, "__qualname__", handler))
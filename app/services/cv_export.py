@@ -0,0 +1,233 @@
+"""Streaming export of filtered CVs (NDJSON, CSV or Parquet).
+
+One server-side cursor is opened for the whole export and read
+`batch_size` documents per getMore; each batch is encoded and yielded
+before the next one is fetched, so memory stays at one batch whatever
+the result size. Encoding runs in the threadpool to keep the event loop
+free for other requests.
+
+CSV uses the bulk import layout (skills/languages joined with "|",
+education/experience as JSON), so an export can be imported back.
+Parquet needs the optional pyarrow package; each batch becomes one row
+group and the bytes are flushed as soon as the row group is written.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.storage import get_cv_repository
+from app.services.cv_import import CSV_COLUMNS, JSON_COLUMNS, LIST_COLUMNS
+from app.services.cv_service import HIDDEN_FIELDS, cv_helper
+from app.utils.serialization import dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+EXPORT_SORT_FIELDS = ("created_at", "updated_at", "full_name")
+EXPORT_COLUMNS = ("_id",) + CSV_COLUMNS + ("total_experience_months", "created_at", "updated_at")
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+# --------------------------
+# Encoders (one call per batch)
+# --------------------------
+def encode_ndjson(cvs: List[dict]) -> bytes:
+    return b"".join(dumps(cv) + b"\n" for cv in cvs)
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_csv(cvs: List[dict]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for cv in cvs:
+        row = []
+        for column in EXPORT_COLUMNS:
+            value = cv.get(column)
+            if value is None:
+                value = ""
+            elif column in LIST_COLUMNS:
+                value = "|".join(value)
+            elif column in JSON_COLUMNS:
+                value = json.dumps(value, default=_json_default, ensure_ascii=False) if value else ""
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            row.append(value)
+        writer.writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _parquet_schema():
+    education = pa.struct([("degree", pa.string()), ("school", pa.string()), ("year", pa.string())])
+    experience = pa.struct([
+        ("title", pa.string()),
+        ("company", pa.string()),
+        ("duration", pa.string()),
+        ("duration_months", pa.int32()),
+        ("technologies", pa.list_(pa.string())),
+    ])
+    return pa.schema([
+        ("_id", pa.string()),
+        ("full_name", pa.string()),
+        ("email", pa.string()),
+        ("phone", pa.string()),
+        ("location", pa.string()),
+        ("skills", pa.list_(pa.string())),
+        ("languages", pa.list_(pa.string())),
+        ("education", pa.list_(education)),
+        ("experience", pa.list_(experience)),
+        ("total_experience_months", pa.int32()),
+        ("created_at", pa.timestamp("ms")),
+        ("updated_at", pa.timestamp("ms")),
+    ])
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _parquet_row(cv: dict) -> dict:
+    # Older documents may hold years as ints or extra keys; keep to the schema
+    row = dict(cv)
+    row["education"] = [
+        {"degree": _text(e.get("degree")), "school": _text(e.get("school")), "year": _text(e.get("year"))}
+        for e in cv.get("education") or []
+    ]
+    row["experience"] = [
+        {
+            "title": _text(e.get("title")),
+            "company": _text(e.get("company")),
+            "duration": _text(e.get("duration")),
+            "duration_months": e.get("duration_months"),
+            "technologies": e.get("technologies") or [],
+        }
+        for e in cv.get("experience") or []
+    ]
+    return row
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that hands written bytes back to the caller.
+
+    ParquetWriter records absolute offsets in the footer, so tell() keeps
+    counting while drain() empties the buffer after each row group.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ParquetEncoder:
+    def __init__(self):
+        self.schema = _parquet_schema()
+        self.sink = _ChunkSink()
+        self.writer = pq.ParquetWriter(self.sink, self.schema, compression="snappy")
+
+    def encode(self, cvs: List[dict]) -> bytes:
+        table = pa.Table.from_pylist([_parquet_row(cv) for cv in cvs], schema=self.schema)
+        self.writer.write_table(table, row_group_size=len(cvs))
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+# --------------------------
+# Streaming
+# --------------------------
+async def iter_cv_batches(
+    filters: Dict[str, Any],
+    sort_by: str = "created_at",
+    sort_order: int = -1,
+    batch_size: int = 1000,
+) -> AsyncIterator[List[dict]]:
+    """Filtered CVs in API shape, `batch_size` at a time, from one cursor."""
+    docs = get_cv_repository().scan(filters, HIDDEN_FIELDS, [(sort_by, sort_order), ("_id", sort_order)], batch_size)
+    batch: List[dict] = []
+    try:
+        async for doc in docs:
+            cv = cv_helper(doc)
+            batch.append(cv)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        # Client disconnects stop the generator; release the server cursor
+        await docs.aclose()
+
+
+async def export_cvs(
+    filters: Dict[str, Any],
+    format: str = "ndjson",
+    sort_by: str = "created_at",
+    sort_order: int = -1,
+    batch_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Body chunks of the export file, one per batch."""
+    encode: Callable[[List[dict]], bytes]
+    parquet = None
+    if format == "parquet":
+        parquet = ParquetEncoder()
+        encode = parquet.encode
+    elif format == "csv":
+        yield csv_header()
+        encode = encode_csv
+    else:
+        encode = encode_ndjson
+
+    async for batch in iter_cv_batches(filters, sort_by, sort_order, batch_size):
+        chunk = await run_in_threadpool(encode, batch)
+        if chunk:
+            yield chunk
+
+    if parquet is not None:
+        yield parquet.close()
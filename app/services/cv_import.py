@@ -0,0 +1,241 @@
+"""Streaming bulk CV import (NDJSON or CSV request bodies).
+
+The body is parsed as it arrives, rows are validated with CVCreateUpdate
+and sanitize_cv_data in batches, and each batch is written with one
+unordered insert_many. Validation is CPU-bound (email checks dominate),
+so batches are prepared in a process pool (IMPORT_WORKERS) while earlier
+batches are being written. Only IMPORT_WORKERS batches in flight and a
+capped list of row errors are held in memory, whatever the upload size.
+
+CSV columns: full_name, email, phone, location, skills, languages
+(skills/languages separated by "|" or ";"), education, experience
+(JSON arrays of objects). Unknown columns are ignored.
+"""
+import asyncio
+import codecs
+import csv
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import IMPORT_WORKERS
+from app.core.storage import get_cv_repository
+from app.init import sanitize_cv_data
+from app.models.cv_model import CVCreateUpdate
+from app.services import cv_events
+from app.services.cv_service import derive_fields
+
+logger = logging.getLogger(__name__)
+
+LIST_COLUMNS = ("skills", "languages")
+JSON_COLUMNS = ("education", "experience")
+CSV_COLUMNS = ("full_name", "email", "phone", "location") + LIST_COLUMNS + JSON_COLUMNS
+
+# (row number starting at 1, parsed row or None, parse error or None)
+Row = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    row = 0
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(value, dict):
+            yield row, value, None
+        else:
+            yield row, None, "Each line must be a JSON object"
+
+
+def _split_list(value: str) -> List[str]:
+    separator = "|" if "|" in value else ";"
+    return [item.strip() for item in value.split(separator) if item.strip()]
+
+
+def _csv_record(header: List[str], values: List[str]) -> dict:
+    record: Dict[str, Any] = {}
+    for column, value in zip(header, values):
+        if column not in CSV_COLUMNS or value == "":
+            continue
+        if column in LIST_COLUMNS:
+            record[column] = _split_list(value)
+        elif column in JSON_COLUMNS:
+            record[column] = json.loads(value)
+        else:
+            record[column] = value
+    return record
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    header: Optional[List[str]] = None
+    record_lines: List[str] = []
+    row = 0
+    async for line in _lines(chunks):
+        record_lines.append(line.rstrip("\r"))
+        # A quoted field may contain newlines: wait until quotes are balanced
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue
+        text = "\n".join(record_lines)
+        record_lines = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [column.strip().lower() for column in values]
+            continue
+        row += 1
+        try:
+            record = _csv_record(header, values)
+        except ValueError as e:
+            yield row, None, f"Invalid JSON column: {e}"
+            continue
+        yield row, record, None
+    if record_lines:
+        row += 1
+        yield row, None, "Unterminated quoted field"
+
+
+def _prepare_batch(rows: List[Row]) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """Validate + sanitize a batch. Returns ([(row, document)], [error])."""
+    documents, errors = [], []
+    now = datetime.utcnow()
+    for row, record, parse_error in rows:
+        if parse_error:
+            errors.append({"row": row, "errors": [parse_error]})
+            continue
+        if not isinstance(record, dict):
+            errors.append({"row": row, "errors": ["Each row must be an object"]})
+            continue
+        try:
+            cv = CVCreateUpdate(**record)
+        except ValidationError as e:
+            errors.append({"row": row, "errors": e.errors(include_url=False, include_context=False, include_input=False)})
+            continue
+        document = derive_fields(sanitize_cv_data(cv.model_dump()))
+        document["created_at"] = now
+        document["updated_at"] = now
+        documents.append((row, document))
+    return documents, errors
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def _prepare(rows: List[Row]) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    global _pool
+    if IMPORT_WORKERS <= 1:
+        return await run_in_threadpool(_prepare_batch, rows)
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=IMPORT_WORKERS)
+    return await asyncio.get_running_loop().run_in_executor(_pool, _prepare_batch, rows)
+
+
+def shutdown():
+    """Stop the validation processes (lifespan shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def _failed_rows(rows: List[int], message: str) -> List[dict]:
+    return [{"row": row, "errors": [message]} for row in rows]
+
+
+async def _write_batch(rows: List[Row]) -> Tuple[int, List[dict]]:
+    """Insert one batch; never raises, every row not inserted gets an error."""
+    try:
+        documents, errors = await _prepare(rows)
+    except Exception as e:
+        logger.exception("Import batch validation failed")
+        return 0, _failed_rows([row for row, _, _ in rows], f"Batch could not be validated: {e}")
+    if not documents:
+        return 0, errors
+    failed_indexes = set()
+    try:
+        await get_cv_repository().insert_many([doc for _, doc in documents])
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            index = write_error["index"]
+            failed_indexes.add(index)
+            message = "Email already exists" if write_error.get("code") == 11000 else write_error.get("errmsg")
+            errors.append({"row": documents[index][0], "errors": [message]})
+    except Exception as e:
+        # Outcome unknown (e.g. connection lost mid-batch): some rows may be stored
+        logger.exception("Import batch write failed")
+        message = f"Batch write failed, the row may or may not be stored: {e}"
+        return 0, errors + _failed_rows([row for row, _ in documents], message)
+    inserted = [doc for i, (_, doc) in enumerate(documents) if i not in failed_indexes]
+    await cv_events.publish([(None, doc) for doc in inserted])
+    return len(inserted), errors
+
+
+async def import_cvs(rows: AsyncIterator[Row], batch_size: int = 1000, max_errors: int = 1000) -> dict:
+    report = {"received": 0, "inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    in_flight = set()
+
+    def record(task: asyncio.Task):
+        inserted, errors = task.result()
+        report["inserted"] += inserted
+        report["failed"] += len(errors)
+        room = max_errors - len(report["errors"])
+        report["errors"].extend(sorted(errors, key=lambda e: e["row"])[:max(room, 0)])
+        if len(errors) > room:
+            report["errors_truncated"] = True
+
+    async def submit(batch: List[Row]):
+        # Bounded pipeline: wait for a slot before reading more of the body
+        while len(in_flight) >= max(IMPORT_WORKERS, 1):
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            in_flight.difference_update(done)
+            for task in done:
+                record(task)
+        in_flight.add(asyncio.create_task(_write_batch(batch)))
+
+    batch: List[Row] = []
+    try:
+        async for row in rows:
+            report["received"] += 1
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await submit(batch)
+                batch = []
+        if batch:
+            await submit(batch)
+        if in_flight:
+            done, _ = await asyncio.wait(in_flight)
+            in_flight.difference_update(done)
+            for task in done:
+                record(task)
+    finally:
+        # Reading the body failed (or the request was cancelled): stop writing
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    report["errors"].sort(key=lambda e: e["row"])
+    return report
@@ -0,0 +1,61 @@
+"""Request-scoped CV dataloader.
+
+Code that resolves CV references one id at a time (for instance several
+coroutines gathered in one handler) can call `await loader.load(cv_id)`.
+Every id requested in the same event loop tick is fetched with a single
+$in query (get_cvs_by_ids), and results are memoized for the rest of the
+request. One loader per request: see app/dependencies/loaders.py.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.services.cv_service import get_cvs_by_ids
+
+# ids -> (items in input order, missing ids), like get_cvs_by_ids
+BatchFn = Callable[[List[str]], Awaitable[Tuple[List[dict], List[str]]]]
+
+
+class CVLoader:
+    def __init__(self, batch_fn: Optional[BatchFn] = None, max_batch_size: int = 500):
+        self.batch_fn = batch_fn or get_cvs_by_ids
+        self.max_batch_size = max_batch_size
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self.batches = 0
+
+    def load(self, cv_id: str) -> "asyncio.Future[Optional[dict]]":
+        """Future resolving to the CV (API shape) or None if it does not exist."""
+        future = self._futures.get(cv_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[cv_id] = loop.create_future()
+            if not self._queue:
+                # Dispatch once the coroutines already scheduled this tick have queued their ids
+                loop.call_soon(self._dispatch)
+            self._queue.append(cv_id)
+        return future
+
+    async def load_many(self, cv_ids: List[str]) -> List[Optional[dict]]:
+        return list(await asyncio.gather(*(self.load(cv_id) for cv_id in cv_ids)))
+
+    def _dispatch(self):
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch_size):
+            asyncio.ensure_future(self._fetch(queue[start:start + self.max_batch_size]))
+
+    async def _fetch(self, cv_ids: List[str]):
+        self.batches += 1
+        try:
+            items, _ = await self.batch_fn(cv_ids)
+        except Exception as e:
+            for cv_id in cv_ids:
+                # Failed lookups are not memoized: a later load retries
+                future = self._futures.pop(cv_id)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        by_id = {item["_id"]: item for item in items}
+        for cv_id in cv_ids:
+            future = self._futures[cv_id]
+            if not future.done():
+                future.set_result(by_id.get(cv_id.lower()))
@@ -1,52 +1,143 @@
-from typing import List, Optional, Dict, Any
+import re
+from typing import List, Optional, Dict, Any, Tuple
 from bson import ObjectId
-from pymongo import MongoClient
 from datetime import datetime
-from app.core.config import MONGO_URI, DB_NAME
-from app.models.cv_model import CVCreateUpdate
+from app.core.storage import get_cv_repository
+from app.models.cv_model import CVBulkPatch, CVCreateUpdate, CVPatchOperation
 from app.init import sanitize_cv_data
+from app.repositories.base import SCORE
+from app.services import analytics_store, cv_events, match_engine, query_cache, suggest
+from app.services.match_engine import skill_key
+from app.services.vocabulary import ID_FIELDS, vocabulary
+from app.utils.duration import parse_duration_months
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.text_search import SEARCH_FIELDS, SEARCH_PREFIX, build_search_fields, text_filter
+
+# Internal fields never returned by reads
+HIDDEN_FIELDS = {SEARCH_PREFIX: 0}
+
+# Fields a client can select with `fields=` (the _id is always returned)
+CV_FIELDS = (
+    "full_name", "email", "phone", "location", "education", "experience",
+    "skills", "languages", "total_experience_months", "created_at", "updated_at",
+)
+LIST_FIELDS = ("skills", "languages")
+
+# What cv_events subscribers read from a CV: a bulk patch reads and publishes only these
+CHANGE_FIELDS = {
+    **analytics_store.SOURCE_FIELDS, **match_engine.SOURCE_FIELDS, **suggest.SOURCE_FIELDS,
+    **{field: 1 for field in (*ID_FIELDS, *ID_FIELDS.values())}, "updated_at": 1,
+}
+# A CV written by someone else during a bulk patch is read and patched again, at most this many times
+PATCH_ATTEMPTS = 5
+
+# Facets the list endpoint can count over its matched set (`facets=`) -> document path
+FACET_FIELDS = {"skills": "skills", "languages": "languages", "location": "location", "degree": "education.degree"}
+
+
+def projection_for(fields: Optional[List[str]] = None, *extra: str) -> Dict[str, Any]:
+    """Mongo projection: everything but the internal fields, or only `fields`
+    (+ `extra`, e.g. the sort key a cursor needs)."""
+    if not fields:
+        return HIDDEN_FIELDS
+    return {name: 1 for name in (*fields, *extra)}
 
-# MongoDB connection
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
-collection = db["candidates"]
-
-# Create indexes at startup
-collection.create_index("email", unique=True)
-collection.create_index([
-    ("full_name", "text"),
-    ("email", "text"),
-    ("location", "text"),
-    ("education.degree", "text"),
-    ("education.school", "text"),
-    ("experience.title", "text"),
-    ("experience.company", "text"),
-    ("skills", "text"),
-    ("languages", "text")
-])
 
 # --------------------------
 # Helper to convert MongoDB document to dict
 # --------------------------
-def cv_helper(cv) -> dict:
+# The output is exactly what CVBase serializes to (by alias), so routes can
+# send it without response_model validation (see app/utils/serialization.py)
+def _education_out(edu: dict) -> dict:
+    return {"degree": edu.get("degree"), "school": edu.get("school"), "year": edu.get("year")}
+
+
+def _experience_out(exp: dict) -> dict:
     return {
-        "id": str(cv["_id"]),  # automatic id
+        "title": exp.get("title"),
+        "company": exp.get("company"),
+        "duration": exp.get("duration"),
+        "duration_months": exp.get("duration_months"),
+        "technologies": exp.get("technologies", []),
+    }
+
+
+def _field_out(cv: dict, name: str) -> Any:
+    if name == "education":
+        education = cv.get("education", [])
+        return [_education_out(e) for e in education] if education is not None else None
+    if name == "experience":
+        experience = cv.get("experience", [])
+        return [_experience_out(e) for e in experience] if experience is not None else None
+    if name in LIST_FIELDS:
+        return cv.get(name, [])
+    return cv.get(name)
+
+
+def cv_helper(cv, fields: Optional[List[str]] = None) -> dict:
+    if fields:
+        # Sparse fieldset: only the requested keys (projection already applied)
+        out = {"_id": str(cv["_id"])}
+        for name in fields:
+            out[name] = _field_out(cv, name)
+        return out
+    education = cv.get("education", [])
+    experience = cv.get("experience", [])
+    return {
+        "_id": str(cv["_id"]),  # automatic id
         "full_name": cv.get("full_name"),
         "email": cv.get("email"),
         "phone": cv.get("phone"),
         "location": cv.get("location"),
-        "education": cv.get("education", []),
-        "experience": cv.get("experience", []),
+        "education": [_education_out(e) for e in education] if education is not None else None,
+        "experience": [_experience_out(e) for e in experience] if experience is not None else None,
         "skills": cv.get("skills", []),
         "languages": cv.get("languages", []),
+        "total_experience_months": cv.get("total_experience_months"),
         "created_at": cv.get("created_at"),
         "updated_at": cv.get("updated_at"),
     }
 
+# --------------------------
+# Fields computed at write time
+# --------------------------
+def derive_fields(cv_dict: dict) -> dict:
+    """Fill the stored fields derived from client data (never sent by clients).
+
+    experience[].duration_months and total_experience_months come from the
+    free-text durations. Only recomputed when `experience` is being written.
+    `_search` holds the folded copies and trigrams of the filterable text
+    fields being written (see app/utils/text_search.py). skill_ids and
+    language_ids are the interned IDs of the (canonical) tags being
+    written (see app/services/vocabulary.py).
+    """
+    if "experience" in cv_dict:
+        total = 0
+        for exp in cv_dict["experience"] or []:
+            months = parse_duration_months(exp.get("duration"))
+            exp["duration_months"] = months
+            total += months or 0
+        cv_dict["total_experience_months"] = total
+    for kind, id_field in ID_FIELDS.items():
+        if kind in cv_dict:
+            cv_dict[id_field] = vocabulary.ids(kind, cv_dict[kind] or [])
+    search = build_search_fields(cv_dict)
+    if search:
+        cv_dict[SEARCH_PREFIX] = search
+    return cv_dict
+
+def _set_fields(update: dict) -> dict:
+    """$set document for an update: `_search` keys are set one by one
+    so the shadow fields of untouched text fields are kept."""
+    fields = {k: v for k, v in update.items() if k != SEARCH_PREFIX}
+    for key, value in update.get(SEARCH_PREFIX, {}).items():
+        fields[f"{SEARCH_PREFIX}.{key}"] = value
+    return fields
+
 # --------------------------
 # Service functions (CRUD + Search)
 # --------------------------
-def list_cvs(
+async def list_cvs(
     filters: Dict[str, Any],
     skip: int,
     limit: int,
@@ -54,7 +145,8 @@ def list_cvs(
     sort_order: int,
     search: bool = False,
     search_query: Optional[str] = None,
-    search_fields: Optional[List[str]] = None
+    search_fields: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
 ):
     query: Dict[str, Any] = filters.copy()
 
@@ -62,134 +154,293 @@ def list_cvs(
     if search_query:
         if search_fields:
             or_conditions = [
-                {field: {"$regex": search_query, "$options": "i"}}
+                text_filter(field, search_query) if field in SEARCH_FIELDS
+                else {field: {"$regex": re.escape(search_query), "$options": "i"}}
                 for field in search_fields
             ]
             query["$or"] = or_conditions
         else:
             query["$text"] = {"$search": search_query}
 
-    # Projection + sorting
-    projection = {"score": {"$meta": "textScore"}} if search_query and not search_fields else None
-    sort_fields = [("score", {"$meta": "textScore"})] if search_query and not search_fields else [(sort_by, sort_order)]
+    # Projection + sorting (full-text search: by relevance)
+    projection = projection_for(fields)
+    sort_fields = [(SCORE, -1)] if search_query and not search_fields else [(sort_by, sort_order)]
+
+    async def load():
+        docs = await get_cv_repository().find(query, projection, sort_fields, skip, limit)
+        return [cv_helper(cv, fields) for cv in docs]
+
+    params = {"query": query, "projection": projection, "sort": sort_fields, "skip": skip, "limit": limit}
+    return await query_cache.cache.cached("list_cvs", params, load)
+
+async def list_cvs_page(
+    filters: Dict[str, Any],
+    limit: int,
+    sort_by: str,
+    sort_order: int,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Keyset (cursor) pagination. Returns (items, next_cursor).
+
+    Pages are range scans on (sort_by, _id), so page 10,000 costs the same
+    as page 1 and inserts between page loads do not shift results.
+    sort_by="score" orders by text relevance and needs a $text filter.
+    Raises InvalidCursor for malformed or mismatched cursors.
+    """
+    position = decode_cursor(cursor, sort_by, sort_order) if cursor else None
+    params = {"filters": filters, "limit": limit, "sort": [sort_by, sort_order], "cursor": cursor, "fields": fields}
+    return await query_cache.cache.cached("list_cvs_page", params, lambda: _load_page(filters, limit, sort_by, sort_order, position, fields))
+
+async def _load_page(
+    filters: Dict[str, Any],
+    limit: int,
+    sort_by: str,
+    sort_order: int,
+    position: Optional[dict],
+    fields: Optional[List[str]],
+) -> Tuple[List[dict], Optional[str]]:
+    after = (position["value"], position["id"]) if position else None
+    docs = await get_cv_repository().page(filters, sort_by, sort_order, after, projection_for(fields, sort_by), limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, last.get(sort_by), last["_id"])
+    return [cv_helper(cv, fields) for cv in docs], next_cursor
+
+async def facet_counts(filters: Dict[str, Any], facets: List[str], limit: int = 10) -> Dict[str, List[dict]]:
+    """{facet: [{"value", "count"}, ...]} over the full matched set (not a page)."""
+    facets = sorted(set(facets))
 
-    cursor = (
-        collection.find(query, projection)
-        .sort(sort_fields)
-        .skip(skip)
-        .limit(limit)
-    )
-    return [cv_helper(cv) for cv in cursor]
+    async def load():
+        return await get_cv_repository().facets(filters, {name: FACET_FIELDS[name] for name in facets}, limit)
 
-def get_cv(cv_id: str) -> Optional[dict]:
+    params = {"filters": filters, "facets": facets, "limit": limit}
+    return await query_cache.cache.cached("facet_counts", params, load)
+
+async def get_cv(cv_id: str, fields: Optional[List[str]] = None) -> Optional[dict]:
     try:
         obj_id = ObjectId(cv_id)
     except:
         return None
-    cv = collection.find_one({"_id": obj_id})
-    return cv_helper(cv) if cv else None
+    cv = await get_cv_repository().find_one({"_id": obj_id}, projection_for(fields))
+    return cv_helper(cv, fields) if cv else None
+
+async def get_cvs_by_ids(ids: List[str], fields: Optional[List[str]] = None) -> Tuple[List[dict], List[str]]:
+    """Resolve CVs with one $in query. Returns (items in input order, missing ids).
 
-def create_cv(cv_data: CVCreateUpdate) -> dict:
-    cv_dict = sanitize_cv_data(cv_data.dict())
+    Duplicate ids are returned once; malformed ids are reported as missing.
+    """
+    ordered = list(dict.fromkeys(ids))
+    object_ids = {i: ObjectId(i) for i in ordered if ObjectId.is_valid(i)}
+    by_id = {}
+    if object_ids:
+        docs = await get_cv_repository().find({"_id": {"$in": list(object_ids.values())}}, projection_for(fields))
+        by_id = {cv["_id"]: cv for cv in docs}
+    items = [cv_helper(by_id[object_ids[i]], fields) for i in ordered if object_ids.get(i) in by_id]
+    missing = [i for i in ordered if object_ids.get(i) not in by_id]
+    return items, missing
+
+async def create_cv(cv_data: CVCreateUpdate) -> dict:
+    cv_dict = derive_fields(sanitize_cv_data(cv_data.model_dump()))
     cv_dict["created_at"] = datetime.utcnow()
     cv_dict["updated_at"] = datetime.utcnow()
-    inserted = collection.insert_one(cv_dict)
-    new_cv = collection.find_one({"_id": inserted.inserted_id})
-    return cv_helper(new_cv)
+    # insert sets the generated _id on cv_dict: no read-back needed
+    await get_cv_repository().insert(cv_dict)
+    await cv_events.publish([(None, cv_dict)])
+    return cv_helper(cv_dict)
 
-def update_cv(cv_id: str, updated_data: CVCreateUpdate) -> Optional[dict]:
+async def update_cv(cv_id: str, updated_data: CVCreateUpdate) -> Optional[dict]:
     try:
         obj_id = ObjectId(cv_id)
     except:
         return None
-    updated_dict = sanitize_cv_data(updated_data.dict(exclude_unset=True))
+    updated_dict = derive_fields(sanitize_cv_data(updated_data.model_dump(exclude_unset=True)))
     updated_dict["updated_at"] = datetime.utcnow()
-    result = collection.update_one({"_id": obj_id}, {"$set": updated_dict})
-    if result.matched_count == 0:
+    # The previous version is needed for the analytics deltas
+    previous = await get_cv_repository().update({"_id": obj_id}, _set_fields(updated_dict))
+    if previous is None:
         return None
-    updated_cv = collection.find_one({"_id": obj_id})
+    updated_cv = {
+        **previous,
+        **updated_dict,
+        SEARCH_PREFIX: {**previous.get(SEARCH_PREFIX, {}), **updated_dict.get(SEARCH_PREFIX, {})},
+    }
+    await cv_events.publish([(previous, updated_cv)])
     return cv_helper(updated_cv)
 
-def delete_cv(cv_id: str) -> Optional[dict]:
+async def delete_cv(cv_id: str) -> Optional[dict]:
     try:
         obj_id = ObjectId(cv_id)
     except:
         return None
-    cv = collection.find_one({"_id": obj_id})
+    # Atomic: the deleted version comes back for the analytics deltas
+    cv = await get_cv_repository().delete({"_id": obj_id})
     if not cv:
         return None
-    collection.delete_one({"_id": obj_id})
+    await cv_events.publish([(cv, None)])
     return {"message": "CV deleted successfully", "id": cv_id}
 
+def _tag_changes(tags: Dict[str, List[str]]) -> Dict[str, List[Any]]:
+    # Canonical names as sanitize_cv_data stores them, plus their IDs
+    changes: Dict[str, List[Any]] = {}
+    for field, values in tags.items():
+        changes[field] = vocabulary.canonicalize(field, values)
+        changes[ID_FIELDS[field]] = vocabulary.ids(field, values)
+    return changes
+
+def _patch_changes(operation: CVPatchOperation, now: datetime) -> Tuple[Dict[str, Any], Dict[str, List[Any]], Dict[str, List[Any]]]:
+    """($set fields, added tags, pulled tags) of one patch operation."""
+    set_fields: Dict[str, Any] = {}
+    if operation.set is not None:
+        set_fields = derive_fields(sanitize_cv_data(operation.set.model_dump(exclude_unset=True)))
+    set_fields["updated_at"] = now
+    return set_fields, _tag_changes(operation.add_to_set), _tag_changes(operation.pull)
+
+def _apply_patch(cv: dict, set_fields: Dict[str, Any], added: Dict[str, List[str]], pulled: Dict[str, List[str]]) -> dict:
+    """Local copy of `cv` after the update (what the server computes)."""
+    after = {
+        **cv,
+        **set_fields,
+        SEARCH_PREFIX: {**cv.get(SEARCH_PREFIX, {}), **set_fields.get(SEARCH_PREFIX, {})},
+    }
+    for field, values in added.items():
+        current = list(after.get(field) or [])
+        after[field] = current + [v for v in values if v not in current]
+    for field, values in pulled.items():
+        after[field] = [v for v in after.get(field) or [] if v not in values]
+    return after
+
+def _patch_cv(before: dict, changes: List[tuple]) -> Tuple[dict, Tuple[dict, dict]]:
+    """(after, write) of one CV: its operations applied in order to `before`,
+    written as one $set guarded on the updated_at that was read."""
+    after, written = before, {SEARCH_PREFIX: {}}
+    for set_fields, added, pulled in changes:
+        after = _apply_patch(after, set_fields, added, pulled)
+        written = _apply_patch(written, set_fields, {}, {})
+        written.update({field: after[field] for field in (*added, *pulled)})
+    guard = {"_id": before["_id"], "updated_at": before.get("updated_at")}
+    return after, (guard, _set_fields(written))
+
+async def patch_cvs(patch: CVBulkPatch) -> dict:
+    """Apply partial updates to many CVs with one batch of writes.
+
+    The CVs are read once, projected on what cv_events subscribers use
+    (CHANGE_FIELDS), and each gets a single $set with the result of
+    its operations, guarded on updated_at. A CV written in between (e.g.
+    by update_cv) is not matched: it is read and patched again, so the
+    published (before, after) pairs are exactly what was written.
+    """
+    now = datetime.utcnow()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)  # stored with millisecond precision
+    changes: Dict[ObjectId, List[tuple]] = {}
+    for operation in patch.operations:
+        change = _patch_changes(operation, now)
+        for i in dict.fromkeys(operation.ids):
+            if ObjectId.is_valid(i):
+                changes.setdefault(ObjectId(i), []).append(change)
+
+    repository = get_cv_repository()
+    matched = modified = 0
+    written, pending = set(), list(changes)
+    for _ in range(PATCH_ATTEMPTS):
+        before = {cv["_id"]: cv for cv in await repository.find({"_id": {"$in": pending}}, CHANGE_FIELDS)} if pending else {}
+        if not before:
+            pending = []
+            break
+        patched = {oid: _patch_cv(cv, changes[oid]) for oid, cv in before.items()}
+        matched_now, modified_now = await repository.update_each([write for _, write in patched.values()])
+        matched += matched_now
+        modified += modified_now
+        if matched_now == len(patched):
+            done = list(patched)
+        else:
+            # The CVs this write matched are the ones now carrying its updated_at
+            done = [cv["_id"] for cv in await repository.find({"_id": {"$in": list(patched)}, "updated_at": now}, {"_id": 1})]
+        await cv_events.publish([(before[oid], patched[oid][0]) for oid in done])
+        written.update(done)
+        pending = [oid for oid in patched if oid not in written]
+
+    requested = dict.fromkeys(i for operation in patch.operations for i in operation.ids)
+    valid = {i: ObjectId(i) for i in requested if ObjectId.is_valid(i)}
+    pending = set(pending)
+    return {
+        "matched": matched,
+        "modified": modified,
+        "missing": [i for i in requested if i not in valid or valid[i] not in written and valid[i] not in pending],
+        "conflicts": [i for i in valid if valid[i] in pending],
+    }
+
 # --------------------------
-# Analytics functions
+# Analytics functions (read the materialized counters, see analytics_store)
 # --------------------------
-def get_top_skills(limit: int = 10):
-    pipeline = [
-        {"$unwind": "$skills"},
-        {"$group": {"_id": "$skills", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-        {"$limit": limit}
-    ]
-    result = list(collection.aggregate(pipeline))
-    return [{"skill": r["_id"], "count": r["count"]} for r in result]
-
-def get_top_locations(limit: int = 10):
-    pipeline = [
-        {"$group": {"_id": "$location", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-        {"$limit": limit}
-    ]
-    result = list(collection.aggregate(pipeline))
-    return [{"location": r["_id"], "count": r["count"]} for r in result if r["_id"]]
-
-def get_education_distribution():
-    pipeline = [
-        {"$unwind": "$education"},
-        {"$group": {"_id": "$education.degree", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-    ]
-    result = list(collection.aggregate(pipeline))
-    return [{"degree": r["_id"], "count": r["count"]} for r in result if r["_id"]]
-
-def get_experience_stats():
-    pipeline = [
-        {"$unwind": "$experience"},
-        {"$match": {"experience.years": {"$exists": True}}},
-        {"$group": {
-            "_id": None,
-            "min_years": {"$min": "$experience.years"},
-            "max_years": {"$max": "$experience.years"},
-            "avg_years": {"$avg": "$experience.years"},
-        }}
-    ]
-    result = list(collection.aggregate(pipeline))
-    return result[0] if result else {}
+# (cached: dashboards poll these in bursts, see query_cache)
+async def _top(facet: str, label: str, limit: Optional[int] = None) -> List[dict]:
+    async def load():
+        result = await analytics_store.top_values(facet, limit)
+        return [{label: r["value"], "count": r["count"]} for r in result]
+    return await query_cache.cache.cached("top_values", {"facet": facet, "limit": limit}, load)
+
+async def get_top_skills(limit: int = 10):
+    return await _top(analytics_store.SKILL, "skill", limit)
+
+async def get_top_locations(limit: int = 10):
+    return await _top(analytics_store.LOCATION, "location", limit)
+
+async def get_education_distribution():
+    return await _top(analytics_store.DEGREE, "degree")
+
+async def get_top_languages(limit: int = 10):
+    return await _top(analytics_store.LANGUAGE, "language", limit)
+
+async def get_experience_stats():
+    return await query_cache.cache.cached("experience_stats", {}, analytics_store.experience_stats)
 
 # --------------------------
 # Candidate Matching
 # --------------------------
-def match_candidates(job_skills: List[str], min_experience: int = 0, top_n: int = 5):
-    pipeline = [
-        {
-            "$addFields": {
-                "skill_match_count": {"$size": {"$setIntersection": ["$skills", job_skills]}}
-            }
-        },
-        {
-            "$match": {
-                "experience": {"$exists": True},
-                # Optional: you may also want to filter by years of experience in nested experience list
-            }
-        },
-        {
-            "$sort": {"skill_match_count": -1}
-        },
-        {"$limit": top_n}
-    ]
-    results = list(collection.aggregate(pipeline))
-    return [cv_helper(cv) for cv in results]  # map _id -> id
-
-def count_cvs(filters: Dict[str, Any] = {}) -> int:
+def _integer_weights(skills: List[str], weights: Dict[str, float]) -> Tuple[Dict[str, int], int]:
+    """Skill -> positive integer weight (default 1), plus the scale applied."""
+    raw = {skill: float(weights.get(skill, 1)) for skill in skills}
+    scale = 1 if all(w.is_integer() for w in raw.values()) else 100
+    return {skill: int(round(w * scale)) for skill, w in raw.items() if w > 0}, scale
+
+async def match_candidates(
+    job_skills: List[str],
+    min_experience: int = 0,
+    top_n: int = 5,
+    required_skills: Optional[List[str]] = None,
+    weights: Optional[Dict[str, float]] = None,
+):
+    """Top candidates by weighted skill overlap (on skill IDs: any alias or case matches).
+
+    Candidates must have every required skill and at least
+    `min_experience` years, and match at least one skill. Served by the
+    in-memory match engine when it is ready, else by the storage backend.
+    """
+    required_skills = required_skills or []
+    skills = list(dict.fromkeys([*job_skills, *required_skills]))
+    int_weights, scale = _integer_weights(skills, weights or {})
+
+    if match_engine.engine.ready:
+        ranked = match_engine.engine.index.top_k(int_weights, top_n, required_skills, min_experience)
+        docs = await get_cv_repository().find({"_id": {"$in": [doc_id for doc_id, _ in ranked]}}, HIDDEN_FIELDS)
+        by_id = {cv["_id"]: cv for cv in docs}
+        return [
+            {**cv_helper(by_id[doc_id]), "match_score": score / scale}
+            for doc_id, score in ranked
+            if doc_id in by_id
+        ]
+    # Fallback: scored by the storage backend (a collection scan on MongoDB)
+    weights_by_id = {skill_key(skill): weight for skill, weight in int_weights.items()}
+    required = [skill_key(s) for s in required_skills]
+    results = await get_cv_repository().match(weights_by_id, required, min_experience * 12, top_n, HIDDEN_FIELDS)
+    return [{**cv_helper(cv), "match_score": cv["match_score"] / scale} for cv in results]
+
+async def count_cvs(filters: Dict[str, Any] = {}) -> int:
     """Return total number of CVs matching filters (fast count)."""
-    return collection.count_documents(filters)
\ No newline at end of file
+    if not filters:
+        return await query_cache.cache.cached("total_cvs", {}, analytics_store.total_cvs)
+    return await query_cache.cache.cached("count_cvs", {"filters": filters}, lambda: get_cv_repository().count(filters))
\ No newline at end of file
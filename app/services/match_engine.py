@@ -0,0 +1,315 @@
+"""In-process candidate matching on bitmap posting lists.
+
+Every CV gets a dense integer doc number. For each skill (by interned ID,
+so aliases and spellings match, see vocabulary.py) the engine keeps a
+posting list as a Python int used as a bitmap (bit n set = doc n has the
+skill), so AND/OR/popcount over a million candidates are single C-level
+big-int operations.
+
+Scoring is a bit-sliced index: the weighted skill bitmaps of a job are
+added into binary "planes" (plane i holds bit i of every candidate's
+score), and the top-k are read from the planes from the most significant
+bit down, without visiting each candidate. Required skills and the
+experience filter are plain bitmap ANDs.
+
+The index lives in each worker: it is built in the background at startup,
+kept current through cv_events for writes made by this worker, and can be
+rebuilt periodically (MATCH_ENGINE_REFRESH_SECONDS) to pick up writes from
+other workers. Until it is ready, callers fall back to the Mongo pipeline.
+"""
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import MATCH_ENGINE_ENABLED, MATCH_ENGINE_REFRESH_SECONDS
+from app.core.storage import get_cv_repository
+from app.services import cv_events
+from app.services.vocabulary import SKILLS, vocabulary
+
+logger = logging.getLogger(__name__)
+
+# Experience is bucketed per whole year; the last bucket is "this or more"
+MAX_EXPERIENCE_BUCKET = 50
+SOURCE_FIELDS = {"skills": 1, "skill_ids": 1, "total_experience_months": 1}
+
+
+def skill_key(skill: str) -> Optional[int]:
+    """Interned ID of a skill name (any alias or spelling)."""
+    return vocabulary.id(SKILLS, skill)
+
+
+def doc_skill_ids(doc: dict) -> frozenset:
+    """Skill IDs of a CV (derived from the names for CVs not yet migrated)."""
+    ids = doc.get("skill_ids")
+    if ids is None:
+        ids = vocabulary.ids(SKILLS, doc.get("skills") or [])
+    return frozenset(ids)
+
+
+def experience_years(cv: dict) -> int:
+    """Whole years of experience of a CV (from total_experience_months)."""
+    return (cv.get("total_experience_months") or 0) // 12
+
+
+def bitmap_from(docnos: Iterable[int], size: int) -> int:
+    """Build a bitmap in one pass (setting bits one by one is quadratic)."""
+    buffer = bytearray((size >> 3) + 1)
+    for n in docnos:
+        buffer[n >> 3] |= 1 << (n & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def iter_bits(bitmap: int, limit: Optional[int] = None):
+    """Yield set bit positions from the lowest, at most `limit` of them."""
+    found = 0
+    while bitmap and (limit is None or found < limit):
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+        found += 1
+
+
+class SkillMatchIndex:
+    def __init__(self):
+        self._ids: List = []                     # docno -> _id (None once deleted)
+        self._docnos: Dict = {}                  # _id -> docno
+        self._free: List[int] = []               # docnos of deleted CVs, reused first
+        self._doc_skills: List[frozenset] = []   # docno -> skill IDs
+        self._doc_bucket: List[int] = []         # docno -> experience bucket
+        self._postings: Dict[int, int] = {}      # skill ID -> bitmap
+        self._buckets: List[int] = [0] * (MAX_EXPERIENCE_BUCKET + 1)
+        self._alive = 0
+
+    def __len__(self):
+        return len(self._docnos)
+
+    # ---- Build / maintenance ----
+    @classmethod
+    def from_documents(cls, docs: Iterable[dict]) -> "SkillMatchIndex":
+        builder = IndexBuilder()
+        for doc in docs:
+            builder.add(doc)
+        return builder.build()
+
+    def _clear(self, docno: int):
+        mask = ~(1 << docno)
+        for skill in self._doc_skills[docno]:
+            self._postings[skill] &= mask
+        self._buckets[self._doc_bucket[docno]] &= mask
+        self._alive &= mask
+
+    def remove(self, doc_id):
+        docno = self._docnos.pop(doc_id, None)
+        if docno is None:
+            return
+        self._clear(docno)
+        self._ids[docno] = None
+        self._doc_skills[docno] = frozenset()
+        self._free.append(docno)
+
+    def upsert(self, doc: dict):
+        """Add or replace a CV. Idempotent, so replaying a change is safe.
+
+        A CV keeps its doc number across updates and deleted numbers are
+        reused, so bitmaps stay as wide as the largest number of live CVs.
+        """
+        docno = self._docnos.get(doc["_id"])
+        if docno is not None:
+            self._clear(docno)
+        elif self._free:
+            docno = self._free.pop()
+        else:
+            docno = len(self._ids)
+            self._ids.append(None)
+            self._doc_skills.append(frozenset())
+            self._doc_bucket.append(0)
+        bit = 1 << docno
+        skills = doc_skill_ids(doc)
+        bucket = min(experience_years(doc), MAX_EXPERIENCE_BUCKET)
+        self._ids[docno] = doc["_id"]
+        self._docnos[doc["_id"]] = docno
+        self._doc_skills[docno] = skills
+        self._doc_bucket[docno] = bucket
+        for skill in skills:
+            self._postings[skill] = self._postings.get(skill, 0) | bit
+        self._buckets[bucket] |= bit
+        self._alive |= bit
+
+    def apply(self, changes: Sequence[cv_events.Change]):
+        for before, after in changes:
+            if after is not None:
+                self.upsert(after)
+            elif before is not None:
+                self.remove(before["_id"])
+
+    # ---- Query ----
+    def eligible(self, required: Sequence[str], min_experience: int) -> int:
+        mask = self._alive
+        if min_experience > 0:
+            mask = 0
+            for bucket in range(min(min_experience, MAX_EXPERIENCE_BUCKET), MAX_EXPERIENCE_BUCKET + 1):
+                mask |= self._buckets[bucket]
+        for skill in required:
+            mask &= self._postings.get(skill_key(skill), 0)
+        return mask
+
+    def top_k(
+        self,
+        weights: Dict[str, int],
+        k: int,
+        required: Sequence[str] = (),
+        min_experience: int = 0,
+    ) -> List[Tuple[object, int]]:
+        """Top-k (_id, score) by summed integer skill weights, best first.
+
+        Only candidates matching at least one weighted skill are returned;
+        ties are broken by doc number.
+        """
+        if k <= 0:
+            return []
+        mask = self.eligible(required, min_experience)
+        postings = {}
+        for skill, weight in weights.items():
+            bitmap = self._postings.get(skill_key(skill), 0) & mask
+            if bitmap and weight > 0:
+                postings[skill_key(skill)] = (bitmap, weight)
+        if not postings:
+            return []
+
+        # Bit-sliced sum of the weighted postings
+        planes: List[int] = []
+        candidates = 0
+        for bitmap, weight in postings.values():
+            candidates |= bitmap
+            plane = 0
+            while weight:
+                if weight & 1:
+                    carry, i = bitmap, plane
+                    while carry:
+                        while len(planes) <= i:
+                            planes.append(0)
+                        planes[i], carry = planes[i] ^ carry, planes[i] & carry
+                        i += 1
+                weight >>= 1
+                plane += 1
+
+        # Top-k over the planes, most significant first
+        greater, equal = 0, candidates
+        for plane in reversed(planes):
+            above = greater | (equal & plane)
+            count = above.bit_count()
+            if count > k:
+                equal &= plane
+            elif count == k:
+                greater, equal = above, 0
+                break
+            else:
+                greater = above
+                equal &= ~plane
+        missing = k - greater.bit_count()
+        chosen = list(iter_bits(greater)) + list(iter_bits(equal, missing))
+
+        scored = [
+            (self._ids[docno], sum(1 << i for i, plane in enumerate(planes) if plane >> docno & 1))
+            for docno in chosen
+        ]
+        scored.sort(key=lambda item: -item[1])
+        return scored
+
+
+class IndexBuilder:
+    """Collects CVs one at a time and builds the bitmaps in a single pass.
+
+    Only doc numbers are kept per skill and bucket, not the documents, so
+    the index can be built straight from a cursor.
+    """
+
+    def __init__(self):
+        self.index = SkillMatchIndex()
+        self._skill_docnos: Dict[int, List[int]] = {}
+        self._bucket_docnos: List[List[int]] = [[] for _ in self.index._buckets]
+
+    def add(self, doc: dict):
+        index = self.index
+        if doc["_id"] in index._docnos:
+            return
+        docno = len(index._ids)
+        skills = doc_skill_ids(doc)
+        bucket = min(experience_years(doc), MAX_EXPERIENCE_BUCKET)
+        index._ids.append(doc["_id"])
+        index._docnos[doc["_id"]] = docno
+        index._doc_skills.append(skills)
+        index._doc_bucket.append(bucket)
+        for skill in skills:
+            self._skill_docnos.setdefault(skill, []).append(docno)
+        self._bucket_docnos[bucket].append(docno)
+
+    def build(self) -> SkillMatchIndex:
+        index = self.index
+        size = len(index._ids)
+        index._postings = {skill: bitmap_from(docnos, size) for skill, docnos in self._skill_docnos.items()}
+        index._buckets = [bitmap_from(docnos, size) for docnos in self._bucket_docnos]
+        index._alive = (1 << size) - 1
+        return index
+
+
+# --------------------------
+# Worker-wide engine
+# --------------------------
+class MatchEngine:
+    def __init__(self):
+        self.index: Optional[SkillMatchIndex] = None
+        self._pending: Optional[List[cv_events.Change]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return MATCH_ENGINE_ENABLED and self.index is not None
+
+    async def rebuild(self, batch_size: int = 5000):
+        # Changes that arrive while the snapshot is streamed are replayed on top
+        self._pending = []
+        try:
+            builder = IndexBuilder()
+            async for doc in get_cv_repository().scan({}, SOURCE_FIELDS, batch_size=batch_size):
+                builder.add(doc)
+            index = builder.build()
+            index.apply(self._pending)
+            self.index = index
+        finally:
+            self._pending = None
+        logger.info("Match index built with %d candidates", len(self.index))
+
+    async def on_changes(self, changes: Sequence[cv_events.Change]):
+        if self._pending is not None:
+            self._pending.extend(changes)
+        if self.index is not None:
+            self.index.apply(changes)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Match index build failed, using the Mongo pipeline")
+            if not MATCH_ENGINE_REFRESH_SECONDS:
+                return
+            await asyncio.sleep(MATCH_ENGINE_REFRESH_SECONDS)
+
+    def start(self):
+        """Build in the background (lifespan startup); matching falls back to Mongo meanwhile."""
+        if MATCH_ENGINE_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+engine = MatchEngine()
+cv_events.subscribe(engine.on_changes)
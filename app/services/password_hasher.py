@@ -0,0 +1,93 @@
+"""bcrypt hashing and verification off the request path.
+
+bcrypt is deliberately slow (~250 ms at 12 rounds), so a login burst
+running it on Starlette's shared threadpool would hold those threads
+(exports, imports, sync dependencies) and compete for the GIL with the
+event loop. Hashes run in a dedicated process pool of
+PASSWORD_HASH_WORKERS processes instead (0 = the threadpool, as before).
+
+Admission control: at most workers + PASSWORD_HASH_QUEUE jobs are
+accepted at once; further calls fail fast with HasherSaturated, which
+the routes turn into 503 + Retry-After rather than letting latency grow
+without bound.
+
+Hashes made with another cost factor than BCRYPT_ROUNDS are reported by
+verify_and_update() so login can store the upgraded hash.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import BCRYPT_ROUNDS, PASSWORD_HASH_QUEUE, PASSWORD_HASH_WORKERS
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+class HasherSaturated(Exception):
+    """Too many password hashes in flight; retry later."""
+
+
+# ---- Work functions (run in the worker processes)
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return pwd_context.verify(password, hashed)
+
+
+def _verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_size: int = PASSWORD_HASH_QUEUE):
+        self.workers = workers
+        self.capacity = max(workers, 1) + queue_size
+        self.in_flight = 0
+        self.rejected = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def _run(self, fn, *args):
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise HasherSaturated()
+        self.in_flight += 1
+        try:
+            if self.workers <= 0:
+                return await run_in_threadpool(fn, *args)
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        finally:
+            self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(_verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new hash if the stored one uses outdated settings else None)."""
+        return await self._run(_verify_and_update, password, hashed)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        """Stop the worker processes (lifespan shutdown)."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+hasher = PasswordHasher()
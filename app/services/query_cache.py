@@ -0,0 +1,241 @@
+"""Read-through cache for CV list and analytics queries.
+
+    result = await query_cache.cached("top_skills", {"limit": 10}, load)
+
+Keys are a canonical hash of the namespace and the query parameters
+(filter, sort, pagination), prefixed with a generation number. Every CV
+write bumps the generation through cv_events, so older entries are never
+read again; the TTL bounds staleness for writes this process does not
+see (other workers, when the backend is per process).
+
+Backends (QUERY_CACHE_BACKEND):
+- "memory": per-process LRU (default)
+- "redis": any Redis-compatible server at QUERY_CACHE_REDIS_URL, shared
+  by all workers, generation included; needs the optional `redis` package
+- "off": no caching
+
+Concurrent misses on the same key are coalesced into one load
+(single-flight); if the caller running the load is cancelled, the
+others retry instead of failing with it. Hit/miss/coalesced counters and latencies are exposed
+through stats().
+"""
+import asyncio
+import hashlib
+import logging
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from bson import json_util
+
+from app.core.config import (
+    QUERY_CACHE_BACKEND,
+    QUERY_CACHE_REDIS_URL,
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL_SECONDS,
+)
+from app.services import cv_events
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional dependency
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cvcache:"
+
+
+def cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    """Stable key: same parameters in any dict order give the same key."""
+    canonical = json_util.dumps(params, sort_keys=True, separators=(",", ":"))
+    return f"{namespace}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+# --------------------------
+# Backends
+# --------------------------
+class MemoryBackend:
+    """Bounded LRU of (expires_at, value), local to the worker process."""
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def bump(self):
+        self._generation += 1
+        # Entries of older generations are unreachable: free them now
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared cache in Redis; the generation is a counter key, so a write
+    on any worker invalidates every worker's view."""
+
+    def __init__(self, url: str):
+        if aioredis is None:
+            raise RuntimeError("QUERY_CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = aioredis.from_url(url)
+        self.generation_key = f"{KEY_PREFIX}generation"
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        data = await self.client.get(KEY_PREFIX + key)
+        if data is None:
+            return False, None
+        return True, pickle.loads(data)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self.client.set(KEY_PREFIX + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=int(ttl * 1000))
+
+    async def generation(self) -> int:
+        return int(await self.client.get(self.generation_key) or 0)
+
+    async def bump(self):
+        await self.client.incr(self.generation_key)
+
+
+# --------------------------
+# Cache
+# --------------------------
+class QueryCache:
+    def __init__(self, backend=None, ttl: float = 30):
+        self.backend = backend
+        self.ttl = ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.invalidations = 0
+        self._hit_seconds = 0.0
+        self._miss_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    async def cached(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        load: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Cached result of `load()` for these parameters. Results are shared:
+        callers must not mutate them."""
+        if not self.enabled:
+            return await load()
+        started = time.perf_counter()
+        try:
+            key = f"{await self.backend.generation()}:{cache_key(namespace, params)}"
+            found, value = await self.backend.get(key)
+        except Exception:
+            # A cache outage degrades to uncached reads, never to errors
+            self.errors += 1
+            logger.exception("Query cache lookup failed")
+            return await load()
+        if found:
+            self.hits += 1
+            self._hit_seconds += time.perf_counter() - started
+            return value
+
+        pending = self._inflight.get(key)
+        while pending is not None:
+            # Same query already running: wait for its result
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this caller was cancelled
+            # The leading caller was cancelled, not this one: load again,
+            # behind whichever waiter got there first
+            self.coalesced -= 1
+            pending = self._inflight.get(key)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else waits
+            raise
+        else:
+            future.set_result(value)
+            try:
+                await self.backend.set(key, value, self.ttl if ttl is None else ttl)
+            except Exception:
+                self.errors += 1
+                logger.exception("Query cache store failed")
+        finally:
+            del self._inflight[key]
+            self._miss_seconds += time.perf_counter() - started
+        return value
+
+    async def invalidate(self):
+        """Start a new generation (every cached result becomes stale)."""
+        self.invalidations += 1
+        if self.backend is not None:
+            await self.backend.bump()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "ttl_seconds": self.ttl,
+            "size": len(self.backend) if isinstance(self.backend, MemoryBackend) else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+            "avg_hit_ms": round(self._hit_seconds / self.hits * 1000, 3) if self.hits else None,
+            "avg_miss_ms": round(self._miss_seconds / self.misses * 1000, 3) if self.misses else None,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+        }
+
+
+def _backend_from_config():
+    if QUERY_CACHE_BACKEND == "redis":
+        return RedisBackend(QUERY_CACHE_REDIS_URL)
+    if QUERY_CACHE_BACKEND == "memory":
+        return MemoryBackend(QUERY_CACHE_SIZE)
+    return None
+
+
+cache = QueryCache(_backend_from_config(), QUERY_CACHE_TTL_SECONDS)
+
+
+# Last: a load racing the write must not cache the old counters/indexes under the new generation
+@cv_events.subscribe(priority=cv_events.LAST)
+async def on_cv_changes(changes):
+    await cache.invalidate()
@@ -0,0 +1,223 @@
+"""Opt-in slow-query capture (QUERY_PROFILER_ENABLED).
+
+Hot read paths wrap their MongoDB call:
+
+    async with query_profiler.track("list_cvs", collection, find_command(...)):
+        docs = await cursor.to_list()
+
+When the call takes longer than QUERY_PROFILER_THRESHOLD_MS, the query is
+reduced to its shape (operators and field names, values replaced by
+"?"), recorded, and explained in the background with executionStats.
+The plan is checked for collection scans, blocking in-memory sorts and
+a high docs-examined / returned ratio.
+
+Recent slow queries go to a ring buffer (QUERY_PROFILER_BUFFER entries);
+repeats of a shape are aggregated (count, total and max time, flags), and
+a shape is explained at most once per EXPLAIN_INTERVAL_SECONDS. Both are
+served by the admin-only GET /api/v1/system/slow-queries.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, List, Optional
+
+from bson import SON, json_util
+
+from app.core.config import (
+    QUERY_PROFILER_BUFFER,
+    QUERY_PROFILER_ENABLED,
+    QUERY_PROFILER_THRESHOLD_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_INTERVAL_SECONDS = 60
+MAX_SHAPES = 500
+# Examined documents per returned document above which a plan is flagged
+EXAMINED_RATIO_LIMIT = 10
+
+
+# --------------------------
+# Command specs (what gets explained)
+# --------------------------
+def find_command(collection, filter: dict, projection: Optional[dict] = None, sort=None,
+                 skip: int = 0, limit: int = 0) -> SON:
+    command = SON([("find", collection.name), ("filter", filter)])
+    if projection:
+        command["projection"] = projection
+    if sort:
+        command["sort"] = SON(sort) if isinstance(sort, list) else sort
+    if skip:
+        command["skip"] = skip
+    if limit:
+        command["limit"] = limit
+    return command
+
+
+def aggregate_command(collection, pipeline: List[dict]) -> SON:
+    return SON([("aggregate", collection.name), ("pipeline", pipeline), ("cursor", {})])
+
+
+# --------------------------
+# Shapes and plan analysis (pure)
+# --------------------------
+def query_shape(value: Any) -> Any:
+    """Operators and field names kept, literal values replaced by "?"."""
+    if isinstance(value, dict):
+        return {key: query_shape(value[key]) for key in sorted(value)}
+    if isinstance(value, (list, tuple)):
+        shapes = [query_shape(item) for item in value]
+        # $in/$all lists of literals collapse to one placeholder
+        if all(shape == "?" for shape in shapes):
+            return ["?"] if shapes else []
+        return shapes
+    return "?"
+
+
+def command_shape(command: dict) -> dict:
+    shape = {}
+    for key, value in command.items():
+        if key in ("find", "aggregate"):
+            shape[key] = value
+        elif key in ("sort", "projection"):
+            shape[key] = dict(value)  # field names and directions are part of the shape
+        elif key in ("skip", "limit", "cursor"):
+            continue
+        else:
+            shape[key] = query_shape(value)
+    return shape
+
+
+def _plan_nodes(plan: Optional[dict]) -> List[dict]:
+    nodes: List[dict] = []
+    if not plan:
+        return nodes
+    if "stage" in plan:
+        nodes.append(plan)
+    for key in ("inputStage", "queryPlan", "outerStage", "innerStage"):
+        nodes += _plan_nodes(plan.get(key))
+    for child in plan.get("inputStages", []):
+        nodes += _plan_nodes(child)
+    return nodes
+
+
+def _find_section(explain: dict, name: str) -> Optional[dict]:
+    if name in explain:
+        return explain[name]
+    for stage in explain.get("stages", []):  # aggregation explain
+        cursor_stage = stage.get("$cursor")
+        if cursor_stage and name in cursor_stage:
+            return cursor_stage[name]
+    return None
+
+
+def analyze_explain(explain: dict) -> dict:
+    planner = _find_section(explain, "queryPlanner") or {}
+    stats = _find_section(explain, "executionStats") or {}
+    nodes = _plan_nodes(planner.get("winningPlan"))
+    stages = [node["stage"] for node in nodes]
+    keys = stats.get("totalKeysExamined")
+    docs = stats.get("totalDocsExamined")
+    returned = stats.get("nReturned")
+    flags = []
+    if "COLLSCAN" in stages:
+        flags.append("COLLSCAN")
+    if "SORT" in stages:
+        flags.append("IN_MEMORY_SORT")
+    if docs is not None and returned is not None and docs > EXAMINED_RATIO_LIMIT * max(returned, 1):
+        flags.append("HIGH_DOCS_EXAMINED_RATIO")
+    return {
+        "stages": stages,
+        "flags": flags,
+        "keys_examined": keys,
+        "docs_examined": docs,
+        "returned": returned,
+        "indexes": [node["indexName"] for node in nodes if "indexName" in node],
+    }
+
+
+# --------------------------
+# Profiler
+# --------------------------
+class QueryProfiler:
+    def __init__(self, enabled: bool = False, threshold_ms: float = 100, buffer_size: int = 200):
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.recent: deque = deque(maxlen=buffer_size)
+        self.shapes: "OrderedDict[str, dict]" = OrderedDict()
+        self._tasks: set = set()
+
+    @asynccontextmanager
+    async def track(self, operation: str, collection, command: dict):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        yield
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= self.threshold_ms:
+            self.record(operation, collection, command, elapsed_ms)
+
+    def record(self, operation: str, collection, command: dict, elapsed_ms: float):
+        shape = command_shape(command)
+        key = f"{operation}:{json_util.dumps(shape, sort_keys=True)}"
+        now = datetime.utcnow()
+        entry = {
+            "time": now,
+            "operation": operation,
+            "duration_ms": round(elapsed_ms, 2),
+            "shape": shape,
+            "plan": None,
+        }
+        self.recent.append(entry)
+
+        summary = self.shapes.pop(key, None)
+        if summary is None:
+            summary = {"operation": operation, "shape": shape, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                       "flags": [], "plan": None, "explained_at": None}
+        summary["count"] += 1
+        summary["total_ms"] = round(summary["total_ms"] + elapsed_ms, 2)
+        summary["max_ms"] = max(summary["max_ms"], round(elapsed_ms, 2))
+        summary["last_seen"] = now
+        self.shapes[key] = summary  # most recently seen last
+        while len(self.shapes) > MAX_SHAPES:
+            self.shapes.popitem(last=False)
+
+        explained_at = summary["explained_at"]
+        if explained_at is None or (now - explained_at).total_seconds() >= EXPLAIN_INTERVAL_SECONDS:
+            summary["explained_at"] = now
+            task = asyncio.create_task(self._explain(collection, command, entry, summary))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            entry["plan"] = summary["plan"]
+
+    async def _explain(self, collection, command: dict, entry: dict, summary: dict):
+        try:
+            explain = await collection.database.command("explain", command, verbosity="executionStats")
+        except Exception as e:
+            logger.warning("explain failed for %s: %s", summary["operation"], e)
+            return
+        plan = analyze_explain(explain)
+        entry["plan"] = summary["plan"] = plan
+        summary["flags"] = sorted(set(summary["flags"]) | set(plan["flags"]))
+
+    def report(self, limit: int = 50) -> dict:
+        shapes = sorted(self.shapes.values(), key=lambda s: s["total_ms"], reverse=True)
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold_ms,
+            "recent": list(self.recent)[-limit:][::-1],
+            "shapes": [{k: v for k, v in s.items() if k != "explained_at"} for s in shapes[:limit]],
+        }
+
+    def reset(self):
+        self.recent.clear()
+        self.shapes.clear()
+
+
+profiler = QueryProfiler(QUERY_PROFILER_ENABLED, QUERY_PROFILER_THRESHOLD_MS, QUERY_PROFILER_BUFFER)
+track = profiler.track
@@ -0,0 +1,228 @@
+"""In-process autocomplete for skills, locations, schools and companies.
+
+Each field keeps its distinct values folded (lowercase, no accents, see
+text_search.fold) in a sorted array. A prefix is a contiguous range of
+that array, found with two binary searches; the most popular entries of
+the range are returned with their CV counts. Every CV counts once per
+value, and each value is shown in its most common spelling.
+
+Like the match engine, the index lives in each worker: it is built in
+the background at startup, kept current through cv_events for writes
+made by this worker, and optionally rebuilt every
+SUGGEST_REFRESH_SECONDS. Until it is ready, callers get None.
+"""
+import asyncio
+import heapq
+import logging
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.core.config import SUGGEST_ENABLED, SUGGEST_REFRESH_SECONDS
+from app.core.storage import get_cv_repository
+from app.services import cv_events
+from app.utils.text_search import fold
+
+logger = logging.getLogger(__name__)
+
+# Suggestable field -> document path
+SUGGEST_FIELDS = {
+    "skills": "skills",
+    "location": "location",
+    "school": "education.school",
+    "company": "experience.company",
+}
+SOURCE_FIELDS = {path: 1 for path in SUGGEST_FIELDS.values()}
+# Past the end of every key starting with a given prefix
+_PREFIX_END = "\U0010ffff"
+# Prefixes matching more keys than this have their top-k memoized until the next change
+WIDE_RANGE = 256
+
+
+def values_for(cv: Optional[dict], field: str) -> Dict[str, str]:
+    """Distinct values of a suggestable field in one CV: folded -> spelling."""
+    if not cv:
+        return {}
+    head, _, sub = SUGGEST_FIELDS[field].partition(".")
+    raw = cv.get(head)
+    if sub:
+        raw = [item.get(sub) for item in raw or [] if isinstance(item, dict)]
+    elif not isinstance(raw, list):
+        raw = [raw]
+    values: Dict[str, str] = {}
+    for value in raw:
+        if isinstance(value, str) and fold(value):
+            values.setdefault(fold(value), value.strip())
+    return values
+
+
+def new_totals() -> Dict[str, Counter]:
+    return {field: Counter() for field in SUGGEST_FIELDS}
+
+
+def count_values(totals: Dict[str, Counter], cv: dict):
+    """Add the values of one CV to per-field counts."""
+    for field in SUGGEST_FIELDS:
+        totals[field].update(values_for(cv, field).values())
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._keys: List[str] = []                # sorted folded values
+        self._counts: Dict[str, int] = {}         # folded -> CVs
+        self._spellings: Dict[str, Counter] = {}  # folded -> original spelling -> CVs
+        self._wide: Dict[tuple, List[dict]] = {}  # (prefix, limit) -> top, for wide ranges
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, value: str, amount: int = 1):
+        key = fold(value)
+        if not key:
+            return
+        self._wide.clear()
+        if key not in self._counts:
+            insort(self._keys, key)
+            self._counts[key] = 0
+            self._spellings[key] = Counter()
+        self._counts[key] += amount
+        self._spellings[key][value] += amount
+
+    def remove(self, value: str):
+        key = fold(value)
+        if key not in self._counts:
+            return
+        self._wide.clear()
+        self._counts[key] -= 1
+        spellings = self._spellings[key]
+        spellings[value] -= 1
+        if spellings[value] <= 0:
+            del spellings[value]
+        if self._counts[key] <= 0:
+            del self._keys[bisect_left(self._keys, key)]
+            del self._counts[key]
+            del self._spellings[key]
+
+    def top(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Most popular values starting with `prefix` (folded), best first."""
+        prefix = fold(prefix)
+        cached = self._wide.get((prefix, limit))
+        if cached is not None:
+            return cached
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + _PREFIX_END, lo)
+        best = heapq.nsmallest(limit, islice(self._keys, lo, hi), key=lambda key: (-self._counts[key], key))
+        top = [{"value": self._spellings[key].most_common(1)[0][0], "count": self._counts[key]} for key in best]
+        if hi - lo > WIDE_RANGE:
+            self._wide[(prefix, limit)] = top
+        return top
+
+
+class SuggestIndex:
+    """One PrefixIndex per suggestable field."""
+
+    def __init__(self):
+        self.fields = {field: PrefixIndex() for field in SUGGEST_FIELDS}
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[dict]) -> "SuggestIndex":
+        totals = new_totals()
+        for doc in docs:
+            count_values(totals, doc)
+        return cls.from_totals(totals)
+
+    @classmethod
+    def from_totals(cls, totals: Dict[str, Counter]) -> "SuggestIndex":
+        """Index of per-field value counts (see count_values)."""
+        index = cls()
+        for field, counts in totals.items():
+            for value, count in counts.items():
+                index.fields[field].add(value, count)
+        return index
+
+    def apply(self, changes: Sequence[cv_events.Change]):
+        for before, after in changes:
+            for field, prefixes in self.fields.items():
+                old, new = values_for(before, field), values_for(after, field)
+                for key, value in old.items():
+                    if new.get(key) != value:
+                        prefixes.remove(value)
+                for key, value in new.items():
+                    if old.get(key) != value:
+                        prefixes.add(value)
+
+    def top(self, field: str, prefix: str, limit: int = 10) -> List[dict]:
+        return self.fields[field].top(prefix, limit)
+
+
+# --------------------------
+# Worker-wide service
+# --------------------------
+class SuggestService:
+    def __init__(self):
+        self.index: Optional[SuggestIndex] = None
+        self._pending: Optional[List[cv_events.Change]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return SUGGEST_ENABLED and self.index is not None
+
+    def suggest(self, field: str, prefix: str, limit: int = 10) -> Optional[List[dict]]:
+        """Top completions, or None while the index is not built."""
+        if not self.ready:
+            return None
+        return self.index.top(field, prefix, limit)
+
+    async def rebuild(self, batch_size: int = 5000):
+        # Changes that arrive while the snapshot is streamed are replayed on top
+        self._pending = []
+        try:
+            totals = new_totals()
+            async for doc in get_cv_repository().scan({}, SOURCE_FIELDS, batch_size=batch_size):
+                count_values(totals, doc)
+            index = SuggestIndex.from_totals(totals)
+            index.apply(self._pending)
+            self.index = index
+        finally:
+            self._pending = None
+        logger.info("Suggest index built: %s", self.stats()["values"])
+
+    async def on_changes(self, changes: Sequence[cv_events.Change]):
+        if self._pending is not None:
+            self._pending.extend(changes)
+        if self.index is not None:
+            self.index.apply(changes)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Suggest index build failed")
+            if not SUGGEST_REFRESH_SECONDS:
+                return
+            await asyncio.sleep(SUGGEST_REFRESH_SECONDS)
+
+    def start(self):
+        """Build in the background (lifespan startup)."""
+        if SUGGEST_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        values = {field: len(prefixes) for field, prefixes in self.index.fields.items()} if self.index else {}
+        return {"ready": self.ready, "values": values}
+
+
+service = SuggestService()
+cv_events.subscribe(service.on_changes)
@@ -1,57 +1,79 @@
 from datetime import datetime
 from bson import ObjectId
-from passlib.context import CryptContext
 from app.models.user_model import user_helper
-from app.core.database import user_collection  # injected MongoDB collection
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    """Hash plain password"""
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify plain password against hashed"""
-    return pwd_context.verify(plain_password, hashed_password)
+from app.core.storage import get_user_repository
+from app.core.principal_cache import principal_cache
+from app.services import password_hasher
 
 
 # ---- CRUD operations ----
+# bcrypt is CPU-bound: it runs in the password hasher's process pool, which
+# raises HasherSaturated when full.
 
-def create_user(user_data: dict) -> dict:
+async def create_user(user_data: dict) -> dict:
     """Create a new user with hashed password and default role"""
-    user_data["password"] = hash_password(user_data["password"])
+    user_data["password"] = await password_hasher.hasher.hash(user_data["password"])
     user_data["created_at"] = datetime.utcnow()
     user_data["role"] = user_data.get("role", "candidate")  # default role
 
-    result = user_collection.insert_one(user_data)
-    new_user = user_collection.find_one({"_id": result.inserted_id})
+    users = get_user_repository()
+    await users.insert(user_data)
+    new_user = await users.find_one({"_id": user_data["_id"]})
+    # Tokens of a deleted account with the same email may still be cached
+    principal_cache.invalidate(new_user["email"])
     return user_helper(new_user)
 
 
-def get_user_by_email(email: str) -> dict | None:
+async def write_user(query: dict, fields: dict | None = None) -> dict | None:
+    """Set `fields` on one user (or delete it when `fields` is None).
+
+    Every change to an existing user goes through here so that its cached
+    principals are dropped (see app/core/principal_cache.py), under the
+    old email and, if the update changes it, the new one. Returns the user
+    as it was before the write, or None if nothing matched.
+    """
+    users = get_user_repository()
+    if fields is None:
+        before = await users.delete(query)
+    else:
+        before = await users.update(query, fields)
+    if before is not None:
+        principal_cache.invalidate(before["email"])
+        new_email = (fields or {}).get("email")
+        if new_email:
+            principal_cache.invalidate(new_email)
+    return before
+
+
+async def get_user_by_email(email: str) -> dict | None:
     """Find a user by email"""
-    return user_collection.find_one({"email": email})
+    return await get_user_repository().find_one({"email": email})
 
 
-def get_user(user_id: str) -> dict | None:
+async def get_user(user_id: str) -> dict | None:
     """Find a user by MongoDB _id"""
-    user = user_collection.find_one({"_id": ObjectId(user_id)})
+    user = await get_user_repository().find_one({"_id": ObjectId(user_id)})
     return user_helper(user) if user else None
 
 
-def list_users(skip: int = 0, limit: int = 10) -> list[dict]:
-    users = user_collection.find().skip(skip).limit(limit)
+async def list_users(skip: int = 0, limit: int = 10) -> list[dict]:
+    users = await get_user_repository().find(skip, limit)
     return [user_helper(u) for u in users]
 
 
-def authenticate_user(email: str, password: str) -> dict | None:
+async def authenticate_user(email: str, password: str) -> dict | None:
     """Authenticate user by email and password"""
-    user = get_user_by_email(email)
+    user = await get_user_by_email(email)
     if not user:
         return None
-    if not verify_password(password, user["password"]):
+    valid, new_hash = await password_hasher.hasher.verify_and_update(password, user["password"])
+    if not valid:
         return None
+    if new_hash:
+        # Stored with an outdated cost factor: upgrade while we have the password
+        await write_user(
+            {"_id": user["_id"], "password": user["password"]},
+            {"password": new_hash},
+        )
+        user["password"] = new_hash
     return user
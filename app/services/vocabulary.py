@@ -0,0 +1,223 @@
+"""Canonical skill and language names, with interned integer IDs.
+
+Free-text tags are looked up by an alias key (folded, separators removed:
+"Node.js", "nodejs" and "node js" all give "nodejs") in an alias
+dictionary mapping every known spelling to one canonical display name.
+Unknown values keep the previous normalization (stripped, capitalized).
+
+Every canonical name has an integer ID derived from its alias key with a
+stable 48-bit hash, so all workers, import processes and migration
+scripts agree on IDs without a shared counter. CVs store the IDs next to
+the names (skill_ids, language_ids): filters and matching compare those
+ints, while names remain for display and the text index. Technologies
+share the skills dictionary.
+
+The built-in dictionary below can be extended or overridden with a JSON
+file (VOCABULARY_FILE) of the same shape:
+
+    {"skills": {"Node.js": ["node", "nodejs"]}, "languages": {"French": ["french language"]}}
+
+Filters on skill_ids / language_ids only see CVs that have them: run
+scripts/canonicalize_vocabulary.py once on existing data, and again
+whenever the dictionary changes which names share an ID.
+"""
+import hashlib
+import json
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import VOCABULARY_FILE
+from app.utils.text_search import fold
+
+SKILLS = "skills"
+LANGUAGES = "languages"
+# Tag field -> stored ID field
+ID_FIELDS = {SKILLS: "skill_ids", LANGUAGES: "language_ids"}
+MIN_ALIAS_LENGTH = 3
+
+# Canonical name -> aliases (spellings equal up to case, accents, spaces,
+# dots, dashes, underscores and slashes need not be listed). Aliases have
+# at least MIN_ALIAS_LENGTH characters: "tf" or "ci" would merge unrelated
+# tags into one ID.
+DEFAULT_ALIASES: Dict[str, Dict[str, List[str]]] = {
+    SKILLS: {
+        "JavaScript": ["ecmascript", "es6"],
+        "TypeScript": [],
+        "Node.js": ["node", "nodejs"],
+        "Python": ["python3"],
+        "Go": ["golang"],
+        "C++": ["cpp", "c plus plus"],
+        "C#": ["csharp", "c sharp"],
+        "SQL": [],
+        "HTML": ["html5"],
+        "CSS": ["css3"],
+        "AWS": ["amazon web services"],
+        "GCP": ["google cloud", "google cloud platform"],
+        "Azure": ["microsoft azure"],
+        "MongoDB": ["mongo"],
+        "PostgreSQL": ["postgres", "psql"],
+        "MySQL": [],
+        "Kubernetes": ["k8s"],
+        "Docker": [],
+        "React": ["react.js", "reactjs"],
+        "React Native": [],
+        "Vue.js": ["vue", "vuejs"],
+        "Angular": ["angularjs"],
+        "FastAPI": [],
+        "Django": [],
+        "Flask": [],
+        "Spring": ["spring boot", "springboot"],
+        "PHP": [],
+        "Git": [],
+        "Linux": [],
+        "Redis": [],
+        "Terraform": [],
+        "Pandas": [],
+        "Machine Learning": [],
+        "Deep Learning": [],
+        "NLP": ["natural language processing"],
+        "Computer Vision": [],
+        "TensorFlow": [],
+        "PyTorch": ["torch"],
+        "Kafka": ["apache kafka"],
+        "GraphQL": [],
+        "REST": ["rest api", "restful", "rest apis"],
+        "Jenkins": [],
+        "CI/CD": ["cicd", "continuous integration"],
+        "Scrum": ["agile scrum"],
+        "Excel": ["microsoft excel", "ms excel"],
+        "Power BI": ["powerbi"],
+        "Tableau": [],
+        "Spark": ["apache spark", "pyspark"],
+        "Hadoop": [],
+        "Kotlin": [],
+        "Swift": [],
+        "Flutter": [],
+        "Rust": [],
+        "Scala": [],
+        "Elasticsearch": ["elastic search", "elastic"],
+        "RabbitMQ": [],
+        "Ansible": [],
+        "Laravel": [],
+        "Symfony": [],
+        "Ruby": [],
+        "Ruby on Rails": ["rails", "ror"],
+        "MATLAB": [],
+        "R": ["r language"],
+        "OpenCV": [],
+        "Figma": [],
+        "Selenium": [],
+        "Cypress": [],
+        "Jest": [],
+        "JUnit": [],
+        "Oracle": ["oracle db"],
+        "SAP": [],
+        "Salesforce": [],
+        "Solidity": [],
+        "Unity": ["unity3d"],
+        "Unreal Engine": ["unreal"],
+        "Java": [],
+    },
+    LANGUAGES: {
+        "English": ["anglais", "inglés", "englisch"],
+        "French": ["français", "francés", "französisch"],
+        "Arabic": ["arabe", "árabe", "arabisch"],
+        "Spanish": ["espagnol", "español", "spanisch"],
+        "German": ["allemand", "deutsch", "alemán"],
+        "Italian": ["italien", "italiano"],
+        "Portuguese": ["portugais", "português"],
+        "Dutch": ["néerlandais", "nederlands"],
+        "Turkish": ["turc", "türkçe"],
+        "Russian": ["russe", "русский"],
+        "Chinese": ["chinois", "mandarin"],
+        "Japanese": ["japonais", "日本語"],
+    },
+}
+
+_SEPARATORS = re.compile(r"[\s._\-/]+")
+# Lookups cached per kind (unknown values too, up to this many)
+MAX_CACHED = 100_000
+
+
+def alias_key(value: Optional[str]) -> str:
+    """Lookup key of a spelling: "Node.JS " -> "nodejs", "C++" -> "c++"."""
+    return _SEPARATORS.sub("", fold(value))
+
+
+def tag_id(kind: str, key: str) -> int:
+    """Stable interned ID of a canonical alias key (48-bit, JSON-safe)."""
+    digest = hashlib.blake2b(f"{kind}:{key}".encode("utf-8"), digest_size=6).digest()
+    return int.from_bytes(digest, "big")
+
+
+class Vocabulary:
+    def __init__(self, aliases: Dict[str, Dict[str, List[str]]]):
+        self._known: Dict[str, Dict[str, str]] = {}  # kind -> alias key -> canonical name
+        for kind, names in aliases.items():
+            known = self._known.setdefault(kind, {})
+            for name, spellings in names.items():
+                short = [spelling for spelling in spellings if len(alias_key(spelling)) < MIN_ALIAS_LENGTH]
+                if short:
+                    raise ValueError(f"{kind} aliases of {name!r} shorter than {MIN_ALIAS_LENGTH} characters: {short}")
+                for spelling in [name, *spellings]:
+                    known[alias_key(spelling)] = sys.intern(name)
+        self._cache: Dict[str, Dict[str, Tuple[int, str]]] = {kind: {} for kind in self._known}
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "Vocabulary":
+        """The built-in dictionary, extended/overridden by a JSON file."""
+        aliases = {kind: dict(names) for kind, names in DEFAULT_ALIASES.items()}
+        if path:
+            with open(path, encoding="utf-8") as f:
+                for kind, names in json.load(f).items():
+                    aliases.setdefault(kind, {}).update(names)
+        return cls(aliases)
+
+    def lookup(self, kind: str, value: Optional[str]) -> Optional[Tuple[int, str]]:
+        """(id, canonical name) of a spelling, None for blank values."""
+        cache = self._cache.setdefault(kind, {})
+        found = cache.get(value)
+        if found is not None:
+            return found
+        key = alias_key(value)
+        if not key:
+            return None
+        name = self._known.get(kind, {}).get(key)
+        if name is None:
+            name = sys.intern(value.strip().capitalize())
+        else:
+            key = alias_key(name)
+        found = (tag_id(kind, key), name)
+        if len(cache) < MAX_CACHED:
+            cache[value] = found
+        return found
+
+    def canonical(self, kind: str, value: Optional[str]) -> Optional[str]:
+        found = self.lookup(kind, value)
+        return found[1] if found else None
+
+    def id(self, kind: str, value: Optional[str]) -> Optional[int]:
+        found = self.lookup(kind, value)
+        return found[0] if found else None
+
+    def canonicalize(self, kind: str, values: Iterable[Optional[str]]) -> List[str]:
+        """Canonical names, blanks and duplicates (same ID) removed, order kept."""
+        names: Dict[int, str] = {}
+        for value in values:
+            found = self.lookup(kind, value)
+            if found is not None:
+                names.setdefault(*found)
+        return list(names.values())
+
+    def ids(self, kind: str, values: Iterable[Optional[str]]) -> List[int]:
+        """IDs of `values`, deduplicated, order kept."""
+        ids: Dict[int, None] = {}
+        for value in values:
+            found = self.lookup(kind, value)
+            if found is not None:
+                ids[found[0]] = None
+        return list(ids)
+
+
+vocabulary = Vocabulary.load(VOCABULARY_FILE or None)
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+# The suite runs on the in-process store; STORAGE_BACKEND=mongo runs it against MONGO_URI.
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+
+
+@pytest.fixture
+def memory_storage(monkeypatch):
+    """Empty memory-backend repositories, used by the services for the test."""
+    from app.core import storage
+    from app.repositories.memory import MemoryStorage
+
+    memory = MemoryStorage()
+    monkeypatch.setattr(storage, "_storage", memory)
+    return memory
+
+
+@pytest.fixture
+def memory_api(memory_storage):
+    """TestClient over an empty memory backend (lifespan included)."""
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def backend(request, monkeypatch):
+    """Empty storage of each backend (mongo: a scratch database, skipped when none is reachable)."""
+    from app.core import config, database, storage
+    from app.repositories.memory import MemoryStorage
+    from app.repositories.mongo import MongoStorage
+
+    if request.param == "memory":
+        monkeypatch.setattr(storage, "_storage", MemoryStorage())
+        yield request.param
+        return
+    client = MongoClient(config.MONGO_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip("MongoDB is not reachable")
+    monkeypatch.setattr(config, "DB_NAME", f"{config.DB_NAME}_storage_test")
+    monkeypatch.setattr(database, "_client", None)
+    monkeypatch.setattr(storage, "_storage", MongoStorage())
+    client.drop_database(config.DB_NAME)
+    try:
+        yield request.param
+    finally:
+        client.drop_database(config.DB_NAME)
+        client.close()
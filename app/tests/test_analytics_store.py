@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.config import CV_STATS_COLLECTION
+from app.services import analytics_store
+from app.services.analytics_store import (
+    DEGREE,
+    EXPERIENCE_SUM,
+    EXPERIENCE_YEARS,
+    LANGUAGE,
+    LOCATION,
+    SKILL,
+    TOTAL,
+    counters_for,
+    delta_for,
+)
+
+
+def make_cv(**overrides):
+    cv = {
+        "skills": ["Python", "Docker"],
+        "languages": ["English"],
+        "location": "Paris",
+        "education": [{"degree": "MSc", "school": "X"}],
+        "experience": [{"title": "Dev", "duration": "3 years 6 months"}],
+        "total_experience_months": 42,
+    }
+    cv.update(overrides)
+    return cv
+
+
+def test_counters_for_single_cv():
+    counts = counters_for(make_cv())
+    assert counts[(TOTAL, "cvs")] == 1
+    assert counts[(SKILL, "Python")] == 1
+    assert counts[(LOCATION, "Paris")] == 1
+    assert counts[(DEGREE, "MSc")] == 1
+    assert counts[(LANGUAGE, "English")] == 1
+    assert counts[(EXPERIENCE_YEARS, 3)] == 1
+    assert counts[(EXPERIENCE_SUM, "months")] == 42
+
+
+def test_update_delta_only_touches_changed_values():
+    before = make_cv()
+    after = make_cv(skills=["Python", "Go"], location=None)
+    delta = delta_for([(before, after)])
+    assert delta[(SKILL, "Docker")] == -1
+    assert delta[(SKILL, "Go")] == 1
+    assert delta[(LOCATION, "Paris")] == -1
+    assert delta[(SKILL, "Python")] == 0
+    assert delta[(TOTAL, "cvs")] == 0
+
+
+def test_insert_and_delete_cancel_out():
+    cv = make_cv()
+    delta = delta_for([(None, cv), (cv, None)])
+    assert not +delta and not -delta
+
+
+def test_first_start_materializes_once(backend):
+    from app.core import storage
+    from app.core.database import get_database
+
+    async def scenario():
+        await storage.get_storage().connect()
+        try:
+            await storage.get_cv_repository().insert_many([make_cv(), make_cv(skills=["Go"])])
+            rebuilt = await asyncio.gather(*(analytics_store.materialize_if_empty() for _ in range(4)))
+            if backend == "mongo":
+                names = await get_database().list_collection_names()
+                assert not [name for name in names if "_rebuild_" in name]
+                assert await get_database()[f"{CV_STATS_COLLECTION}_lock"].find_one({}) is None
+            # Released: anyone can take it now
+            assert await storage.get_stats_repository().acquire_lock("probe", 1)
+            return rebuilt, await analytics_store.total_cvs()
+        finally:
+            await storage.get_storage().close()
+
+    rebuilt, total = asyncio.run(scenario())
+    assert rebuilt.count(True) == 1
+    assert total == 2
+
+
+def test_first_start_respects_another_workers_lock(backend):
+    from app.core import storage
+    from app.core.database import get_database
+
+    async def lock_by_other(expires_at):
+        if backend == "mongo":
+            locks = get_database()[f"{CV_STATS_COLLECTION}_lock"]
+            await locks.replace_one({"_id": "rebuild"}, {"owner": "other", "expires_at": expires_at}, upsert=True)
+        else:
+            seconds = (expires_at - datetime.utcnow()).total_seconds()
+            assert await storage.get_stats_repository().acquire_lock("other", seconds)
+
+    async def scenario():
+        await storage.get_storage().connect()
+        try:
+            outcomes = []
+            for expires_at in (datetime.utcnow() + timedelta(minutes=5), datetime.utcnow() - timedelta(minutes=5)):
+                await storage.get_cv_repository().insert(make_cv())
+                await lock_by_other(expires_at)
+                outcomes.append((await analytics_store.materialize_if_empty(), await analytics_store.total_cvs()))
+            return outcomes
+        finally:
+            await storage.get_storage().close()
+
+    assert asyncio.run(scenario()) == [(False, 0), (True, 2)]
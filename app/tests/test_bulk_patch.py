@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.cv_model import CVBulkPatch
+from app.services import cv_service
+from app.services.cv_service import _patch_changes, _patch_cv
+from app.services.vocabulary import vocabulary
+
+NOW = datetime(2024, 1, 1)
+
+
+def operation(**fields):
+    return CVBulkPatch(operations=[{"ids": ["65a0c0ffee00000000000001"], **fields}]).operations[0]
+
+
+def test_write_and_local_after_image_agree():
+    op = operation(set={"location": " Paris "}, add_to_set={"skills": ["kubernetes "]}, pull={"languages": ["french"]})
+    before = {"_id": 1, "skills": ["Python", "Kubernetes"], "languages": ["French", "English"], "updated_at": None,
+              "skill_ids": vocabulary.ids("skills", ["Python", "Kubernetes"]), "language_ids": vocabulary.ids("languages", ["French", "English"])}
+    after, (guard, written) = _patch_cv(before, [_patch_changes(op, NOW)])
+    assert after["skills"] == ["Python", "Kubernetes"]
+    assert after["skill_ids"] == before["skill_ids"]
+    assert after["languages"] == ["English"]
+    assert after["language_ids"] == [vocabulary.id("languages", "English")]
+    assert after["location"] == "Paris" and after["updated_at"] == NOW
+    assert before["languages"] == ["French", "English"]
+
+    assert guard == {"_id": 1, "updated_at": None}
+    assert written["location"] == "Paris" and written["_search.location"] == "paris"
+    assert {field: written[field] for field in ("skills", "skill_ids", "languages", "language_ids")} == \
+        {field: after[field] for field in ("skills", "skill_ids", "languages", "language_ids")}
+    assert "_search" not in written and "phone" not in written
+
+
+def test_operations_on_the_same_cv_apply_in_order():
+    patch = CVBulkPatch(operations=[
+        {"ids": ["65a0c0ffee00000000000001"], "add_to_set": {"skills": ["Go"]}},
+        {"ids": ["65a0c0ffee00000000000001"], "set": {"skills": ["Rust"]}},
+        {"ids": ["65a0c0ffee00000000000001"], "add_to_set": {"skills": ["Python"]}},
+    ])
+    before = {"_id": 1, "skills": ["Java"], "updated_at": None}
+    after, (_, written) = _patch_cv(before, [_patch_changes(op, NOW) for op in patch.operations])
+    assert after["skills"] == written["skills"] == ["Rust", "Python"]
+
+
+def test_experience_set_recomputes_derived_fields():
+    op = operation(set={"experience": [{"title": "Dev", "duration": "2 years"}]})
+    set_fields, *_ = _patch_changes(op, NOW)
+    assert set_fields["total_experience_months"] == 24
+
+
+@pytest.mark.parametrize("fields", [
+    {},
+    {"add_to_set": {"skills": ["A"]}, "pull": {"skills": ["B"]}},
+    {"set": {"skills": ["A"]}, "add_to_set": {"skills": ["B"]}},
+    {"add_to_set": {"phone": ["1"]}},
+])
+def test_invalid_operations_rejected(fields):
+    with pytest.raises(ValidationError):
+        operation(**fields)
+
+
+def _cv(i, **fields):
+    return {"full_name": f"Candidate {i}", "email": f"c{i}@example.com", "skills": ["Python"], **fields}
+
+
+def test_bulk_patch_counts_and_missing_ids(memory_api):
+    client = memory_api
+    ids = [client.post("/api/v1/cv/", json=_cv(i)).json()["_id"] for i in range(3)]
+    unknown = "65a0c0ffee00000000000001"
+    body = {"operations": [{"ids": [*ids, unknown, "nope"], "add_to_set": {"skills": ["Docker"]}}]}
+    result = client.patch("/api/v1/cv/bulk", json=body).json()
+    assert result == {"matched": 3, "modified": 3, "missing": [unknown, "nope"], "conflicts": []}
+    assert client.get(f"/api/v1/cv/{ids[0]}").json()["skills"] == ["Python", "Docker"]
+    skills = {r["skill"]: r["count"] for r in client.get("/api/v1/cv/analytics/skills").json()}
+    assert skills == {"Python": 3, "Docker": 3}
+
+
+def test_bulk_patch_repatches_a_cv_written_concurrently(memory_api, monkeypatch):
+    client = memory_api
+    cv_id = client.post("/api/v1/cv/", json=_cv(0)).json()["_id"]
+    patch_cv = cv_service._patch_cv
+    calls = []
+
+    def racing_patch_cv(before, changes):
+        calls.append(dict(before))
+        if len(calls) == 1:
+            # update_cv ran between the read and the write: the guard no longer matches
+            before = {**before, "updated_at": NOW}
+        return patch_cv(before, changes)
+
+    monkeypatch.setattr(cv_service, "_patch_cv", racing_patch_cv)
+    body = {"operations": [{"ids": [cv_id], "add_to_set": {"skills": ["Docker"]}}]}
+    result = client.patch("/api/v1/cv/bulk", json=body).json()
+    assert len(calls) == 2
+    assert result == {"matched": 1, "modified": 1, "missing": [], "conflicts": []}
+    skills = {r["skill"]: r["count"] for r in client.get("/api/v1/cv/analytics/skills").json()}
+    assert skills == {"Python": 1, "Docker": 1}
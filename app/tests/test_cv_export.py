@@ -0,0 +1,63 @@
+import asyncio
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services.cv_export import csv_header, encode_csv, encode_ndjson, parquet_available
+from app.services.cv_import import iter_csv_rows
+
+CV = {
+    "_id": "65a0c0ffee00000000000001",
+    "full_name": "Inès Ben Ali",
+    "email": "ines@example.com",
+    "phone": None,
+    "location": "Tunis",
+    "education": [{"degree": "MSc", "school": "ENIT", "year": "2019"}],
+    "experience": [{"title": "Dev", "company": "Acme", "duration": "2 years", "duration_months": 24, "technologies": []}],
+    "skills": ["Python", "Docker"],
+    "languages": ["French"],
+    "total_experience_months": 24,
+    "created_at": datetime(2024, 1, 2, 3, 4, 5),
+    "updated_at": None,
+}
+
+
+async def once(data: bytes):
+    yield data
+
+
+def test_ndjson_lines_are_json_objects():
+    lines = encode_ndjson([CV, CV]).decode().splitlines()
+    assert len(lines) == 2
+    row = json.loads(lines[0])
+    assert row["full_name"] == "Inès Ben Ali"
+    assert row["created_at"] == "2024-01-02T03:04:05"
+
+
+def test_csv_export_reimports():
+    body = csv_header() + encode_csv([CV])
+
+    async def run():
+        return [row async for row in iter_csv_rows(once(body))]
+
+    (row_no, record, error), = asyncio.run(run())
+    assert error is None
+    assert record["skills"] == ["Python", "Docker"]
+    assert record["education"] == CV["education"]
+    assert record["experience"][0]["duration_months"] == 24
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow not installed")
+def test_parquet_row_groups_stream():
+    import pyarrow.parquet as pq
+    from app.services.cv_export import ParquetEncoder
+
+    encoder = ParquetEncoder()
+    data = encoder.encode([CV]) + encoder.encode([dict(CV, education=[{"year": 2020}])]) + encoder.close()
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column("email").to_pylist() == ["ines@example.com"] * 2
+    assert table.column("education").to_pylist()[1] == [{"degree": None, "school": None, "year": "2020"}]
@@ -0,0 +1,81 @@
+import asyncio
+
+from app.services import cv_import
+from app.services.cv_import import _prepare_batch, iter_csv_rows, iter_ndjson_rows
+
+
+async def chunked(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def collect(rows):
+    async def run():
+        return [row async for row in rows]
+    return asyncio.run(run())
+
+
+def test_ndjson_rows_survive_chunk_boundaries():
+    body = '{"full_name": "Inès"}\n\nnot json\n[1]\n{"full_name": "Omar"}'.encode()
+    rows = collect(iter_ndjson_rows(chunked(body)))
+    assert [r[0] for r in rows] == [1, 2, 3, 4]
+    assert rows[0][1] == {"full_name": "Inès"}
+    assert rows[1][2].startswith("Invalid JSON")
+    assert rows[2][2] == "Each line must be a JSON object"
+    assert rows[3][1] == {"full_name": "Omar"}
+
+
+def test_csv_rows_with_lists_and_multiline_json():
+    body = (
+        "full_name,email,skills,experience,ignored\r\n"
+        'Amira,amira@example.com,Python|Docker,"[{""title"": ""Dev"",\n""duration"": ""2 years""}]",x\r\n'
+        "Liam,,Go;Rust,,\r\n"
+        'Bad,,,"[oops",\r\n'
+    ).encode()
+    rows = collect(iter_csv_rows(chunked(body, 5)))
+    assert rows[0][1] == {
+        "full_name": "Amira",
+        "email": "amira@example.com",
+        "skills": ["Python", "Docker"],
+        "experience": [{"title": "Dev", "duration": "2 years"}],
+    }
+    assert rows[1][1] == {"full_name": "Liam", "skills": ["Go", "Rust"]}
+    assert rows[2][2].startswith("Invalid JSON column")
+
+
+def test_prepare_batch_validates_and_derives():
+    documents, errors = _prepare_batch([
+        (1, {"full_name": " Amira ", "skills": ["python"], "experience": [{"duration": "2 years"}]}, None),
+        (2, {"email": "not-an-email"}, None),
+        (3, None, "Invalid JSON: x"),
+    ])
+    assert [row for row, _ in documents] == [1]
+    document = documents[0][1]
+    assert document["full_name"] == "Amira"
+    assert document["total_experience_months"] == 24
+    assert document["_search"]["full_name"] == "amira"
+    assert [e["row"] for e in errors] == [2, 3]
+
+
+def test_failed_batch_is_reported_and_other_batches_finish(monkeypatch, memory_storage):
+    async def prepare(rows):
+        if rows[0][0] == 1:
+            raise RuntimeError("pool broken")
+        return _prepare_batch(rows)
+
+    monkeypatch.setattr(cv_import, "_prepare", prepare)
+
+    async def rows():
+        for n in range(1, 5):
+            yield n, {"full_name": f"CV {n}", "email": f"cv{n}@example.com"}, None
+        yield 5, "not an object", None
+
+    async def run():
+        report = await cv_import.import_cvs(rows(), batch_size=2)
+        return report, await memory_storage.cvs.count({})
+
+    report, stored = asyncio.run(run())
+    assert report["inserted"] == stored == 2
+    assert [e["row"] for e in report["errors"]] == [1, 2, 5]
+    assert report["errors"][0]["errors"] == ["Batch could not be validated: pool broken"]
+    assert report["errors"][2]["errors"] == ["Each row must be an object"]
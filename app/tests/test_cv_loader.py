@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.services.cv_loader import CVLoader
+
+A, B, C = "65a0c0ffee00000000000001", "65a0c0ffee00000000000002", "65a0c0ffee00000000000003"
+
+
+def make_loader(calls, max_batch_size=500):
+    async def batch_fn(ids):
+        calls.append(list(ids))
+        items = [{"_id": i} for i in ids if i != C]
+        return items, [C] if C in ids else []
+    return CVLoader(batch_fn, max_batch_size=max_batch_size)
+
+
+def test_concurrent_loads_share_one_batch():
+    calls = []
+    loader = make_loader(calls)
+
+    async def run():
+        return await asyncio.gather(loader.load(A), loader.load(B), loader.load(A), loader.load(C))
+
+    a, b, a_again, c = asyncio.run(run())
+    assert calls == [[A, B, C]]
+    assert a == {"_id": A} and a_again is a and b == {"_id": B} and c is None
+
+
+def test_results_are_memoized_and_batches_split():
+    calls = []
+    loader = make_loader(calls, max_batch_size=2)
+
+    async def run():
+        first = await loader.load_many([A, B, C])
+        return first, await loader.load(B)
+
+    first, again = asyncio.run(run())
+    assert calls == [[A, B], [C]]
+    assert [cv and cv["_id"] for cv in first] == [A, B, None]
+    assert again == {"_id": B}
+
+
+def test_failed_batch_is_not_memoized():
+    attempts = []
+
+    async def flaky(ids):
+        attempts.append(ids)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return [{"_id": i} for i in ids], []
+
+    loader = CVLoader(flaky)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await loader.load(A)
+        return await loader.load(A)
+
+    assert asyncio.run(run()) == {"_id": A}
@@ -9,7 +9,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import app  # Correct import
 
-client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def client():
+    # Context manager runs the app lifespan (shared Mongo client on one event loop)
+    with TestClient(app) as test_client:
+        yield test_client
+
 
 @pytest.fixture
 def sample_cv():
@@ -38,18 +44,18 @@ def sample_cv():
     "languages": ["English", "French"]
     }
 
-def test_create_cv(sample_cv):
+def test_create_cv(client, sample_cv):
     response = client.post("/api/v1/cv/", json=sample_cv)
     assert response.status_code == 200
     data = response.json()
     assert data["full_name"] == sample_cv["full_name"]
     return data["_id"]
 
-def test_get_all_cvs():
+def test_get_all_cvs(client):
     response = client.get("/api/v1/cv/")
     assert response.status_code in (200, 404)  # 404 if DB empty
 
-def test_crud_flow(sample_cv):
+def test_crud_flow(client, sample_cv):
     # Create
     create_resp = client.post("/api/v1/cv/", json=sample_cv)
     assert create_resp.status_code == 200
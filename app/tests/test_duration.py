@@ -0,0 +1,29 @@
+import pytest
+from datetime import datetime
+
+from app.utils.duration import parse_duration_months
+
+TODAY = datetime(2024, 6, 1)
+
+
+@pytest.mark.parametrize("text, months", [
+    ("2 years", 24),
+    ("1.5 yrs", 18),
+    ("6 months", 6),
+    ("2 years 3 months", 27),
+    ("2y 3m", 27),
+    ("3 ans", 36),
+    ("1 an et 6 mois", 18),
+    ("2019-2021", 24),
+    ("2019 - present", 65),
+    ("Jan 2020 - Mar 2022", 26),
+    ("03/2020 - 06/2021", 15),
+    ("Janvier 2020 à aujourd'hui", 53),
+])
+def test_parse_duration_months(text, months):
+    assert parse_duration_months(text, today=TODAY) == months
+
+
+@pytest.mark.parametrize("text", [None, "", "a while", "senior"])
+def test_unreadable_durations(text):
+    assert parse_duration_months(text, today=TODAY) is None
@@ -0,0 +1,59 @@
+from collections import Counter
+
+from app.repositories.mongo import facet_pipeline
+from app.services.cv_service import FACET_FIELDS
+
+
+def _cv(i: int) -> dict:
+    return {
+        "full_name": f"Candidate {i}",
+        "email": f"facet{i}@example.com",
+        "location": ["Paris", "Tunis", "Berlin"][i % 3],
+        "skills": [["Python", "Docker"], ["Java"], ["Python", "Go"], ["Docker"]][i % 4],
+        "languages": ["English", "French"] if i % 2 else ["English"],
+        "education": [{"degree": ["MSc", "BSc"][i % 2], "school": "Sorbonne", "year": "2018"}],
+        "experience": [],
+    }
+
+
+def test_pipeline_is_one_facet_pass_after_the_filter():
+    pipeline = facet_pipeline({"location": "Paris"}, {name: FACET_FIELDS[name] for name in ("skills", "degree")}, 5)
+    assert [next(iter(stage)) for stage in pipeline] == ["$match", "$project", "$facet"]
+    assert pipeline[1]["$project"] == {"skills": 1, "education.degree": 1}
+    assert pipeline[2]["$facet"]["degree"][0] == {"$unwind": "$education"}
+    assert facet_pipeline({}, {"location": "location"}, 5)[0] == {"$project": {"location": 1}}
+
+
+def test_facets_count_the_whole_matched_set(memory_api):
+    cvs = [_cv(i) for i in range(24)]
+    for cv in cvs:
+        assert memory_api.post("/api/v1/cv/", json=cv).status_code == 200
+
+    response = memory_api.get("/api/v1/cv/", params={
+        "languages": "French", "limit": 2, "facets": "skills,languages,location,degree", "facet_limit": 3,
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["items"]) == 2
+
+    matched = [cv for cv in cvs if "French" in cv["languages"]]
+    skills = Counter(skill for cv in matched for skill in cv["skills"])
+    expected = sorted(skills.items(), key=lambda item: (-item[1], item[0]))[:3]
+    assert [(f["value"], f["count"]) for f in body["facets"]["skills"]] == expected
+    assert body["facets"]["languages"] == [{"value": "English", "count": 12}, {"value": "French", "count": 12}]
+    assert body["facets"]["degree"] == [{"value": "BSc", "count": 12}]
+    assert sum(f["count"] for f in body["facets"]["location"]) == 12
+
+    page = memory_api.get("/api/v1/cv/", params={"paginate": "cursor", "location": "Paris", "facets": "skills"}).json()
+    assert set(page) == {"items", "next_cursor", "facets"}
+
+    # Cached per filter, invalidated by writes
+    memory_api.post("/api/v1/cv/", json={**_cv(1), "email": "late@example.com", "skills": ["Rust"]})
+    again = memory_api.get("/api/v1/cv/", params={"languages": "French", "facets": "skills", "facet_limit": 10}).json()
+    assert {"value": "Rust", "count": 1} in again["facets"]["skills"]
+
+
+def test_unknown_facet_is_rejected(memory_api):
+    response = memory_api.get("/api/v1/cv/", params={"facets": "skills,salary"})
+    assert response.status_code == 400
+    assert "salary" in response.json()["message"]
@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import AsyncMongoClient
+from pymongo.errors import PyMongoError
+
+from app.api.v1.cv_routes import cv_filters
+from app.core import indexes
+from app.core.config import CV_COLLECTION, DB_NAME, MONGO_URI
+from app.core.indexes import INDEXES, IndexSpec
+from app.services.cv_service import derive_fields
+from app.services.query_profiler import analyze_explain
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def list_indexes(self):
+        return FakeCursor([{"name": "_id_", "key": {"_id": 1}}, *self.docs])
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        return FakeCollection([])
+
+
+def test_spec_matches_live_index_definitions():
+    spec = IndexSpec([("skills", 1), ("created_at", 1)], partial={"skills": {"$exists": True}})
+    assert spec.name == "skills_1_created_at_1"
+    live = {"name": "x", "key": {"skills": 1, "created_at": 1}, "partialFilterExpression": {"skills": {"$exists": True}}}
+    assert spec.matches(live)
+    assert not spec.matches({**live, "key": {"created_at": 1, "skills": 1}})
+    assert not spec.matches({**live, "unique": True})
+
+    folded = IndexSpec("email", collation={"locale": "en", "strength": 2})
+    assert folded.matches({"name": "email_1", "key": {"email": 1}, "collation": {"locale": "en", "strength": 2, "caseLevel": False}})
+    assert not folded.matches({"name": "email_1", "key": {"email": 1}})
+
+    text = INDEXES[CV_COLLECTION][1]
+    assert text.is_text
+    assert text.matches({"name": text.name, "key": {"_fts": "text", "_ftsx": 1},
+                         "weights": {field: 1 for field, _ in text.keys}})
+
+
+def _stored(spec: IndexSpec) -> dict:
+    """The spec as list_indexes returns it once built."""
+    info = spec.describe()
+    if spec.is_text:
+        info["key"] = {"_fts": "text", "_ftsx": 1}
+        info["weights"] = {field: 1 for field, _ in spec.keys}
+    return info
+
+
+def test_diff_reports_missing_changed_and_superseded():
+    live = [
+        {"name": "email_1", "key": {"email": 1}},  # declared unique
+        {"name": "created_at_1__id_1", "key": {"created_at": 1, "_id": 1}},  # superseded
+        *[_stored(spec) for spec in INDEXES[CV_COLLECTION][1:]],
+    ]
+    live = [info for info in live if info["name"] != "skill_ids_1_created_at_1__id_1"]
+    database = FakeDatabase({CV_COLLECTION: FakeCollection(live)})
+
+    report = asyncio.run(indexes.diff(database, [CV_COLLECTION]))[CV_COLLECTION]
+    assert [spec.name for spec in report["missing"]] == ["skill_ids_1_created_at_1__id_1"]
+    assert [spec.name for spec in report["changed"]] == ["email_1"]
+    assert [info["name"] for info in report["extra"]] == ["created_at_1__id_1"]
+
+
+# ---- Against a live MongoDB (skipped when none is reachable)
+def _filters(**params):
+    defaults = dict(
+        search=None, full_name=None, email=None, location=None, skills=None, skills_mode="or",
+        languages=None, languages_mode="or", education=None, experience=None, text_match="contains",
+        min_experience_years=None, max_experience_years=None, created_from=None, created_to=None,
+    )
+    return asyncio.run(cv_filters(**{**defaults, **params}))
+
+
+LIST_QUERIES = [
+    ({}, "created_at"),
+    ({}, "updated_at"),
+    ({}, "full_name"),
+    (_filters(skills="Python,Go"), "created_at"),
+    (_filters(skills="Python,Go", skills_mode="and"), "created_at"),
+    (_filters(languages="French"), "created_at"),
+    (_filters(location="Paris"), "created_at"),
+    (_filters(location="Par", text_match="prefix"), "created_at"),
+    (_filters(full_name="garcia"), "created_at"),
+    (_filters(email="Candidate.3@Example.com"), "created_at"),
+    (_filters(education="sorbonne"), "created_at"),
+    (_filters(min_experience_years=3, max_experience_years=8), "created_at"),
+    (_filters(created_from="2024-01-01", created_to="2024-06-30"), "created_at"),
+    (_filters(created_from="2024-01-01"), "updated_at"),
+    (_filters(search="python"), "created_at"),
+]
+
+
+def _sample_cv(i: int, now: datetime) -> dict:
+    return derive_fields({
+        "full_name": f"Candidate {i} García",
+        "email": f"candidate.{i}@example.com",
+        "location": ["Paris", "Tunis", "Berlin"][i % 3],
+        "skills": [["Python", "Go"], ["Java"], ["Python", "Docker"]][i % 3],
+        "languages": ["English", "French"] if i % 2 else ["English"],
+        "education": [{"degree": "MSc", "school": "Sorbonne Université", "year": "2018"}],
+        "experience": [{"title": "Engineer", "company": "TechCorp", "duration": f"{i % 9 + 1} years", "technologies": []}],
+        "created_at": now - timedelta(days=i),
+        "updated_at": now - timedelta(days=i),
+    })
+
+
+def test_list_filters_and_sorts_are_served_by_an_index():
+    async def run():
+        client = AsyncMongoClient(MONGO_URI, serverSelectionTimeoutMS=500)
+        try:
+            await client.admin.command("ping")
+        except PyMongoError:
+            await client.close()
+            return None
+        database = client[f"{DB_NAME}_index_test"]
+        try:
+            await database.drop_collection(CV_COLLECTION)
+            now = datetime(2024, 7, 1)
+            await database[CV_COLLECTION].insert_many([_sample_cv(i, now) for i in range(300)])
+            await indexes.build(database, [CV_COLLECTION])
+            plans = []
+            for query, sort_by in LIST_QUERIES:
+                cursor = database[CV_COLLECTION].find(query).sort([(sort_by, -1), ("_id", -1)]).limit(10)
+                plans.append((query, sort_by, analyze_explain(await cursor.explain())))
+            return plans
+        finally:
+            await client.drop_database(database.name)
+            await client.close()
+
+    plans = asyncio.run(run())
+    if plans is None:
+        pytest.skip("MongoDB is not reachable")
+    for query, sort_by, plan in plans:
+        assert "COLLSCAN" not in plan["stages"], (query, sort_by, plan)
+        assert plan["indexes"], (query, sort_by, plan)
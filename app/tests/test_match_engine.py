@@ -0,0 +1,74 @@
+import random
+
+from app.services.match_engine import SkillMatchIndex
+
+SKILLS = ["Python", "Go", "Docker", "React", "Sql", "Java", "Rust", "Kotlin"]
+
+
+def make_docs(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "_id": n,
+            "skills": rng.sample(SKILLS, rng.randint(0, 5)),
+            "total_experience_months": rng.randint(0, 12) * 6,
+        }
+        for n in range(count)
+    ]
+
+
+def brute_force(docs, weights, k, required=(), min_experience=0):
+    scored = []
+    for doc in docs:
+        skills = {s.lower() for s in doc["skills"]}
+        years = doc["total_experience_months"] // 12
+        if years < min_experience or not all(r.lower() in skills for r in required):
+            continue
+        score = sum(w for s, w in weights.items() if s.lower() in skills)
+        if score > 0:
+            scored.append(score)
+    return sorted(scored, reverse=True)[:k]
+
+
+def test_top_k_scores_match_brute_force():
+    docs = make_docs(500)
+    index = SkillMatchIndex.from_documents(docs)
+    cases = [
+        ({"python": 1, "docker": 1, "sql": 1}, 10, (), 0),
+        ({"Python": 5, "Go": 3, "Rust": 1}, 7, (), 0),
+        ({"Java": 2, "Kotlin": 2}, 25, ("sql",), 0),
+        ({"React": 1, "Python": 1}, 5, (), 6),
+    ]
+    for weights, k, required, min_experience in cases:
+        ranked = index.top_k(weights, k, required, min_experience)
+        assert [score for _, score in ranked] == brute_force(docs, weights, k, required, min_experience)
+
+
+def test_upsert_and_remove_keep_index_current():
+    docs = make_docs(50)
+    index = SkillMatchIndex.from_documents(docs)
+    index.upsert({"_id": "new", "skills": ["Haskell"], "total_experience_months": 120})
+    assert index.top_k({"haskell": 1}, 3) == [("new", 1)]
+
+    index.upsert({"_id": "new", "skills": ["Elixir"]})
+    assert index.top_k({"haskell": 1}, 3) == []
+    assert index.top_k({"elixir": 1}, 3) == [("new", 1)]
+
+    index.apply([({"_id": "new"}, None)])
+    assert index.top_k({"elixir": 1}, 3) == []
+    assert len(index) == 50
+
+
+def test_updates_and_deletes_reuse_doc_numbers():
+    index = SkillMatchIndex()
+    for n in range(200):
+        index.upsert({"_id": "cv", "skills": ["Python" if n % 2 else "Go"], "total_experience_months": n})
+    assert len(index._ids) == 1
+    assert index.top_k({"go": 1, "python": 1}, 5) == [("cv", 1)]
+
+    for n in range(200):
+        index.upsert({"_id": n, "skills": ["Rust"]})
+        index.remove(n)
+    assert len(index._ids) == 2
+    assert index._alive.bit_length() <= 2
+    assert index.top_k({"rust": 1}, 5) == []
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from bson import SON
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo import monitoring
+
+from app.core import metrics
+
+
+def test_histogram_text_format():
+    histogram = metrics.Histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5)
+    assert histogram.samples() == [
+        'demo_seconds_bucket{route="/a",le="0.1"} 1',
+        'demo_seconds_bucket{route="/a",le="1.0"} 2',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 3',
+        'demo_seconds_sum{route="/a"} 5.55',
+        'demo_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_middleware_labels_by_route_template():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    client = TestClient(app, raise_server_exceptions=False)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/boom")
+    assert metrics.HTTP_REQUESTS.values[("GET", "/items/{item_id}", "200")] >= 2
+    assert metrics.HTTP_ERRORS.values[("boom", "RuntimeError")] >= 1
+    assert metrics.HTTP_IN_FLIGHT.values[()] == 0
+
+
+def test_command_listener_tracks_collection():
+    listener = metrics.MongoMetricsListener()
+    address = ("localhost", 27017)
+    listener.started(monitoring.CommandStartedEvent(SON([("find", "candidates"), ("filter", {})]), "cv_database", 7, address, 1))
+    listener.succeeded(monitoring.CommandSucceededEvent(timedelta(microseconds=1500), {"ok": 1}, "find", 7, address, 1))
+    series = metrics.MONGO_LATENCY.series[("candidates", "find")]
+    assert sum(series[0]) >= 1
+    assert not listener._pending
@@ -0,0 +1,40 @@
+import pytest
+from datetime import datetime
+from bson import ObjectId
+
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trip_keeps_types():
+    oid = ObjectId()
+    created = datetime(2024, 5, 1, 12, 30)
+    token = encode_cursor("created_at", -1, created, oid)
+    assert "=" not in token
+    position = decode_cursor(token, "created_at", -1)
+    assert position["value"] == created
+    assert position["id"] == oid
+
+
+def test_cursor_rejects_other_sort_and_garbage():
+    token = encode_cursor("full_name", 1, "Alice", ObjectId())
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "created_at", 1)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "full_name", -1)
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "full_name", 1)
+
+
+def test_keyset_filter_descending_includes_nulls_last():
+    oid = ObjectId()
+    query = keyset_filter("created_at", -1, datetime(2024, 1, 1), oid)
+    assert query["$or"][0] == {"created_at": {"$lt": datetime(2024, 1, 1)}}
+    assert query["$or"][1] == {"created_at": datetime(2024, 1, 1), "_id": {"$lt": oid}}
+    assert query["$or"][2] == {"created_at": None}
+
+
+def test_keyset_filter_ascending_from_null():
+    oid = ObjectId()
+    query = keyset_filter("full_name", 1, None, oid)
+    assert {"full_name": None, "_id": {"$gt": oid}} in query["$or"]
+    assert {"full_name": {"$ne": None}} in query["$or"]
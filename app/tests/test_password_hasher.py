@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core.config import BCRYPT_ROUNDS
+from app.services.password_hasher import HasherSaturated, PasswordHasher
+
+
+def test_rehash_when_cost_factor_changed():
+    hasher = PasswordHasher(workers=0, queue_size=4)
+    old = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+
+    async def run():
+        return await hasher.verify_and_update("secret", old), await hasher.verify_and_update("wrong", old)
+
+    (valid, new_hash), (invalid, _) = asyncio.run(run())
+    assert valid and not invalid
+    assert new_hash.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+
+
+def test_saturated_pool_rejects_fast():
+    hasher = PasswordHasher(workers=0, queue_size=0)
+    hasher.in_flight = hasher.capacity
+    with pytest.raises(HasherSaturated):
+        asyncio.run(hasher.hash("secret"))
+    assert hasher.rejected == 1
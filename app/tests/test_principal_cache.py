@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core import auth
+from app.core.principal_cache import PrincipalCache
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hit_miss_and_ttl():
+    clock = Clock()
+    cache = PrincipalCache(maxsize=10, ttl=60, clock=clock)
+    assert cache.get("token-a") is None
+    cache.put("a@example.com", "token-a", "A")
+    assert cache.get("token-a") == "A"
+    clock.now += 61
+    assert cache.get("token-a") is None
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 0)
+
+
+def test_entry_capped_at_token_exp():
+    clock = Clock()
+    cache = PrincipalCache(maxsize=10, ttl=60, clock=clock)
+    cache.put("a@example.com", "token-a", "A", expires_at=clock.now + 5)
+    clock.now += 6
+    assert cache.get("token-a") is None
+
+
+def test_invalidate_drops_every_token_of_subject():
+    cache = PrincipalCache(maxsize=10, ttl=60, clock=Clock())
+    cache.put("a@example.com", "token-1", "A")
+    cache.put("a@example.com", "token-2", "A")
+    cache.put("b@example.com", "token-3", "B")
+    cache.invalidate("a@example.com")
+    assert cache.get("token-1") is None and cache.get("token-2") is None
+    assert cache.get("token-3") == "B"
+
+
+def test_lru_eviction():
+    cache = PrincipalCache(maxsize=2, ttl=60, clock=Clock())
+    cache.put("a", "t1", 1)
+    cache.put("b", "t2", 2)
+    cache.get("t1")
+    cache.put("c", "t3", 3)
+    assert cache.get("t2") is None
+    assert cache.get("t1") == 1 and cache.get("t3") == 3
+    assert cache.evictions == 1
+
+
+def test_stateless_mode_builds_principal_from_claims(monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_STATELESS", True)
+    monkeypatch.setattr(auth, "principal_cache", PrincipalCache(maxsize=10, ttl=60))
+
+    async def no_lookup(email):
+        raise AssertionError("stateless mode must not hit the database")
+
+    monkeypatch.setattr(auth, "get_user_by_email", no_lookup)
+    user = {
+        "_id": "65a0c0ffee00000000000001",
+        "email": "ines@example.com",
+        "full_name": "Inès",
+        "role": "recruiter",
+        "created_at": datetime(2024, 1, 2),
+    }
+    token = auth.create_access_token(auth.token_claims(user), timedelta(minutes=5))
+    current = asyncio.run(auth.get_current_user(token))
+    assert (current.id, current.role, current.full_name) == (user["_id"], "recruiter", "Inès")
+    assert asyncio.run(auth.get_current_user(token)) is current
+    assert auth.principal_cache.hits == 1
+
+
+def test_user_writes_evict_cached_principals(monkeypatch, memory_storage):
+    from app.services import user_service
+
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(user_service, "principal_cache", cache)
+
+    async def run():
+        await memory_storage.users.insert({"email": "a@example.com", "role": "candidate"})
+        cache.put("a@example.com", "token-1", "A")
+        await user_service.write_user({"email": "a@example.com"}, {"role": "admin"})
+        evicted_on_update = cache.get("token-1") is None
+
+        cache.put("a@example.com", "token-2", "A")
+        await user_service.write_user({"email": "a@example.com"})
+        evicted_on_delete = cache.get("token-2") is None
+        return evicted_on_update, evicted_on_delete, await memory_storage.users.count({})
+
+    assert asyncio.run(run()) == (True, True, 0)
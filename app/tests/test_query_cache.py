@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.services.query_cache import MemoryBackend, QueryCache, cache_key
+
+
+def test_cache_key_is_canonical():
+    a = cache_key("list", {"query": {"skills": "Go", "location": "Paris"}, "since": datetime(2024, 1, 1)})
+    b = cache_key("list", {"since": datetime(2024, 1, 1), "query": {"location": "Paris", "skills": "Go"}})
+    assert a == b
+    assert a != cache_key("list", {"query": {"skills": "Go"}})
+    assert a != cache_key("other", {"query": {"skills": "Go", "location": "Paris"}, "since": datetime(2024, 1, 1)})
+
+
+def test_concurrent_misses_are_coalesced_then_hit():
+    cache = QueryCache(MemoryBackend(10), ttl=30)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def run():
+        results = await asyncio.gather(*(cache.cached("q", {"limit": 5}, load) for _ in range(5)))
+        return results, await cache.cached("q", {"limit": 5}, load)
+
+    results, again = asyncio.run(run())
+    assert len(loads) == 1
+    assert results == [["result"]] * 5 and again == ["result"]
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 4, 1)
+
+
+def test_invalidate_starts_new_generation():
+    cache = QueryCache(MemoryBackend(10), ttl=30)
+    values = iter([1, 2])
+
+    async def load():
+        return next(values)
+
+    async def run():
+        first = await cache.cached("q", {}, load)
+        await cache.invalidate()
+        return first, await cache.cached("q", {}, load)
+
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_failed_load_is_not_cached():
+    cache = QueryCache(MemoryBackend(10), ttl=30)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.cached("q", {}, load)
+        return await cache.cached("q", {}, load)
+
+    assert asyncio.run(run()) == "ok"
+
+
+def test_lru_bound():
+    backend = MemoryBackend(2)
+
+    async def run():
+        for key in ("a", "b", "c"):
+            await backend.set(key, key, 30)
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(run()) == [(False, None), (True, "b"), (True, "c")]
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    cache = QueryCache(MemoryBackend(10), ttl=30)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def run():
+        leader = asyncio.create_task(cache.cached("q", {}, load))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.cached("q", {}, load)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    assert asyncio.run(run()) == [["result"]] * 3
+    assert len(loads) == 2
+    assert (cache.misses, cache.coalesced) == (2, 2)
+
+
+def test_invalidation_runs_after_handlers_subscribed_later(monkeypatch):
+    from app.services import cv_events, query_cache
+
+    # Only the cache's own registration, as query_cache made it at import
+    registered = [entry for entry in cv_events._handlers if entry[1] is query_cache.on_cv_changes]
+    monkeypatch.setattr(cv_events, "_handlers", registered)
+    calls = []
+
+    async def invalidate():
+        calls.append("invalidate")
+
+    monkeypatch.setattr(query_cache.cache, "invalidate", invalidate)
+
+    @cv_events.subscribe
+    async def store(changes):
+        calls.append("store")
+
+    asyncio.run(cv_events.publish([(None, {"_id": 1})]))
+    assert calls == ["store", "invalidate"]
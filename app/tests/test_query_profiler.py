@@ -0,0 +1,81 @@
+import asyncio
+
+from app.services.query_profiler import QueryProfiler, analyze_explain, command_shape
+
+
+class FakeDatabase:
+    def __init__(self, explain):
+        self.explain = explain
+        self.commands = []
+
+    async def command(self, name, spec, **kwargs):
+        self.commands.append((name, spec, kwargs))
+        return self.explain
+
+
+class FakeCollection:
+    name = "candidates"
+
+    def __init__(self, explain):
+        self.database = FakeDatabase(explain)
+
+
+COLLSCAN_EXPLAIN = {
+    "queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}},
+    "executionStats": {"nReturned": 20, "totalKeysExamined": 0, "totalDocsExamined": 50000},
+}
+
+
+def test_shape_drops_values_and_keeps_operators():
+    a = command_shape({"find": "candidates", "filter": {"skills": {"$in": ["Go", "Rust"]}, "location": "Paris"},
+                       "sort": {"created_at": -1}, "limit": 20})
+    b = command_shape({"find": "candidates", "filter": {"location": "Lyon", "skills": {"$in": ["Java"]}},
+                       "sort": {"created_at": -1}, "limit": 50})
+    assert a == b
+    assert a["filter"] == {"location": "?", "skills": {"$in": ["?"]}}
+    assert a != command_shape({"find": "candidates", "filter": {"location": {"$regex": "Par"}}})
+
+
+def test_analyze_flags_collscan_sort_and_ratio():
+    plan = analyze_explain(COLLSCAN_EXPLAIN)
+    assert plan["flags"] == ["COLLSCAN", "IN_MEMORY_SORT", "HIGH_DOCS_EXAMINED_RATIO"]
+
+    indexed = analyze_explain({
+        "stages": [{"$cursor": {
+            "queryPlanner": {"winningPlan": {"queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "skills_1_created_at_1__id_1"}}}},
+            "executionStats": {"nReturned": 20, "totalKeysExamined": 20, "totalDocsExamined": 20},
+        }}],
+    })
+    assert indexed["flags"] == [] and indexed["indexes"] == ["skills_1_created_at_1__id_1"]
+
+
+def test_slow_queries_are_aggregated_by_shape_and_explained_once():
+    profiler = QueryProfiler(enabled=True, threshold_ms=0, buffer_size=3)
+    collection = FakeCollection(COLLSCAN_EXPLAIN)
+
+    async def run():
+        for location in ("Paris", "Lyon", "Nice", "Lille"):
+            command = {"find": "candidates", "filter": {"location": location}}
+            async with profiler.track("list_cvs", collection, command):
+                await asyncio.sleep(0)
+        await asyncio.gather(*profiler._tasks)
+
+    asyncio.run(run())
+    report = profiler.report()
+    assert len(report["recent"]) == 3
+    [shape] = report["shapes"]
+    assert shape["count"] == 4
+    assert shape["flags"] == ["COLLSCAN", "HIGH_DOCS_EXAMINED_RATIO", "IN_MEMORY_SORT"]
+    assert len(collection.database.commands) == 1
+    assert collection.database.commands[0][2] == {"verbosity": "executionStats"}
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = QueryProfiler(enabled=False, threshold_ms=0)
+
+    async def run():
+        async with profiler.track("list_cvs", FakeCollection({}), {"find": "candidates", "filter": {}}):
+            pass
+
+    asyncio.run(run())
+    assert profiler.report()["recent"] == [] and profiler.report()["shapes"] == []
@@ -0,0 +1,232 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core import storage
+from app.core.config import CV_COLLECTION
+from app.repositories.base import SCORE
+from app.repositories.memory import Table, matches, project
+
+DOC = {
+    "_id": 1,
+    "full_name": "Ana García",
+    "skills": ["Python", "Go"],
+    "education": [{"degree": "MSc", "year": "2018"}, {"degree": "BSc", "year": "2016"}],
+    "total_experience_months": 30,
+    "created_at": datetime(2024, 5, 1),
+}
+
+
+@pytest.mark.parametrize("query, expected", [
+    ({"skills": "Go"}, True),
+    ({"skills": {"$all": ["Go", "Python"]}}, True),
+    ({"skills": {"$all": ["Go", "Rust"]}}, False),
+    ({"skills": {"$in": ["Rust", "Go"]}}, True),
+    ({"education.degree": "BSc"}, True),
+    ({"education.year": {"$gte": "2017"}}, True),
+    ({"total_experience_months": {"$gt": 24, "$lte": 30}}, True),
+    ({"total_experience_months": {"$gt": "24"}}, False),  # no cross-type comparisons
+    ({"created_at": {"$lt": datetime(2024, 1, 1)}}, False),
+    ({"phone": None}, True),
+    ({"total_experience_months": {"$ne": None}}, True),
+    ({"full_name": {"$regex": "^ana", "$options": "i"}}, True),
+    ({"$or": [{"skills": "Rust"}, {"full_name": {"$ne": "Bob"}}]}, True),
+    ({"$and": [{"skills": "Go"}, {"full_name": "Bob"}]}, False),
+])
+def test_filter_dialect(query, expected):
+    assert matches(DOC, query) is expected
+
+
+def test_filters_outside_the_dialect_are_rejected():
+    with pytest.raises(NotImplementedError):
+        matches(DOC, {"phone": {"$exists": False}})
+    with pytest.raises(NotImplementedError):
+        matches(DOC, {"$nor": [{"skills": "Go"}]})
+
+
+def test_projection_shapes():
+    assert project(DOC, {"full_name": 1, "education.degree": 1, "_id": 0}) == {
+        "full_name": "Ana García", "education": [{"degree": "MSc"}, {"degree": "BSc"}],
+    }
+    assert set(project(DOC, {"education": 0, "skills": 0})) == {"_id", "full_name", "total_experience_months", "created_at"}
+
+
+def test_indexed_fields_narrow_the_candidates():
+    table = Table.declared(CV_COLLECTION)
+    for i in range(100):
+        table.insert({"email": f"c{i}@x.io", "skill_ids": [i % 10], "created_at": datetime(2024, 1, 1)})
+    assert len(table._candidates({"skill_ids": 3, "created_at": {"$gte": datetime(2023, 1, 1)}})) == 10
+    assert len(table._candidates({"skill_ids": {"$all": [3, 4]}})) == 0
+    assert table._candidates({"created_at": {"$gte": datetime(2023, 1, 1)}}) is None  # range: scanned
+    assert len(table.select({"email": "c7@x.io"})) == 1
+
+
+def _doc(i: int, now: datetime) -> dict:
+    return {
+        "email": f"p{i}@x.io",
+        "full_name": f"Person {i}",
+        "location": ["Paris", "Tunis", "Berlin"][i % 3],
+        "skills": ["Kotlin"] if i % 2 else ["Haskell"],
+        "skill_ids": [1, 2] if i % 2 else [2],
+        "education": [{"degree": ["MSc", "BSc"][i % 2], "school": "Sorbonne"}],
+        "total_experience_months": i * 6,
+        "created_at": now - timedelta(days=i),
+        "updated_at": now,
+    }
+
+
+def test_cv_repository_contract(backend):
+    async def scenario():
+        await storage.get_storage().connect()
+        try:
+            cvs = storage.get_cv_repository()
+            now = datetime(2024, 7, 1, 12, 0, 0, 123456)
+            docs = [_doc(i, now) for i in range(10)]
+            await cvs.insert_many(docs)
+            assert all("_id" in doc for doc in docs)
+            ids = [doc["_id"] for doc in docs]
+            with pytest.raises(DuplicateKeyError):
+                await cvs.insert({"email": "p1@x.io"})
+            with pytest.raises(BulkWriteError) as error:
+                await cvs.insert_many([{"email": "new@x.io"}, {"email": "p2@x.io"}])
+            assert [e["index"] for e in error.value.details["writeErrors"]] == [1]
+            assert await cvs.count({}) == 11
+            assert await cvs.delete({"email": "new@x.io"}) is not None
+
+            newest = await cvs.find({"skills": "Kotlin"}, {"email": 1}, [("created_at", -1), ("_id", -1)], limit=2)
+            assert [d["email"] for d in newest] == ["p1@x.io", "p3@x.io"]
+            stored = await cvs.find_one({"_id": ids[1]})
+            assert stored["created_at"] == now.replace(microsecond=123000) - timedelta(days=1)
+
+            hits = await cvs.find({"$text": {"$search": "kotlin"}}, {"email": 1}, [(SCORE, -1)])
+            assert len(hits) == 5 and all(hit[SCORE] > 0 for hit in hits)
+
+            seen, after = [], None
+            while True:
+                page = await cvs.page({"location": {"$ne": "Tunis"}}, "created_at", -1, after, {"created_at": 1}, 3)
+                seen += [doc["_id"] for doc in page]
+                if len(page) < 3:
+                    break
+                after = (page[-1]["created_at"], page[-1]["_id"])
+            assert seen == [i for n, i in enumerate(ids) if n % 3 != 1]
+
+            facets = await cvs.facets({"location": "Paris"}, {"skills": "skills", "degree": "education.degree"}, 1)
+            assert facets == {"skills": [{"value": "Haskell", "count": 2}], "degree": [{"value": "BSc", "count": 2}]}
+
+            matched = await cvs.match({1: 3, 2: 1}, [2], 12, 3, {"email": 1})
+            assert [(d["email"], d["match_score"]) for d in matched] == [
+                ("p3@x.io", 4), ("p5@x.io", 4), ("p7@x.io", 4),
+            ]
+
+            before = await cvs.update({"_id": ids[0]}, {"location": "Lyon"})
+            assert before["location"] == "Paris"
+            assert await cvs.update({"_id": "missing"}, {"location": "Lyon"}) is None
+            # Guarded writes: the second one no longer matches its updated_at
+            written = await cvs.update_each([
+                ({"_id": ids[2], "updated_at": now}, {"location": "Lyon", "updated_at": now + timedelta(seconds=1)}),
+                ({"_id": ids[3], "updated_at": now - timedelta(days=1)}, {"location": "Lyon"}),
+            ])
+            assert written == (1, 1)
+            assert await cvs.count({"location": "Lyon"}) == 2
+            deleted = await cvs.delete({"_id": ids[0]})
+            assert deleted["email"] == "p0@x.io"
+            assert await cvs.count({}) == 9
+        finally:
+            await storage.get_storage().close()
+
+    asyncio.run(scenario())
+
+
+def test_stats_and_user_repository_contract(backend):
+    async def scenario():
+        await storage.get_storage().connect()
+        try:
+            stats = storage.get_stats_repository()
+            await stats.increment({("skill", "Go"): 2, ("skill", "Java"): 5, ("skill", "Rust"): 0})
+            await stats.increment({("skill", "Go"): -2})
+            assert await stats.top("skill") == [{"value": "Java", "count": 5}]
+            assert await stats.get("skill", "Go") == 0
+            assert await stats.get("skill", "Rust") is None
+            await stats.replace_all({("skill", "Go"): 1, ("total", "cvs"): 1})
+            assert await stats.get("skill", "Java") is None
+            assert await stats.top("skill", 5) == [{"value": "Go", "count": 1}]
+
+            users = storage.get_user_repository()
+            user = {"email": "a@x.io", "role": "candidate"}
+            await users.insert(user)
+            with pytest.raises(DuplicateKeyError):
+                await users.insert({"email": "a@x.io"})
+            assert (await users.find_one({"_id": user["_id"]}))["email"] == "a@x.io"
+            assert (await users.update({"email": "a@x.io"}, {"role": "admin"}))["role"] == "candidate"
+            assert [u["role"] for u in await users.find(0, 10)] == ["admin"]
+            assert await users.delete({"email": "a@x.io"}) is not None
+            assert await users.count({}) == 0
+        finally:
+            await storage.get_storage().close()
+
+    asyncio.run(scenario())
+
+
+def test_rebuild_lock_is_exclusive_until_it_expires(backend):
+    async def scenario():
+        stats = storage.get_stats_repository()
+        await storage.get_storage().connect()
+        try:
+            taken = [await stats.acquire_lock("a", 300), await stats.acquire_lock("b", 300)]
+            await stats.release_lock("b")  # not the owner: no effect
+            taken.append(await stats.acquire_lock("b", 300))
+            await stats.release_lock("a")
+            taken.append(await stats.acquire_lock("b", -1))
+            taken.append(await stats.acquire_lock("c", 300))  # b's has expired
+            return taken
+        finally:
+            await storage.get_storage().close()
+
+    assert asyncio.run(scenario()) == [True, False, False, True, True]
+
+
+def _cv(i: int) -> dict:
+    return {
+        "full_name": f"Candidate {i}",
+        "email": f"candidate{i}@example.com",
+        "location": ["Paris", "Tunis"][i % 2],
+        "skills": [["Python", "FastAPI"], ["Java"], ["Python", "Docker"]][i % 3],
+        "languages": ["English", "French"] if i % 2 else ["English"],
+        "education": [{"degree": "MSc", "school": "Sorbonne", "year": "2018"}],
+        "experience": [{"title": "Engineer", "company": "TechCorp", "duration": f"{i % 5 + 1} years", "technologies": []}],
+    }
+
+
+def test_api_runs_on_the_memory_backend(memory_api):
+    client = memory_api
+    ids = [client.post("/api/v1/cv/", json=_cv(i)).json()["_id"] for i in range(12)]
+    duplicate = client.post("/api/v1/cv/", json=_cv(0))
+    assert duplicate.status_code == 409
+    assert duplicate.json()["message"] == "Email already exists"
+    assert client.put(f"/api/v1/cv/{ids[1]}", json={"email": "candidate0@example.com"}).status_code == 409
+
+    python = client.get("/api/v1/cv/", params={"skills": "Python", "limit": 50}).json()
+    assert len(python) == 8 and all("Python" in cv["skills"] for cv in python)
+    paris = client.get("/api/v1/cv/", params={"location": "paris", "min_experience_years": 3}).json()
+    assert {cv["full_name"] for cv in paris} == {"Candidate 2", "Candidate 4", "Candidate 8"}
+    search = client.get("/api/v1/cv/", params={"search": "docker"}).json()
+    assert {cv["full_name"] for cv in search} == {"Candidate 2", "Candidate 5", "Candidate 8", "Candidate 11"}
+
+    seen, cursor = [], None
+    while True:
+        page = client.get("/api/v1/cv/", params={"paginate": "cursor", "limit": 5, **({"cursor": cursor} if cursor else {})}).json()
+        seen += [cv["_id"] for cv in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(ids) and len(seen) == len(set(seen))
+
+    skills = client.get("/api/v1/cv/analytics/skills").json()
+    assert skills[0]["count"] == 8
+    match = client.post("/api/v1/cv/match", json={"skills": ["Python", "Docker"], "top_n": 3}).json()
+    assert match and "Docker" in match[0]["skills"]
+
+    assert client.delete(f"/api/v1/cv/{ids[0]}").status_code == 200
+    assert client.get(f"/api/v1/cv/{ids[0]}").status_code == 404
@@ -0,0 +1,49 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.cv_model import CVBase
+from app.services.cv_service import cv_helper, projection_for
+from app.utils.serialization import dumps
+
+DOCS = [
+    {
+        "_id": ObjectId(),
+        "full_name": "Inès Ben Ali",
+        "email": "ines@example.com",
+        "location": "Tunis",
+        "education": [{"degree": "MSc", "school": "ENIT"}],
+        "experience": [{"title": "Dev", "duration": "2 years", "duration_months": 24}],
+        "skills": ["Python"],
+        "total_experience_months": 24,
+        "created_at": datetime(2024, 1, 2, 3, 4, 5, 123000),
+        "_search": {"full_name": "ines ben ali"},
+    },
+    {"_id": ObjectId(), "full_name": "Omar", "education": None, "updated_at": datetime(2024, 5, 6)},
+]
+
+
+def test_fast_path_matches_response_model_output():
+    items = [cv_helper(doc) for doc in DOCS]
+    field = create_model_field(name="Response", type_=List[CVBase], mode="serialization")
+    validated = asyncio.run(serialize_response(field=field, response_content=items))
+    assert json.loads(dumps(items)) == json.loads(json.dumps(validated))
+
+
+def test_sparse_fieldset_matches_trimmed_model():
+    fields = ["full_name", "skills", "education"]
+    items = [cv_helper(doc, fields) for doc in DOCS]
+    assert [sorted(item) for item in items] == [["_id", "education", "full_name", "skills"]] * 2
+    field = create_model_field(name="Response", type_=List[CVBase], mode="serialization")
+    validated = asyncio.run(serialize_response(field=field, response_content=items, exclude_unset=True))
+    assert json.loads(dumps(items)) == json.loads(json.dumps(validated))
+
+
+def test_projection_for_fields():
+    assert projection_for(None) == {"_search": 0}
+    assert projection_for(["full_name", "location"], "created_at") == {"full_name": 1, "location": 1, "created_at": 1}
@@ -0,0 +1,80 @@
+import random
+import time
+
+from app.services.suggest import PrefixIndex, SuggestIndex, service
+
+
+def _cv(_id, skills, location=None, school=None, company=None):
+    return {
+        "_id": _id,
+        "skills": skills,
+        "location": location,
+        "education": [{"degree": "MSc", "school": school}] if school else [],
+        "experience": [{"title": "Dev", "company": company}] if company else [],
+    }
+
+
+def test_prefix_completions_by_popularity():
+    index = PrefixIndex()
+    for value, count in (("Python", 5), ("PyTorch", 2), ("Pandas", 3), ("PHP", 1), ("Go", 9)):
+        index.add(value, count)
+    index.add("python", 1)  # a rarer spelling of the same value
+
+    assert index.top("py") == [{"value": "Python", "count": 6}, {"value": "PyTorch", "count": 2}]
+    assert [s["value"] for s in index.top("P", limit=2)] == ["Python", "Pandas"]
+    assert index.top("")[0] == {"value": "Go", "count": 9}
+    assert index.top("rust") == []
+
+    for _ in range(2):
+        index.remove("PyTorch")
+    assert [s["value"] for s in index.top("py")] == ["Python"] and len(index) == 4
+
+
+def test_accent_insensitive_and_incremental():
+    index = SuggestIndex.from_documents([
+        _cv(1, ["Python", "Docker"], "Paris", "Sorbonne Université", "TechCorp"),
+        _cv(2, ["Python", "python"], "Paris", "Sorbonne Université"),
+        _cv(3, ["Java"], "Tunis", "École Polytechnique", "Techno SA"),
+    ])
+    assert index.top("school", "eco") == [{"value": "École Polytechnique", "count": 1}]
+    assert index.top("skills", "PYT") == [{"value": "Python", "count": 2}]  # once per CV and spelling
+    assert [s["value"] for s in index.top("company", "tech")] == ["TechCorp", "Techno SA"]
+
+    index.apply([
+        (None, _cv(4, ["Docker"], "Tunis")),
+        (_cv(1, ["Python", "Docker"], "Paris", "Sorbonne Université", "TechCorp"), _cv(1, ["Docker"], "Tunis")),
+        (_cv(3, ["Java"], "Tunis", "École Polytechnique", "Techno SA"), None),
+    ])
+    assert index.top("skills", "") == [{"value": "Docker", "count": 2}, {"value": "Python", "count": 1}]
+    assert index.top("location", "") == [{"value": "Tunis", "count": 2}, {"value": "Paris", "count": 1}]
+    assert index.top("company", "tech") == []
+
+
+def test_lookups_stay_sub_millisecond():
+    rng = random.Random(3)
+    index = PrefixIndex()
+    for n in range(20000):
+        index.add("".join(rng.choice("abcdefghij") for _ in range(rng.randint(3, 12))) + str(n), rng.randint(1, 500))
+    prefixes = ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(0, 3))) for _ in range(200)]
+    for prefix in prefixes:
+        index.top(prefix)  # wide ranges are memoized after the first call
+    started = time.perf_counter()
+    for prefix in prefixes:
+        index.top(prefix)
+    assert (time.perf_counter() - started) / len(prefixes) < 0.001
+
+
+def test_suggest_endpoint(memory_api):
+    for i, skills in enumerate((["Python", "FastAPI"], ["Python"], ["pytorch"], ["Java"])):
+        memory_api.post("/api/v1/cv/", json={
+            "full_name": f"Candidate {i}", "email": f"suggest{i}@example.com", "location": "Paris",
+            "skills": skills, "languages": [], "education": [], "experience": [],
+        })
+    deadline = time.monotonic() + 5
+    while not service.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    response = memory_api.get("/api/v1/cv/suggest", params={"field": "skills", "prefix": "py"})
+    assert response.status_code == 200
+    assert response.json() == [{"value": "Python", "count": 2}, {"value": "PyTorch", "count": 1}]
+    assert memory_api.get("/api/v1/cv/suggest", params={"field": "salary", "prefix": "1"}).status_code == 422
@@ -0,0 +1,32 @@
+from app.utils.text_search import build_search_fields, fold, text_filter, trigrams
+
+
+def test_fold_strips_case_accents_and_spaces():
+    assert fold("  José   GARCÍA ") == "jose garcia"
+    assert fold("Université de Montréal") == "universite de montreal"
+    assert fold(None) == ""
+
+
+def test_build_search_fields_only_for_written_fields():
+    shadow = build_search_fields({
+        "full_name": "Inès Trabelsi",
+        "education": [{"degree": "MSc", "school": "INSAT"}, {"degree": "MSc"}],
+    })
+    assert shadow["full_name"] == "ines trabelsi"
+    assert "ine" in shadow["full_name_tri"]
+    assert shadow["education"] == ["msc", "insat"]
+    assert "location" not in shadow and "experience" not in shadow
+
+
+def test_contains_filter_uses_trigrams_and_escapes_input():
+    query = text_filter("full_name", "A.B (c)")
+    assert query["_search.full_name_tri"] == {"$all": trigrams("a.b (c)")}
+    assert query["_search.full_name"] == {"$regex": r"a\.b\ \(c\)"}
+
+
+def test_prefix_filter_is_a_range():
+    assert text_filter("location", "Pa", "prefix") == {"_search.location": {"$gte": "pa", "$lt": "pa\uffff"}}
+
+
+def test_short_contains_falls_back_to_regex():
+    assert text_filter("location", "é") == {"_search.location": {"$regex": "e"}}
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from app.init import sanitize_cv_data
+from app.services.cv_service import derive_fields
+from app.services.vocabulary import Vocabulary, alias_key, tag_id, vocabulary
+from scripts.canonicalize_vocabulary import canonical_fields
+
+
+def test_aliases_share_one_canonical_name_and_id():
+    spellings = ["Node.js", "Nodejs", "node js", " NODE-JS ", "node"]
+    assert {vocabulary.canonical("skills", s) for s in spellings} == {"Node.js"}
+    assert len({vocabulary.id("skills", s) for s in spellings}) == 1
+    assert vocabulary.canonicalize("skills", ["golang", "Go", "k8s", "", "C++", "c#", "cpp"]) == ["Go", "Kubernetes", "C++", "C#"]
+    assert vocabulary.canonicalize("languages", ["Français", "francais", "anglais"]) == ["French", "English"]
+    # Unknown values keep the old normalization, with an ID of their own
+    assert vocabulary.canonical("skills", " elm ") == "Elm"
+    assert vocabulary.id("skills", "ELM") == tag_id("skills", alias_key("Elm"))
+    assert vocabulary.id("skills", "Elm") != vocabulary.id("languages", "Elm")
+
+
+def test_short_aliases_are_not_merged(tmp_path):
+    assert vocabulary.canonical("skills", "tf") == "Tf"
+    assert vocabulary.id("skills", "ci") != vocabulary.id("skills", "CI/CD")
+    path = tmp_path / "vocabulary.json"
+    path.write_text(json.dumps({"skills": {"TensorFlow": ["tf"]}}))
+    with pytest.raises(ValueError, match="TensorFlow"):
+        Vocabulary.load(str(path))
+
+
+def test_dictionary_file_extends_the_defaults(tmp_path):
+    path = tmp_path / "vocabulary.json"
+    path.write_text(json.dumps({"skills": {"Elm": ["elm-lang"], "Node.js": ["node", "nodejs", "node.js runtime"]}}))
+    custom = Vocabulary.load(str(path))
+    assert custom.canonical("skills", "elm lang") == "Elm"
+    assert custom.canonical("skills", "Node.js runtime") == "Node.js"
+    assert custom.canonical("skills", "golang") == "Go"
+    # IDs depend on the canonical name only, so both dictionaries agree
+    assert custom.id("skills", "nodejs") == vocabulary.id("skills", "nodejs")
+
+
+def test_writes_store_canonical_names_and_ids():
+    cv = derive_fields(sanitize_cv_data({
+        "skills": ["python3", "Python", "ReactJS", "k8s"],
+        "languages": ["english", "Français"],
+        "experience": [{"title": "Dev", "duration": "1 year", "technologies": ["postgres", "PostgreSQL", "mongo"]}],
+    }))
+    assert cv["skills"] == ["Python", "React", "Kubernetes"]
+    assert cv["skill_ids"] == vocabulary.ids("skills", ["Python", "React", "Kubernetes"])
+    assert cv["language_ids"] == vocabulary.ids("languages", ["English", "French"])
+    assert cv["experience"][0]["technologies"] == ["PostgreSQL", "MongoDB"]
+
+
+def test_migration_rewrites_only_what_changes():
+    legacy = {"_id": 1, "skills": ["Nodejs", "Node.js", "Sql"], "languages": ["French"],
+              "experience": [{"title": "Dev", "technologies": ["Javascript"]}]}
+    fields = canonical_fields(legacy)
+    assert fields["skills"] == ["Node.js", "SQL"]
+    assert fields["skill_ids"] == vocabulary.ids("skills", ["Node.js", "SQL"])
+    assert "languages" not in fields and fields["language_ids"] == vocabulary.ids("languages", ["French"])
+    assert fields["experience"][0]["technologies"] == ["JavaScript"]
+    assert canonical_fields({**legacy, **fields}) == {}
+
+
+def test_filters_and_matching_use_ids(memory_api):
+    for i, skills in enumerate((["NodeJS", "Docker"], ["node.js"], ["Golang"])):
+        memory_api.post("/api/v1/cv/", json={
+            "full_name": f"Candidate {i}", "email": f"vocab{i}@example.com", "skills": skills,
+            "languages": ["français"], "education": [], "experience": [],
+        })
+    found = memory_api.get("/api/v1/cv/", params={"skills": "node", "languages": "French"}).json()
+    assert sorted(cv["full_name"] for cv in found) == ["Candidate 0", "Candidate 1"]
+    assert all(cv["skills"][0] == "Node.js" for cv in found)
+    assert len(memory_api.get("/api/v1/cv/", params={"skills": "Node.js,go", "skills_mode": "and"}).json()) == 0
+
+    matches = memory_api.post("/api/v1/cv/match", json={"skills": ["nodejs", "docker"], "top_n": 5}).json()
+    assert [cv["full_name"] for cv in matches][:1] == ["Candidate 0"]
+    skills = {row["skill"]: row["count"] for row in memory_api.get("/api/v1/cv/analytics/skills").json()}
+    assert skills["Node.js"] == 2 and skills["Go"] == 1
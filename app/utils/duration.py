@@ -0,0 +1,77 @@
+"""Parse free-text experience durations into months.
+
+Handles the forms people actually type in the `duration` field:
+    "2 years", "1.5 yrs", "6 months", "2 years 3 months", "2y 3m",
+    "3 ans", "18 mois", "2019-2021", "2019 - present",
+    "Jan 2020 - Mar 2022", "03/2020 - 06/2021"
+Anything else returns None.
+"""
+import re
+from datetime import datetime
+from typing import Optional
+
+MONTHS = {
+    "jan": 1, "janv": 1, "janvier": 1, "january": 1,
+    "feb": 2, "fev": 2, "fév": 2, "fevr": 2, "févr": 2, "february": 2, "fevrier": 2, "février": 2,
+    "mar": 3, "mars": 3, "march": 3,
+    "apr": 4, "avr": 4, "april": 4, "avril": 4,
+    "may": 5, "mai": 5,
+    "jun": 6, "juin": 6, "june": 6,
+    "jul": 7, "juil": 7, "july": 7, "juillet": 7,
+    "aug": 8, "aou": 8, "aoû": 8, "august": 8, "aout": 8, "août": 8,
+    "sep": 9, "sept": 9, "september": 9, "septembre": 9,
+    "oct": 10, "october": 10, "octobre": 10,
+    "nov": 11, "november": 11, "novembre": 11,
+    "dec": 12, "déc": 12, "december": 12, "decembre": 12, "décembre": 12,
+}
+PRESENT = r"(?:present|now|current|today|ongoing|aujourd'hui|maintenant|actuel(?:lement)?)"
+
+_UNIT = re.compile(
+    r"(\d+(?:[.,]\d+)?)\s*(years?|yrs?|y|ans?|années?|annees?|months?|mos?|mois|m)\b"
+)
+_MONTH_YEAR = r"(?:([a-zéû]+)\.?\s+|(\d{1,2})\s*[/.-]\s*)?(\d{4})"
+_RANGE = re.compile(_MONTH_YEAR + r"\s*(?:-|–|—|to|à|au)\s*(?:" + _MONTH_YEAR + r"|" + PRESENT + r")")
+
+
+def _month(name: Optional[str], number: Optional[str]) -> Optional[int]:
+    if number:
+        value = int(number)
+        return value if 1 <= value <= 12 else None
+    if name:
+        return MONTHS.get(name.lower())
+    return None
+
+
+def parse_duration_months(text: Optional[str], today: Optional[datetime] = None) -> Optional[int]:
+    """Months of experience described by `text`, or None if it can't be read."""
+    if not text:
+        return None
+    value = text.strip().lower()
+    today = today or datetime.utcnow()
+
+    # Date ranges first ("2019-2021" would otherwise read as nothing useful)
+    match = _RANGE.search(value)
+    if match:
+        start_name, start_num, start_year, end_name, end_num, end_year = match.groups()
+        start_month = _month(start_name, start_num)
+        if end_year:
+            end_month = _month(end_name, end_num)
+            if not start_month and not end_month:
+                # Year-only ranges count whole years: 2019-2021 = 2 years
+                return max((int(end_year) - int(start_year)) * 12, 0)
+            end = (int(end_year), end_month or 12)
+        else:
+            end = (today.year, today.month)
+        start = (int(start_year), start_month or 1)
+        return max((end[0] - start[0]) * 12 + (end[1] - start[1]), 0)
+
+    months = 0.0
+    found = False
+    for amount, unit in _UNIT.findall(value):
+        number = float(amount.replace(",", "."))
+        found = True
+        if unit.startswith(("y", "an", "ann")):
+            months += number * 12
+        else:
+            months += number
+    return int(round(months)) if found else None
@@ -10,7 +10,8 @@ def http_exception_handler(request: Request, exc: StarletteHTTPException):
             "status": "error",
             "message": exc.detail,
             "details": str(request.url)
-        }
+        },
+        headers=getattr(exc, "headers", None),  # e.g. Retry-After, WWW-Authenticate
     )
 
 def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,57 @@
+"""Opaque keyset cursors for CV listings.
+
+A cursor carries the sort key of the last document of a page plus its
+`_id` (the tie-breaker), so the next page is a range predicate on an
+index instead of a `.skip()` that walks every earlier document.
+"""
+import base64
+from typing import Any, Dict, Optional
+
+from bson import json_util
+
+# Sorts that can be paginated with a cursor ("score" = text relevance)
+KEYSET_SORT_FIELDS = ("created_at", "updated_at", "full_name", "score")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_by: str, sort_order: int, value: Any, last_id: Any) -> str:
+    payload = json_util.dumps({"s": sort_by, "o": sort_order, "v": value, "id": last_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_by: str, sort_order: int) -> Dict[str, Any]:
+    """Decode a cursor and check it belongs to the requested sort."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        value, last_id = payload["v"], payload["id"]
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
+    if cursor_sort != sort_by or cursor_order != sort_order:
+        raise InvalidCursor("Cursor was issued for a different sort; restart pagination without a cursor")
+    return {"value": value, "id": last_id}
+
+
+def keyset_filter(sort_by: str, sort_order: int, value: Any, last_id: Any) -> Dict[str, Any]:
+    """Documents strictly after (value, last_id) in (sort_by, _id) order.
+
+    Missing/null sort values sort first ascending (last descending), as in
+    MongoDB, so they get their own branch.
+    """
+    op = "$gt" if sort_order == 1 else "$lt"
+    if value is None:
+        after_nulls: Optional[Dict[str, Any]] = {sort_by: {"$ne": None}} if sort_order == 1 else None
+        same_key = {sort_by: None, "_id": {op: last_id}}
+        return {"$or": [same_key, after_nulls]} if after_nulls else same_key
+    branches = [
+        {sort_by: {op: value}},
+        {sort_by: value, "_id": {op: last_id}},
+    ]
+    if sort_order == -1:
+        # Descending walks reach the null/missing values last
+        branches.append({sort_by: None})
+    return {"$or": branches}
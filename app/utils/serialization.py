@@ -0,0 +1,40 @@
+"""JSON encoding for CV responses.
+
+cv_helper already returns the exact API shape (see CVBase), so CV routes
+return FastJSONResponse directly: FastAPI then skips re-validating every
+item through response_model (EmailStr, nested models) and the
+jsonable_encoder pass, and the body is encoded by orjson when installed
+(stdlib json otherwise). response_model stays on the routes for the
+OpenAPI schema.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """UTF-8 JSON bytes; datetimes as ISO 8601, ObjectIds as strings."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
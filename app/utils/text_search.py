@@ -0,0 +1,85 @@
+"""Normalized shadow fields for index-friendly name/location/... filters.
+
+At write time each CV gets a `_search` sub-document with lowercase,
+accent-folded copies of the filterable text fields plus their trigrams:
+
+    "_search": {
+        "full_name": "jose garcia", "full_name_tri": ["jos", "ose", ...],
+        "education": ["msc computer science", "universite de tunis"], ...
+    }
+
+Prefix filters become range scans on the folded value; substring filters
+use the trigram multikey index to narrow candidates and an exact regex on
+the folded value to confirm, instead of an unanchored case-insensitive
+regex that scans every document.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+# Filter name -> source paths (arrays of sub-documents are flattened)
+SEARCH_FIELDS: Dict[str, List[str]] = {
+    "full_name": ["full_name"],
+    "location": ["location"],
+    "education": ["education.degree", "education.school"],
+    "experience": ["experience.title", "experience.company"],
+}
+MULTI_VALUED = {"education", "experience"}
+SEARCH_PREFIX = "_search"
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase, strip accents and collapse whitespace: "  José  García" -> "jose garcia"."""
+    if not text:
+        return ""
+    text = str(text)
+    if text.isascii():
+        return " ".join(text.lower().split())
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def trigrams(folded: str) -> List[str]:
+    return sorted({folded[i:i + 3] for i in range(len(folded) - 2)})
+
+
+def _values(cv: dict, path: str) -> List[str]:
+    head, _, rest = path.partition(".")
+    value = cv.get(head)
+    if rest:
+        items = value if isinstance(value, list) else [value] if isinstance(value, dict) else []
+        return [item.get(rest) for item in items if isinstance(item, dict) and item.get(rest)]
+    return [value] if isinstance(value, str) and value else []
+
+
+def build_search_fields(cv: dict) -> Dict[str, object]:
+    """`_search` content for the filter fields whose sources are present in `cv`."""
+    shadow: Dict[str, object] = {}
+    for name, paths in SEARCH_FIELDS.items():
+        if not any(path.split(".")[0] in cv for path in paths):
+            continue
+        values = [fold(v) for path in paths for v in _values(cv, path)]
+        values = [v for v in dict.fromkeys(values) if v]
+        grams = sorted({gram for v in values for gram in trigrams(v)})
+        if name in MULTI_VALUED:
+            shadow[name] = values
+        else:
+            shadow[name] = values[0] if values else None
+        shadow[f"{name}_tri"] = grams
+    if "email" in cv:
+        shadow["email"] = fold(cv.get("email")) or None
+    return shadow
+
+
+def text_filter(name: str, text: str, mode: str = "contains") -> dict:
+    """Mongo filter for a case/accent-insensitive contains or prefix match on `name`."""
+    folded = fold(text)
+    path = f"{SEARCH_PREFIX}.{name}"
+    if mode == "prefix":
+        return {path: {"$gte": folded, "$lt": folded + "\uffff"}}
+    grams = trigrams(folded)
+    if not grams:
+        # Shorter than a trigram: nothing to look up, fall back to a scan of the folded value
+        return {path: {"$regex": re.escape(folded)}}
+    return {f"{path}_tri": {"$all": grams}, path: {"$regex": re.escape(folded)}}
@@ -0,0 +1,60 @@
+"""Backfill the fields cv_service.derive_fields() computes at write time.
+
+That is experience[].duration_months, total_experience_months and the
+`_search` shadow fields (folded text + trigrams). By default only CVs
+missing one of them are processed (--all recomputes every CV), in
+batches of bulk updates; the dashboard counters are rebuilt afterwards:
+
+    python -m scripts.backfill_derived_fields
+    python -m scripts.backfill_derived_fields --all --batch-size 2000
+"""
+import argparse
+import asyncio
+
+from pymongo import UpdateOne
+
+from app.core import database
+from app.core.database import get_cv_collection
+from app.services import analytics_store
+from app.services.cv_service import derive_fields
+
+SOURCE_FIELDS = {"full_name": 1, "email": 1, "location": 1, "education": 1, "experience": 1}
+
+
+async def backfill(everything: bool, batch_size: int) -> int:
+    collection = get_cv_collection()
+    query = {} if everything else {"$or": [
+        {"total_experience_months": {"$exists": False}},
+        {"_search": {"$exists": False}},
+    ]}
+    updated = 0
+    batch = []
+    async for cv in collection.find(query, SOURCE_FIELDS, batch_size=batch_size):
+        cv.setdefault("experience", [])
+        derived = derive_fields({k: v for k, v in cv.items() if k != "_id"})
+        batch.append(UpdateOne({"_id": cv["_id"]}, {"$set": derived}))
+        if len(batch) == batch_size:
+            updated += (await collection.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await collection.bulk_write(batch, ordered=False)).modified_count
+    return updated
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="recompute every CV, not only missing ones")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    await database.connect()
+    try:
+        updated = await backfill(args.all, args.batch_size)
+        await analytics_store.rebuild()
+    finally:
+        await database.close()
+    print(f"✅ Derived fields backfilled on {updated} CVs (restart API workers to refresh the match index)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""Small helpers shared by the benchmark scripts in this folder.
+
+Run any benchmark from the repository root, e.g.:
+    python -m scripts.benchmarks.bench_async_routes --help
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from bson import ObjectId
+
+SKILLS = ["Python", "Javascript", "React", "Node.js", "Mongodb", "Django", "Fastapi", "Docker", "Go", "Sql"]
+LOCATIONS = ["Paris", "Tunis", "London", "Berlin", "Madrid", "Lyon", "Sfax", "Rome", "Montréal", "São Paulo"]
+FIRST_NAMES = ["Hamza", "Amira", "José", "Chloé", "Liam", "Noor", "Yassine", "Emma", "Lucas", "Inès", "Omar", "Sofia"]
+LAST_NAMES = ["Ben Saïd", "García", "Martin", "Trabelsi", "Dubois", "Müller", "Rossi", "Smith", "Haddad", "Lefèvre"]
+SCHOOLS = ["Université de Tunis", "ENSI", "Sorbonne Université", "TU München", "INSAT", "Imperial College"]
+COMPANIES = ["TechCorp", "Datawave", "Vermeg", "Sofrecom", "Capgemini", "Instadeep", "Orange", "Talan"]
+
+
+def fake_cv(i: int, now: datetime) -> dict:
+    """One fake CV document (client fields only, no derived fields)."""
+    created = now - timedelta(minutes=random.randint(0, 525_600))
+    return {
+        "full_name": f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)} {i}",
+        "email": f"bench.{ObjectId()}@example.com",
+        "location": random.choice(LOCATIONS),
+        "skills": random.sample(SKILLS, 4),
+        "languages": ["English"],
+        "education": [{"degree": "MSc Computer Science", "school": random.choice(SCHOOLS), "year": "2018"}],
+        "experience": [{
+            "title": "Software Engineer",
+            "company": random.choice(COMPANIES),
+            "duration": f"{random.randint(1, 8)} years",
+            "technologies": [],
+        }],
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def seed_cvs(collection, count: int, batch_size: int = 1000):
+    """Insert `count` fake CVs (with derived fields) with a sync PyMongo collection."""
+    from app.services.cv_service import derive_fields
+
+    now = datetime.utcnow()
+    batch = []
+    for i in range(count):
+        batch.append(derive_fields(fake_cv(i, now)))
+        if len(batch) == batch_size:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0..100) of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], elapsed: float) -> dict:
+    """Throughput and latency percentiles (milliseconds) for one series."""
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def run_load(
+    call: Callable[[int], Awaitable[str]],
+    concurrency: int,
+    duration: float,
+) -> Dict[str, dict]:
+    """Run `call` from `concurrency` workers for `duration` seconds.
+
+    `call(i)` performs one request and returns the label its latency is
+    recorded under (usually the route). Returns a summary per label plus
+    an "all" entry.
+    """
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        i = worker_id
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            label = await call(i)
+            latencies[label].append(time.perf_counter() - started)
+            i += concurrency
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    report = {label: summarize(values, elapsed) for label, values in latencies.items()}
+    report["all"] = summarize([v for values in latencies.values() for v in values], elapsed)
+    return report
+
+
+def print_report(title: str, report: Dict[str, dict]):
+    print(f"\n== {title}")
+    print(f"{'series':<40}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, row in sorted(report.items()):
+        print(
+            f"{label:<40}{row['requests']:>10}{row['rps']:>10}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
@@ -0,0 +1,96 @@
+"""Async routes vs the previous sync/PyMongo path, under a mixed workload.
+
+Both apps are driven in-process through httpx's ASGI transport at a fixed
+concurrency. The workload mixes one slow aggregation (/analytics/skills)
+with cheap lookups (/{cv_id}, /?limit=10) so threadpool starvation of
+cheap requests on the sync path shows up in their p99.
+
+    python -m scripts.benchmarks.bench_async_routes --concurrency 200 --duration 15
+    python -m scripts.benchmarks.bench_async_routes --seed 20000   # insert fake CVs first
+"""
+import argparse
+import asyncio
+
+import httpx
+from bson import ObjectId
+from fastapi import FastAPI, HTTPException
+from pymongo import MongoClient
+
+from app.core.config import CV_COLLECTION, DB_NAME, MONGO_URI
+from scripts.benchmarks._common import print_report, run_load, seed_cvs
+
+
+def build_sync_app(collection) -> FastAPI:
+    """The sync handlers as they were before the async service layer."""
+    app = FastAPI()
+
+    def helper(cv):
+        cv["_id"] = str(cv["_id"])
+        return cv
+
+    @app.get("/api/v1/cv/analytics/skills")
+    def analytics_skills(limit: int = 10):
+        pipeline = [
+            {"$unwind": "$skills"},
+            {"$group": {"_id": "$skills", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": limit},
+        ]
+        return [{"skill": r["_id"], "count": r["count"]} for r in collection.aggregate(pipeline)]
+
+    @app.get("/api/v1/cv/")
+    def list_cvs(limit: int = 10):
+        return [helper(cv) for cv in collection.find({}).sort("created_at", -1).limit(limit)]
+
+    @app.get("/api/v1/cv/{cv_id}")
+    def get_cv(cv_id: str):
+        cv = collection.find_one({"_id": ObjectId(cv_id)})
+        if not cv:
+            raise HTTPException(status_code=404, detail="CV not found")
+        return helper(cv)
+
+    return app
+
+
+async def bench(app: FastAPI, ids: list, concurrency: int, duration: float, slow_every: int):
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def call(i: int) -> str:
+            if i % slow_every == 0:
+                await client.get("/api/v1/cv/analytics/skills")
+                return "GET /analytics/skills"
+            if i % 2:
+                await client.get(f"/api/v1/cv/{ids[i % len(ids)]}")
+                return "GET /{cv_id}"
+            await client.get("/api/v1/cv/", params={"limit": 10})
+            return "GET /"
+
+        return await run_load(call, concurrency, duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--slow-every", type=int, default=10, help="1 in N requests is an aggregation")
+    parser.add_argument("--seed", type=int, default=0, help="insert N fake CVs before running")
+    args = parser.parse_args()
+
+    collection = MongoClient(MONGO_URI)[DB_NAME][CV_COLLECTION]
+    if args.seed:
+        seed_cvs(collection, args.seed)
+    ids = [str(d["_id"]) for d in collection.find({}, {"_id": 1}).limit(1000)]
+    if not ids:
+        raise SystemExit("No CVs in the collection: run with --seed N first.")
+
+    from app.main import app as async_app
+
+    sync_report = asyncio.run(bench(build_sync_app(collection), ids, args.concurrency, args.duration, args.slow_every))
+    print_report(f"sync def + PyMongo (concurrency={args.concurrency})", sync_report)
+    async_report = asyncio.run(bench(async_app, ids, args.concurrency, args.duration, args.slow_every))
+    print_report(f"async def + AsyncMongoClient (concurrency={args.concurrency})", async_report)
+
+
+if __name__ == "__main__":
+    main()
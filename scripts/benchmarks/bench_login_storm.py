@@ -0,0 +1,98 @@
+"""CV endpoint latency during a login storm, threadpool vs process pool bcrypt.
+
+For each hashing mode the app is driven in-process through httpx's ASGI
+transport: first CV reads alone (quiet), then the same reads while
+`--logins` concurrent clients hammer /login. Logins rejected with 503
+(admission control) are reported separately.
+
+    python -m scripts.benchmarks.bench_login_storm --duration 10 --logins 50
+    python -m scripts.benchmarks.bench_login_storm --seed 5000   # insert fake CVs first
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+import httpx
+from pymongo import MongoClient
+
+from app.core.config import CV_COLLECTION, DB_NAME, MONGO_URI, USER_COLLECTION
+from app.services import password_hasher
+from app.services.password_hasher import PasswordHasher, pwd_context
+from scripts.benchmarks._common import print_report, run_load, seed_cvs
+
+BENCH_EMAIL = "login-storm@bench.local"
+BENCH_PASSWORD = "bench-password"
+
+
+async def bench(app, ids: list, readers: int, logins: int, duration: float):
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def read(i: int) -> str:
+            if i % 2:
+                await client.get(f"/api/v1/cv/{ids[i % len(ids)]}")
+                return "GET /{cv_id}"
+            await client.get("/api/v1/cv/", params={"limit": 10})
+            return "GET /"
+
+        async def login(i: int) -> str:
+            response = await client.post(
+                "/api/v1/users/login",
+                data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD},
+            )
+            return "POST /login (503)" if response.status_code == 503 else "POST /login"
+
+        quiet = await run_load(read, readers, duration)
+        storm_reads, storm_logins = await asyncio.gather(
+            run_load(read, readers, duration),
+            run_load(login, logins, duration),
+        )
+    storm_reads.pop("all")
+    storm_logins.pop("all")
+    return quiet, {**storm_reads, **storm_logins}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=20, help="concurrent CV readers")
+    parser.add_argument("--logins", type=int, default=50, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--workers", type=int, default=2, help="bcrypt processes for the pool run")
+    parser.add_argument("--seed", type=int, default=0, help="insert N fake CVs before running")
+    args = parser.parse_args()
+
+    database = MongoClient(MONGO_URI)[DB_NAME]
+    if args.seed:
+        seed_cvs(database[CV_COLLECTION], args.seed)
+    ids = [str(d["_id"]) for d in database[CV_COLLECTION].find({}, {"_id": 1}).limit(1000)]
+    if not ids:
+        raise SystemExit("No CVs in the collection: run with --seed N first.")
+    database[USER_COLLECTION].update_one(
+        {"email": BENCH_EMAIL},
+        {"$set": {
+            "full_name": "Login Storm",
+            "role": "viewer",
+            "password": pwd_context.hash(BENCH_PASSWORD),
+            "created_at": datetime.utcnow(),
+        }},
+        upsert=True,
+    )
+
+    from app.main import app
+
+    try:
+        for title, hasher in (
+            ("threadpool bcrypt", PasswordHasher(workers=0)),
+            (f"process pool bcrypt ({args.workers} workers)", PasswordHasher(workers=args.workers)),
+        ):
+            password_hasher.hasher = hasher
+            quiet, storm = asyncio.run(bench(app, ids, args.readers, args.logins, args.duration))
+            print_report(f"{title}: CV reads, quiet (readers={args.readers})", quiet)
+            print_report(f"{title}: during login storm (logins={args.logins})", storm)
+            hasher.shutdown()
+    finally:
+        database[USER_COLLECTION].delete_one({"email": BENCH_EMAIL})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Latency of the in-memory match engine on a synthetic candidate pool.
+
+No database needed: the index is built from generated documents with a
+Zipf-like skill popularity, then random job descriptions are matched.
+
+    python -m scripts.benchmarks.bench_match_engine --candidates 1000000
+"""
+import argparse
+import random
+import time
+
+from app.services.match_engine import SkillMatchIndex
+from scripts.benchmarks._common import percentile
+
+
+def synthetic_docs(count: int, skills: int, seed: int):
+    rng = random.Random(seed)
+    vocabulary = [f"skill{n}" for n in range(skills)]
+    popularity = [1 / (rank + 1) for rank in range(skills)]
+    for n in range(count):
+        yield {
+            "_id": n,
+            "skills": rng.choices(vocabulary, popularity, k=rng.randint(3, 12)),
+            "total_experience_months": rng.randint(0, 180),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--skills", type=int, default=500, help="vocabulary size")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = SkillMatchIndex.from_documents(synthetic_docs(args.candidates, args.skills, args.seed))
+    print(f"built index over {len(index)} candidates in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(args.seed + 1)
+    # Job skills are drawn from the popular head, where postings are largest
+    head = [f"skill{n}" for n in range(min(50, args.skills))]
+    scenarios = {
+        "5 skills": lambda: ({s: 1 for s in rng.sample(head, 5)}, (), 0),
+        "8 weighted skills": lambda: ({s: rng.randint(1, 5) for s in rng.sample(head, 8)}, (), 0),
+        "5 skills + 1 required + 3y": lambda: ({s: 1 for s in rng.sample(head, 5)}, (rng.choice(head),), 3),
+    }
+    print(f"{'scenario':<32}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, make_query in scenarios.items():
+        samples = []
+        for _ in range(args.queries):
+            weights, required, min_experience = make_query()
+            started = time.perf_counter()
+            index.top_k(weights, args.top_n, required, min_experience)
+            samples.append(time.perf_counter() - started)
+        print(
+            f"{name:<32}{percentile(samples, 50) * 1000:>10.2f}"
+            f"{percentile(samples, 99) * 1000:>10.2f}{max(samples) * 1000:>10.2f}"
+        )
+
+    started = time.perf_counter()
+    for n in range(1000):
+        index.upsert({"_id": ("new", n), "skills": rng.sample(head, 5)})
+    print(f"upsert: {(time.perf_counter() - started):.3f} ms per CV")
+
+
+if __name__ == "__main__":
+    main()
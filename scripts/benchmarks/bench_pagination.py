@@ -0,0 +1,80 @@
+"""skip/limit vs keyset cursor latency as pages get deeper.
+
+Seeds enough CVs for the deepest page (unless --no-seed), then times
+single page fetches through cv_service at the checkpoints below. Offset
+pages jump straight to the page; cursor pages walk there, timing every
+fetch, which is what a client does.
+
+    python -m scripts.benchmarks.bench_pagination --pages 10000 --limit 20
+"""
+import argparse
+import asyncio
+import time
+
+from pymongo import MongoClient
+
+from app.core import database, indexes
+from app.core.config import CV_COLLECTION, DB_NAME, MONGO_URI
+from app.core.database import get_cv_collection
+from app.services.cv_service import list_cvs, list_cvs_page
+from scripts.benchmarks._common import seed_cvs
+
+CHECKPOINTS = (1, 10, 100, 1000, 10000, 100000)
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def run(pages: int, limit: int, sort_by: str, repeat: int):
+    await database.connect()
+    await indexes.ensure(get_cv_collection())
+    checkpoints = [p for p in CHECKPOINTS if p <= pages]
+
+    print(f"{'page':>8}{'skip/limit ms':>16}{'cursor ms':>12}")
+    offset_ms = {}
+    for page in checkpoints:
+        samples = []
+        for _ in range(repeat):
+            _, ms = await timed(list_cvs({}, (page - 1) * limit, limit, sort_by, -1))
+            samples.append(ms)
+        offset_ms[page] = min(samples)
+
+    cursor_ms = {}
+    next_cursor = None
+    for page in range(1, pages + 1):
+        (_, next_cursor), ms = await timed(list_cvs_page({}, limit, sort_by, -1, cursor=next_cursor))
+        if page in offset_ms:
+            cursor_ms[page] = ms
+        if next_cursor is None:
+            break
+
+    for page in checkpoints:
+        cursor_value = f"{cursor_ms[page]:.2f}" if page in cursor_ms else "-"
+        print(f"{page:>8}{offset_ms[page]:>16.2f}{cursor_value:>12}")
+    await database.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--sort-by", default="created_at", choices=["created_at", "updated_at", "full_name"])
+    parser.add_argument("--repeat", type=int, default=3, help="offset samples per checkpoint (best is kept)")
+    parser.add_argument("--no-seed", action="store_true", help="use the CVs already in the collection")
+    args = parser.parse_args()
+
+    if not args.no_seed:
+        collection = MongoClient(MONGO_URI)[DB_NAME][CV_COLLECTION]
+        missing = args.pages * args.limit - collection.estimated_document_count()
+        if missing > 0:
+            print(f"Seeding {missing} CVs...")
+            seed_cvs(collection, missing)
+
+    asyncio.run(run(args.pages, args.limit, args.sort_by, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Per-item cost of serializing a CV list response, before and after.
+
+before: cv_helper dicts validated through response_model=List[CVBase]
+        (FastAPI's serialize_response) and encoded by JSONResponse
+after:  cv_helper dicts encoded by FastJSONResponse (orjson if installed)
+
+No database needed: documents are built in memory, with derived fields.
+
+    python -m scripts.benchmarks.bench_serialization --items 100 --rounds 200
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.cv_model import CVBase
+from app.services.cv_service import cv_helper, derive_fields
+from app.utils import serialization
+from app.utils.serialization import FastJSONResponse
+from scripts.benchmarks._common import fake_cv
+
+
+def per_item_us(render, docs: list, rounds: int) -> float:
+    render(docs)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        render(docs)
+    return (time.perf_counter() - started) / (rounds * len(docs)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="CVs per response (the list limit cap)")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    docs = [{"_id": ObjectId(), **derive_fields(fake_cv(i, now))} for i in range(args.items)]
+    field = create_model_field(name="Response", type_=List[CVBase], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def before(raw):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=[cv_helper(d) for d in raw]))
+        return JSONResponse(content).body
+
+    def after(raw):
+        return FastJSONResponse([cv_helper(d) for d in raw]).body
+
+    encoder = "orjson" if serialization.orjson is not None else "json"
+    rows = [
+        ("response_model + JSONResponse", per_item_us(before, docs, args.rounds)),
+        (f"FastJSONResponse ({encoder})", per_item_us(after, docs, args.rounds)),
+    ]
+    print(f"\n== {args.items} CVs per response, {args.rounds} rounds")
+    print(f"{'path':<40}{'us/item':>10}{'ms/page':>10}")
+    for label, us in rows:
+        print(f"{label:<40}{us:>10.1f}{us * args.items / 1000:>10.2f}")
+    print(f"speedup: {rows[0][1] / rows[1][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Load and regression suite for the CV API hot paths.
+
+Seeds a dedicated database (--database, default "<DB_NAME>_bench") with
+generate_fake_cvs at the requested scale (kept between runs when the
+count matches), then drives the app in-process through httpx's ASGI
+transport at a fixed concurrency, one scenario at a time:
+
+    list       GET /api/v1/cv/ with a mix of filters, sorts and paging
+    lookup     GET /api/v1/cv/{cv_id}
+    dashboard  GET /api/v1/cv/dashboard
+    match      POST /api/v1/cv/match (skills drawn like the data)
+    login      POST /api/v1/users/login (bcrypt, --login-concurrency)
+    write      POST, PUT and DELETE /api/v1/cv/ (created CVs are removed)
+
+Throughput and p50/p95/p99 are printed per series. With a baseline
+file, a run exits with status 1 when a series' p95 grew, or its
+throughput dropped, by more than --tolerance:
+
+    python -m scripts.benchmarks.bench_suite --scale 100k --save-baseline
+    python -m scripts.benchmarks.bench_suite --scale 100k            # compare
+    python -m scripts.benchmarks.bench_suite --scale 1m --scenarios list match
+
+With --storage memory the data is generated in-process into the memory
+repositories (app/repositories/memory.py) instead, which measures the API layer
+without a MongoDB server; its baselines are kept under their own key.
+
+Baselines are per machine: record one on the box that runs the checks.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+from pymongo import MongoClient
+
+from app.core import config, storage
+from app.services.password_hasher import pwd_context
+from scripts.benchmarks._common import print_report, run_load
+from scripts.generate_fake_cvs import LANGUAGES, LOCATIONS, SKILLS, Generator, generate
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SCENARIOS = ("list", "lookup", "dashboard", "match", "login", "write")
+BENCH_EMAIL = "suite@bench.local"
+BENCH_PASSWORD = "bench-password"
+WRITE_DOMAIN = "bench-write.example.com"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Series with fewer requests than this are too noisy to compare
+MIN_REQUESTS = 50
+
+
+def list_params(rng: random.Random, now: datetime) -> tuple:
+    """(label, query parameters) for one list request of the mix."""
+    kind = rng.randrange(12)
+    if kind == 0:
+        return "default", {"skip": rng.randrange(0, 200, 10)}
+    if kind == 1:
+        return "skills", {"skills": rng.choice(SKILLS[:20])}
+    if kind == 2:
+        return "skills and", {"skills": ",".join(rng.sample(SKILLS[:10], 2)), "skills_mode": "and"}
+    if kind == 3:
+        return "languages", {"languages": rng.choice(LANGUAGES[1:8])}
+    if kind == 4:
+        return "location", {"location": rng.choice(LOCATIONS[:15])}
+    if kind == 5:
+        return "location prefix", {"location": rng.choice(LOCATIONS[:15])[:3], "text_match": "prefix"}
+    if kind == 6:
+        low = rng.randint(0, 8)
+        return "experience range", {"min_experience_years": low, "max_experience_years": low + rng.randint(1, 5)}
+    if kind == 7:
+        since = now - timedelta(days=rng.randint(7, 180))
+        return "created range", {"created_from": since.strftime("%Y-%m-%d")}
+    if kind == 8:
+        return "updated sort", {"sort_by": "updated_at", "order": rng.choice(("asc", "desc"))}
+    if kind == 9:
+        return "full_name contains", {"full_name": rng.choice(("garc", "mart", "ben s", "trab", "duboi"))}
+    if kind == 10:
+        return "search", {"search": rng.choice(SKILLS[:30])}
+    return "cursor + fields", {"paginate": "cursor", "limit": 20, "fields": "full_name,location,skills"}
+
+
+def seed(database: str, count: int, reseed: bool, workers: int) -> List[str]:
+    db = MongoClient(config.MONGO_URI)[database]
+    collection = db[config.CV_COLLECTION]
+    existing = collection.estimated_document_count()
+    if reseed or existing != count:
+        print(f"Seeding {count:,} CVs into {database} (had {existing:,})")
+        MongoClient(config.MONGO_URI).drop_database(database)
+        generate(count, workers=workers, database=database)
+    db[config.USER_COLLECTION].update_one(
+        {"email": BENCH_EMAIL},
+        {"$set": {"full_name": "Bench Suite", "role": "admin", "password": pwd_context.hash(BENCH_PASSWORD),
+                  "created_at": datetime.utcnow()}},
+        upsert=True,
+    )
+    return [str(d["_id"]) for d in collection.aggregate([{"$sample": {"size": 2000}}, {"$project": {"_id": 1}}])]
+
+
+def seed_memory(count: int) -> List[str]:
+    from app.repositories.memory import MemoryStorage
+    from app.services.cv_service import derive_fields
+
+    memory = MemoryStorage()
+    storage.use(memory)
+    generator = Generator(seed=42, now=datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0))
+    print(f"Generating {count:,} CVs into the memory backend")
+
+    async def load():
+        for index, start in enumerate(range(0, count, 50000)):
+            docs = [derive_fields(doc) for doc in generator.chunk(index, start, min(start + 50000, count))]
+            await memory.cvs.insert_many(docs)
+        await memory.users.insert({
+            "email": BENCH_EMAIL, "full_name": "Bench Suite", "role": "admin",
+            "password": pwd_context.hash(BENCH_PASSWORD), "created_at": datetime.utcnow(),
+        })
+        docs = await memory.cvs.find({}, {"_id": 1})
+        return [str(d["_id"]) for d in random.Random(42).sample(docs, min(2000, len(docs)))]
+
+    return asyncio.run(load())
+
+
+async def run_scenarios(app, args, ids: List[str]) -> Dict[str, dict]:
+    from app.core.config import MATCH_ENGINE_ENABLED
+    from app.services.match_engine import engine as match_engine
+
+    generator = Generator(seed=7, now=datetime.utcnow())
+    now = datetime.utcnow()
+    results: Dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        while MATCH_ENGINE_ENABLED and not match_engine.ready:
+            await asyncio.sleep(0.5)  # built in the background: measure it, not the fallback
+        created: List[str] = []
+
+        async def list_call(i: int) -> str:
+            label, params = list_params(random.Random(i), now)
+            response = await client.get("/api/v1/cv/", params=params)
+            response.raise_for_status()
+            return f"GET / {label}"
+
+        async def lookup_call(i: int) -> str:
+            (await client.get(f"/api/v1/cv/{ids[i % len(ids)]}")).raise_for_status()
+            return "GET /{cv_id}"
+
+        async def dashboard_call(i: int) -> str:
+            (await client.get("/api/v1/cv/dashboard")).raise_for_status()
+            return "GET /dashboard"
+
+        async def match_call(i: int) -> str:
+            rng = random.Random(i)
+            job = {"skills": generator.skills.sample(rng, 5), "top_n": 10, "min_experience": rng.choice((0, 0, 2, 5))}
+            (await client.post("/api/v1/cv/match", json=job)).raise_for_status()
+            return "POST /match"
+
+        async def login_call(i: int) -> str:
+            response = await client.post("/api/v1/users/login", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+            if response.status_code == 503:
+                return "POST /login (503)"
+            response.raise_for_status()
+            return "POST /login"
+
+        def write_body(i: int) -> dict:
+            cv = generator.cv(random.Random(i), i)
+            cv["email"] = f"cv{i}@{WRITE_DOMAIN}"
+            return {k: v for k, v in cv.items() if k not in ("created_at", "updated_at")}
+
+        async def write_call(i: int) -> str:
+            step = i % 4
+            if step in (0, 1) or not created:
+                response = await client.post("/api/v1/cv/", json=write_body(i))
+                response.raise_for_status()
+                created.append(response.json()["_id"])
+                return "POST /"
+            if step == 2:
+                cv_id = created[i % len(created)]
+                body = write_body(i)
+                body["email"] = f"cv-{cv_id}@{WRITE_DOMAIN}"
+                response = await client.put(f"/api/v1/cv/{cv_id}", json=body)
+                if response.status_code != 404:  # deleted by another client meanwhile
+                    response.raise_for_status()
+                return "PUT /{cv_id}"
+            (await client.delete(f"/api/v1/cv/{created.pop()}")).raise_for_status()
+            return "DELETE /{cv_id}"
+
+        calls = {
+            "list": (list_call, args.concurrency),
+            "lookup": (lookup_call, args.concurrency),
+            "dashboard": (dashboard_call, args.concurrency),
+            "match": (match_call, args.concurrency),
+            "login": (login_call, args.login_concurrency),
+            "write": (write_call, args.concurrency),
+        }
+        for name in args.scenarios:
+            call, concurrency = calls[name]
+            results[name] = await run_load(call, concurrency, args.duration)
+            print_report(f"{name} (concurrency={concurrency}, {args.duration:.0f}s)", results[name])
+
+        for cv_id in created:
+            await client.delete(f"/api/v1/cv/{cv_id}")
+    return results
+
+
+# --------------------------
+# Baseline
+# --------------------------
+def compare(baseline: Dict[str, dict], results: Dict[str, dict], tolerance: float) -> List[str]:
+    """Regressions of `results` against `baseline` ({scenario: {series: summary}})."""
+    regressions = []
+    for scenario, series in results.items():
+        for label, row in series.items():
+            base = baseline.get(scenario, {}).get(label)
+            if not base or min(base["requests"], row["requests"]) < MIN_REQUESTS:
+                continue
+            if row["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{scenario} / {label}: p95 {base['p95_ms']} -> {row['p95_ms']} ms")
+            if row["rps"] < base["rps"] * (1 - tolerance):
+                regressions.append(f"{scenario} / {label}: throughput {base['rps']} -> {row['rps']} req/s")
+    return regressions
+
+
+def load_baselines(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="10k", help="10k, 100k, 1m or a number of CVs")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--login-concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--database", default=f"{config.DB_NAME}_bench")
+    parser.add_argument("--storage", choices=("mongo", "memory"), default="mongo", help="storage backend under test")
+    parser.add_argument("--reseed", action="store_true", help="regenerate the data even if the count matches")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="generator processes")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 growth / throughput drop")
+    args = parser.parse_args(argv)
+
+    count = SCALES.get(args.scale.lower()) or int(args.scale)
+    if args.storage == "memory":
+        ids = seed_memory(count)
+    else:
+        ids = seed(args.database, count, args.reseed, args.workers)
+    config.DB_NAME = args.database  # read by get_database() at call time
+    config.STORAGE_BACKEND = args.storage
+
+    from app.main import app
+
+    results = asyncio.run(run_scenarios(app, args, ids))
+
+    baselines = load_baselines(args.baseline)
+    key = f"{count}@{args.concurrency}" + ("/memory" if args.storage == "memory" else "")
+    if args.save_baseline:
+        baselines[key] = {**baselines.get(key, {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\n✅ Baseline {key} saved to {args.baseline}")
+        return
+    if key not in baselines:
+        print(f"\nNo baseline for {key} in {args.baseline} (record one with --save-baseline)")
+        return
+    regressions = compare(baselines[key], results, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+    print(f"\n✅ No regression beyond {args.tolerance:.0%} against baseline {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Unanchored $regex filters vs the normalized shadow fields.
+
+For each filter, runs the old query (case-insensitive unanchored regex
+on the raw field) and the new one (trigram/prefix on `_search`), and
+prints the winning plan, keys/docs examined and best-of-N latency.
+
+    python -m scripts.benchmarks.bench_text_filters --size 1000000
+"""
+import argparse
+import asyncio
+import time
+
+from pymongo import MongoClient
+
+from app.core import database, indexes
+from app.core.config import CV_COLLECTION, DB_NAME, MONGO_URI
+from app.core.database import get_cv_collection
+from app.utils.text_search import text_filter
+from scripts.benchmarks._common import seed_cvs
+
+CASES = [
+    # (label, old filter, new filter)
+    ("full_name contains 'garc'", {"full_name": {"$regex": "garc", "$options": "i"}}, text_filter("full_name", "garc")),
+    ("full_name prefix 'ines'", {"full_name": {"$regex": "^inès", "$options": "i"}}, text_filter("full_name", "ines", "prefix")),
+    ("location contains 'paulo'", {"location": {"$regex": "paulo", "$options": "i"}}, text_filter("location", "paulo")),
+    ("education contains 'munchen'", {"$or": [
+        {"education.degree": {"$regex": "münchen", "$options": "i"}},
+        {"education.school": {"$regex": "münchen", "$options": "i"}},
+    ]}, text_filter("education", "munchen")),
+    ("experience contains 'deep'", {"$or": [
+        {"experience.title": {"$regex": "deep", "$options": "i"}},
+        {"experience.company": {"$regex": "deep", "$options": "i"}},
+    ]}, text_filter("experience", "deep")),
+]
+
+
+def plan_stages(plan: dict) -> str:
+    stages = []
+    while plan:
+        stages.append(plan.get("stage", "?"))
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return ">".join(reversed(stages))
+
+
+async def measure(query: dict, limit: int, repeat: int):
+    collection = get_cv_collection()
+    explain = await collection.find(query).limit(limit).explain()
+    stats = explain.get("executionStats", {})
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await collection.find(query, {"_id": 1}).limit(limit).to_list()
+        samples.append((time.perf_counter() - started) * 1000)
+    return (
+        plan_stages(explain["queryPlanner"]["winningPlan"]),
+        stats.get("totalKeysExamined"),
+        stats.get("totalDocsExamined"),
+        min(samples),
+    )
+
+
+async def run(limit: int, repeat: int):
+    await database.connect()
+    await indexes.ensure(get_cv_collection())
+    print(f"{'filter':<32}{'mode':<6}{'plan':<34}{'keys':>10}{'docs':>10}{'ms':>10}")
+    for label, old, new in CASES:
+        for mode, query in (("old", old), ("new", new)):
+            plan, keys, docs, ms = await measure(query, limit, repeat)
+            print(f"{label:<32}{mode:<6}{plan:<34}{keys!s:>10}{docs!s:>10}{ms:>10.2f}")
+    await database.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000, help="CVs to have in the collection")
+    parser.add_argument("--limit", type=int, default=10, help="page size of each query")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    collection = MongoClient(MONGO_URI)[DB_NAME][CV_COLLECTION]
+    missing = args.size - collection.estimated_document_count()
+    if missing > 0:
+        print(f"Seeding {missing} CVs...")
+        seed_cvs(collection, missing)
+    asyncio.run(run(args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
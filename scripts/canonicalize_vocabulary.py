@@ -0,0 +1,91 @@
+"""Re-canonicalize skills, languages and technologies of stored CVs.
+
+Maps every tag through the alias dictionary (app/services/vocabulary.py,
+plus VOCABULARY_FILE if set), removes the duplicates that creates and
+writes skill_ids / language_ids next to the names. Only CVs whose values
+change are written, in batches of bulk updates; the dashboard counters
+are rebuilt afterwards. Until it has run, skill and language filters
+(which compare skill_ids / language_ids) find none of the CVs stored
+before the dictionary was deployed. Run it once after deploying, and
+again whenever the dictionary changes:
+
+    python -m scripts.canonicalize_vocabulary
+    python -m scripts.canonicalize_vocabulary --dry-run
+"""
+import argparse
+import asyncio
+from collections import Counter
+
+from pymongo import UpdateOne
+
+from app.core import database
+from app.core.database import get_cv_collection
+from app.services import analytics_store
+from app.services.vocabulary import ID_FIELDS, SKILLS, vocabulary
+
+SOURCE_FIELDS = {"skills": 1, "languages": 1, "skill_ids": 1, "language_ids": 1, "experience": 1}
+
+
+def canonical_fields(cv: dict) -> dict:
+    """The $set that makes a CV canonical (empty when it already is)."""
+    fields = {}
+    for kind, id_field in ID_FIELDS.items():
+        names = vocabulary.canonicalize(kind, cv.get(kind) or [])
+        if names != (cv.get(kind) or []) and kind in cv:
+            fields[kind] = names
+        ids = vocabulary.ids(kind, names)
+        if ids != cv.get(id_field):
+            fields[id_field] = ids
+    experience = cv.get("experience") or []
+    canonical = [
+        {**exp, "technologies": vocabulary.canonicalize(SKILLS, exp["technologies"])}
+        if isinstance(exp.get("technologies"), list) else exp
+        for exp in experience
+    ]
+    if canonical != experience:
+        fields["experience"] = canonical
+    return fields
+
+
+async def canonicalize(batch_size: int, dry_run: bool) -> Counter:
+    collection = get_cv_collection()
+    counts: Counter = Counter()
+    batch = []
+    async for cv in collection.find({}, SOURCE_FIELDS, batch_size=batch_size):
+        counts["scanned"] += 1
+        fields = canonical_fields(cv)
+        if not fields:
+            continue
+        counts["changed"] += 1
+        counts.update(f"{name} rewritten" for name in fields)
+        batch.append(UpdateOne({"_id": cv["_id"]}, {"$set": fields}))
+        if len(batch) == batch_size:
+            if not dry_run:
+                await collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch and not dry_run:
+        await collection.bulk_write(batch, ordered=False)
+    return counts
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="count the CVs that would change, write nothing")
+    args = parser.parse_args()
+
+    await database.connect()
+    try:
+        counts = await canonicalize(args.batch_size, args.dry_run)
+        if not args.dry_run and counts["changed"]:
+            await analytics_store.rebuild()
+    finally:
+        await database.close()
+    details = ", ".join(f"{name}: {n}" for name, n in sorted(counts.items()) if name.endswith("rewritten"))
+    verb = "would change" if args.dry_run else "changed"
+    print(f"✅ {counts['changed']} of {counts['scanned']} CVs {verb}" + (f" ({details})" if details else "")
+          + ("" if args.dry_run else " (restart API workers to refresh the match and suggest indexes)"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
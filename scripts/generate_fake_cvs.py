@@ -1,51 +1,297 @@
-from faker import Faker
-from pymongo import MongoClient
+"""Seeded, multiprocess synthetic CV generator for load and index testing.
+
+Skills, locations, languages, schools and companies follow Zipf
+distributions (a few very common values, a long tail), CVs have 0-3
+education and 0-6 experience entries, and durations use the formats
+app/utils/duration.py parses ("3 years", "18 mois", "Jan 2020 - Mar 2022",
+...), so total_experience_months is populated.
+
+Output is decided by --seed and --chunk-size only: chunk k is generated
+from its own RNG, so the worker count changes the speed, not the data.
+
+    # straight into MongoDB (MONGO_URI / DB_NAME / CV_COLLECTION), with derived fields
+    python -m scripts.generate_fake_cvs --count 10000000 --workers 8 --mongo
+
+    # NDJSON shards for POST /api/v1/cv/bulk, one file per chunk (the API sets the timestamps)
+    python -m scripts.generate_fake_cvs --count 1000000 --output data/cvs
+
+    # stored documents as Extended JSON, for mongoimport
+    python -m scripts.generate_fake_cvs --count 1000000 --output data/cvs --extended-json
+"""
+import argparse
+import json
+import os
 import random
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import List, Optional, Sequence
 
-fake = Faker()
+SKILLS = [
+    "Python", "JavaScript", "SQL", "Java", "Git", "Docker", "React", "TypeScript", "Linux", "Node.js",
+    "HTML", "CSS", "AWS", "C#", "MongoDB", "PostgreSQL", "Kubernetes", "Django", "Spring", "Angular",
+    "C++", "FastAPI", "Flask", "Go", "PHP", "Azure", "Redis", "Terraform", "Vue.js", "Pandas",
+    "Machine Learning", "TensorFlow", "PyTorch", "Kafka", "GraphQL", "REST", "Jenkins", "CI/CD", "Scrum", "Excel",
+    "Power BI", "Tableau", "Spark", "Hadoop", "Kotlin", "Swift", "Flutter", "React Native", "Rust", "Scala",
+    "Elasticsearch", "RabbitMQ", "GCP", "Ansible", "Laravel", "Symfony", "Ruby", "Ruby on Rails", "MATLAB", "R",
+    "NLP", "Computer Vision", "OpenCV", "Figma", "Selenium", "Cypress", "Jest", "JUnit", "Oracle", "SAP",
+    "Salesforce", "Solidity", "Unity", "Unreal Engine", "Haskell", "Elixir", "Clojure", "Fortran", "Cobol", "Erlang",
+]
+LOCATIONS = [
+    "Paris", "Tunis", "London", "Berlin", "Lyon", "Madrid", "Sfax", "Montréal", "Amsterdam", "Barcelona",
+    "Sousse", "Toulouse", "Munich", "Lisbon", "Casablanca", "Dubai", "Milan", "Brussels", "Marseille", "Nantes",
+    "Lille", "Bordeaux", "Geneva", "Zürich", "Dublin", "Rome", "Vienna", "Warsaw", "Prague", "Stockholm",
+    "Copenhagen", "Oslo", "Helsinki", "Athens", "Istanbul", "Cairo", "Algiers", "Rabat", "Bizerte", "Nabeul",
+    "New York", "San Francisco", "Toronto", "São Paulo", "Mexico City", "Singapore", "Bangalore", "Tokyo", "Sydney", "Nice",
+]
+LANGUAGES = [
+    "English", "French", "Arabic", "Spanish", "German", "Italian", "Portuguese", "Dutch", "Turkish", "Russian",
+    "Chinese", "Japanese", "Polish", "Swedish", "Hindi", "Korean", "Greek", "Romanian", "Czech", "Danish",
+]
+DEGREES = [
+    "MSc Computer Science", "Software Engineering Degree", "BSc Computer Science", "Master Data Science",
+    "BSc Information Systems", "MBA", "PhD Computer Science", "Licence Informatique", "Master Cybersecurity",
+    "BSc Mathematics", "MSc Artificial Intelligence", "Bachelor Business Administration", "DUT Informatique",
+]
+SCHOOLS = [
+    "ENSI", "INSAT", "Université de Tunis", "Sorbonne Université", "École Polytechnique", "TU München",
+    "Imperial College", "EPFL", "ESPRIT", "Université Paris-Saclay", "Politecnico di Milano", "UCL",
+    "Universidad Complutense", "KTH", "TU Delft", "ETH Zürich", "ENIT", "Université de Sfax", "INSA Lyon",
+    "Université de Montréal", "University of Toronto", "Stanford University", "MIT", "Université Laval",
+]
+COMPANIES = [
+    "Capgemini", "Sofrecom", "Vermeg", "Talan", "Orange", "Instadeep", "Accenture", "Atos", "Sopra Steria",
+    "Datawave", "TechCorp", "Amazon", "Google", "Microsoft", "Ubisoft", "Dassault Systèmes", "Thales",
+    "SAP", "Deloitte", "BNP Paribas", "Société Générale", "Airbus", "Criteo", "Doctolib", "Back Market",
+    "Proxym", "Telnet", "Linedata", "Expensya", "Wevioo", "Focus Corporation", "Cynapsys", "Spotify", "Zalando",
+]
+TITLES = [
+    "Software Engineer", "Backend Developer", "Full Stack Developer", "Frontend Developer", "Data Engineer",
+    "Data Scientist", "DevOps Engineer", "QA Engineer", "Mobile Developer", "Tech Lead", "Intern",
+    "Machine Learning Engineer", "Cloud Architect", "Product Owner", "Site Reliability Engineer", "Security Analyst",
+]
+FIRST_NAMES = [
+    "Hamza", "Amira", "Mohamed", "Sarah", "José", "Chloé", "Liam", "Noor", "Yassine", "Emma", "Lucas", "Inès",
+    "Omar", "Sofia", "Youssef", "Léa", "Ahmed", "Fatma", "Louis", "Mariem", "Adam", "Olivia", "Ali", "Nour",
+    "Hugo", "Camille", "Karim", "Julia", "Mehdi", "Zeineb", "Thomas", "Aya", "Noah", "Rania", "Ethan", "Salma",
+]
+LAST_NAMES = [
+    "Ben Saïd", "Trabelsi", "García", "Martin", "Dubois", "Müller", "Rossi", "Smith", "Haddad", "Lefèvre",
+    "Ben Ali", "Bouazizi", "Jlassi", "Bernard", "Moreau", "Schmidt", "Fernández", "Johnson", "Gharbi", "Mansour",
+    "Hammami", "Laurent", "Nguyen", "Kowalski", "Silva", "Dridi", "Chebbi", "Petit", "Roux", "Fontaine",
+]
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+EMAIL_DOMAINS = ["gmail.com", "outlook.com", "yahoo.fr", "example.com", "proton.me"]
 
-# MongoDB connection
-client = MongoClient("mongodb://localhost:27017")
-db = client["cv_database"]
-collection = db["candidates"]
 
-# Predefined lists
-technologies = ["Python", "JavaScript", "React", "Node.js", "MongoDB", "Django", "FastAPI"]
-languages = ["English", "French", "Arabic"]
+class Zipf:
+    """Draws from `values` with P(rank k) proportional to 1 / k**s."""
 
-def generate_education():
-    return [
-        {
-            "degree": "Bachelor in Computer Science",
-            "school": fake.company(),
-            "year": str(random.randint(2015, 2022))
-        }
-    ]
-
-def generate_experience():
-    return [
-        {
-            "title": "Software Engineer",
-            "company": fake.company(),
-            "duration": f"{random.randint(1, 5)} years",
-            "technologies": random.sample(technologies, 3)
+    def __init__(self, values: Sequence[str], s: float):
+        self.values = list(values)
+        self.cumulative = list(accumulate(1 / rank ** s for rank in range(1, len(values) + 1)))
+
+    def draw(self, rng: random.Random) -> str:
+        return self.values[bisect_left(self.cumulative, rng.random() * self.cumulative[-1])]
+
+    def sample(self, rng: random.Random, k: int) -> List[str]:
+        """k distinct values (popular ones first in probability, not in order)."""
+        k = min(k, len(self.values))
+        chosen: dict = {}
+        while len(chosen) < k:
+            chosen[self.draw(rng)] = None
+        return list(chosen)
+
+
+class Generator:
+    def __init__(self, seed: int, now: datetime, zipf_s: float = 1.1, days: int = 1095):
+        self.seed = seed
+        self.now = now
+        self.days = days
+        self.skills = Zipf(SKILLS, zipf_s)
+        self.locations = Zipf(LOCATIONS, zipf_s)
+        self.languages = Zipf(LANGUAGES, zipf_s + 0.4)  # a handful of languages dominate
+        self.degrees = Zipf(DEGREES, zipf_s)
+        self.schools = Zipf(SCHOOLS, zipf_s)
+        self.companies = Zipf(COMPANIES, 0.9)
+        self.titles = Zipf(TITLES, zipf_s)
+
+    def duration(self, rng: random.Random, months: int, end: datetime, current: bool) -> str:
+        style = rng.random()
+        years, rest = divmod(months, 12)
+        if style < 0.35:
+            return f"{years} years" if years and not rest else f"{months} months"
+        if style < 0.5:
+            return f"{years}y {rest}m" if years else f"{months} months"
+        if style < 0.6:
+            return f"{years} ans" if years and not rest else f"{months} mois"
+        start = end - timedelta(days=months * 30.44)
+        finish = "present" if current else f"{MONTH_NAMES[end.month - 1]} {end.year}"
+        if style < 0.85:
+            return f"{MONTH_NAMES[start.month - 1]} {start.year} - {finish}"
+        finish = "present" if current else f"{end.month:02d}/{end.year}"
+        return f"{start.month:02d}/{start.year} - {finish}"
+
+    def experience(self, rng: random.Random, skills: List[str]) -> List[dict]:
+        count = 0 if rng.random() < 0.08 else min(1 + int(rng.expovariate(0.7)), 6)  # 8% first job seekers
+        entries = []
+        end = self.now
+        for position in range(count):
+            months = max(1, int(rng.lognormvariate(3.0, 0.7)))  # median ~20 months
+            entries.append({
+                "title": self.titles.draw(rng),
+                "company": self.companies.draw(rng),
+                "duration": self.duration(rng, months, end, current=position == 0 and rng.random() < 0.6),
+                "technologies": rng.sample(skills, min(len(skills), rng.randint(0, 4))),
+            })
+            end -= timedelta(days=months * 30.44 + rng.randint(0, 180))
+        return entries
+
+    def education(self, rng: random.Random) -> List[dict]:
+        count = rng.choices((0, 1, 2, 3), weights=(5, 55, 32, 8))[0]
+        year = self.now.year - rng.randint(0, 20)
+        entries = []
+        for _ in range(count):
+            entries.append({"degree": self.degrees.draw(rng), "school": self.schools.draw(rng), "year": str(year)})
+            year -= rng.randint(2, 5)
+        return entries
+
+    def cv(self, rng: random.Random, number: int) -> dict:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        skills = self.skills.sample(rng, min(3 + int(rng.expovariate(0.2)), 25))
+        created = self.now - timedelta(seconds=rng.randint(0, self.days * 86400))
+        updated = created
+        if rng.random() < 0.3:  # edited since
+            updated += timedelta(seconds=rng.randint(0, int((self.now - created).total_seconds())))
+        local = f"{first}.{last}".lower().replace(" ", "").encode("ascii", "ignore").decode()
+        return {
+            "full_name": f"{first} {last}",
+            "email": f"{local}.{number}@{rng.choice(EMAIL_DOMAINS)}",  # unique: the number is the CV's
+            "phone": f"+216{rng.randint(20000000, 99999999)}",
+            "location": self.locations.draw(rng),
+            "education": self.education(rng),
+            "experience": self.experience(rng, skills),
+            "skills": skills,
+            "languages": self.languages.sample(rng, rng.choices((1, 2, 3, 4), weights=(25, 45, 22, 8))[0]),
+            "created_at": created,
+            "updated_at": updated,
         }
-    ]
-
-def generate_cv():
-    return {
-        "full_name": fake.name(),
-        "email": fake.email(),
-        "phone": fake.phone_number(),
-        "location": fake.city(),
-        "education": generate_education(),
-        "experience": generate_experience(),
-        "skills": random.sample(technologies, 5),
-        "languages": random.sample(languages, 2)
+
+    def chunk(self, index: int, start: int, end: int) -> List[dict]:
+        rng = random.Random(self.seed * 1_000_003 + index)
+        return [self.cv(rng, number) for number in range(start, end)]
+
+
+# --------------------------
+# Workers (one process each; state is per process)
+# --------------------------
+_collection = None
+
+
+def _init_worker(database: Optional[str]):
+    global _collection
+    if database:
+        from pymongo import MongoClient
+
+        from app.core.config import CV_COLLECTION, MONGO_URI
+        _collection = MongoClient(MONGO_URI)[database][CV_COLLECTION]
+
+
+def _run_chunk(options: dict, index: int, start: int, end: int) -> int:
+    generator = Generator(options["seed"], options["now"], options["zipf"], options["days"])
+    docs = generator.chunk(index, start, end)
+    if _collection is not None or options["extended_json"]:
+        from app.services.cv_service import derive_fields
+        docs = [derive_fields(doc) for doc in docs]
+
+    if _collection is not None:
+        batch_size = options["batch_size"]
+        for offset in range(0, len(docs), batch_size):
+            _collection.insert_many(docs[offset:offset + batch_size], ordered=False)
+        return len(docs)
+
+    path = os.path.join(options["output"], f"cvs-{index:05d}.ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        if options["extended_json"]:
+            from bson import json_util
+            for doc in docs:
+                f.write(json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS) + "\n")
+        else:
+            for doc in docs:
+                doc["created_at"] = doc["created_at"].isoformat()
+                doc["updated_at"] = doc["updated_at"].isoformat()
+                f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+    return len(docs)
+
+
+def generate(
+    count: int,
+    seed: int = 42,
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 50000,
+    batch_size: int = 5000,
+    zipf: float = 1.1,
+    days: int = 1095,
+    now: Optional[datetime] = None,
+    database: Optional[str] = None,
+    output: Optional[str] = None,
+    extended_json: bool = False,
+    progress: bool = True,
+) -> int:
+    """Write `count` CVs to the CV collection of `database`, or as NDJSON
+    shards into `output`. Returns the number written."""
+    options = {
+        "seed": seed, "now": now or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0),
+        "zipf": zipf, "days": days, "batch_size": batch_size, "output": output, "extended_json": extended_json,
     }
+    if output:
+        os.makedirs(output, exist_ok=True)
+
+    chunks = [(index, start, min(start + chunk_size, count))
+              for index, start in enumerate(range(0, count, chunk_size))]
+    started = time.perf_counter()
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(database,)) as pool:
+        futures = [pool.submit(_run_chunk, options, *chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            written += future.result()
+            if progress:
+                elapsed = time.perf_counter() - started
+                print(f"\r{written:,}/{count:,} CVs ({written / elapsed:,.0f}/s)", end="", flush=True)
+    if progress:
+        print(f"\n✅ {written:,} CVs written in {time.perf_counter() - started:.1f}s" + (f" to {output}" if output else ""))
+    return written
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=50000, help="CVs per task (and per NDJSON shard)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="documents per insert_many")
+    parser.add_argument("--zipf", type=float, default=1.1, help="skew exponent (higher = more concentrated)")
+    parser.add_argument("--days", type=int, default=1095, help="created_at spread, in days before --now")
+    parser.add_argument("--now", default=datetime.utcnow().strftime("%Y-%m-%d"), help="reference date (YYYY-MM-DD)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--mongo", action="store_true", help="insert into the configured CV collection")
+    target.add_argument("--output", help="directory for NDJSON shards")
+    parser.add_argument("--extended-json", action="store_true",
+                        help="shards hold stored documents (derived fields, $date) for mongoimport")
+    args = parser.parse_args(argv)
+
+    from app.core.config import DB_NAME
+
+    generate(
+        args.count, args.seed, args.workers, args.chunk_size, args.batch_size, args.zipf, args.days,
+        now=datetime.strptime(args.now, "%Y-%m-%d"),
+        database=DB_NAME if args.mongo else None,
+        output=args.output,
+        extended_json=args.extended_json,
+    )
 
-# Insert fake CVs
-for _ in range(10):  # Generate 10 fake CVs
-    collection.insert_one(generate_cv())
 
-print("✅ Fake CVs inserted successfully!")
+if __name__ == "__main__":
+    main()
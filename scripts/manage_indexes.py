@@ -0,0 +1,57 @@
+"""Compare, build and drop MongoDB indexes against app/core/indexes.py.
+
+    python -m scripts.manage_indexes diff              # what build/drop would do
+    python -m scripts.manage_indexes build             # create missing indexes
+    python -m scripts.manage_indexes build --replace   # also rebuild changed ones
+    python -m scripts.manage_indexes drop --yes        # drop undeclared indexes
+
+--collection limits any command to one collection (repeatable).
+"""
+import argparse
+import asyncio
+
+from app.core import database, indexes
+
+
+def print_diff(report: dict):
+    for name, changes in report.items():
+        print(f"== {name}")
+        if not any(changes.values()):
+            print("   up to date")
+        for spec in changes["missing"]:
+            print(f" + {spec.name} {spec.describe()['key']}")
+        for spec in changes["changed"]:
+            print(f" ~ {spec.name} (definition differs, build --replace)")
+        for info in changes["extra"]:
+            print(f" - {info['name']} {dict(info['key'])} (not declared)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("diff", "build", "drop"))
+    parser.add_argument("--collection", action="append", choices=sorted(indexes.INDEXES), help="default: all")
+    parser.add_argument("--replace", action="store_true", help="build: drop and recreate changed indexes")
+    parser.add_argument("--yes", action="store_true", help="drop: actually drop (otherwise only list)")
+    args = parser.parse_args()
+
+    await database.connect()
+    try:
+        db = database.get_database()
+        if args.command == "build":
+            created = await indexes.build(db, args.collection, replace=args.replace)
+            print(f"✅ Created {len(created)} index(es)" + (f": {', '.join(created)}" if created else ""))
+        elif args.command == "drop":
+            if not args.yes:
+                print_diff(await indexes.diff(db, args.collection))
+                print("\nRe-run with --yes to drop the indexes marked '-'")
+                return
+            dropped = await indexes.drop_extra(db, args.collection)
+            print(f"✅ Dropped {len(dropped)} index(es)" + (f": {', '.join(dropped)}" if dropped else ""))
+        else:
+            print_diff(await indexes.diff(db, args.collection))
+    finally:
+        await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
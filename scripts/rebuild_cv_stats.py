@@ -0,0 +1,23 @@
+"""Recompute the materialized dashboard counters from the CV collection.
+
+Run after bulk changes made outside the API, or to repair drift:
+
+    python -m scripts.rebuild_cv_stats
+"""
+import asyncio
+
+from app.core import database
+from app.services import analytics_store
+
+
+async def main():
+    await database.connect()
+    try:
+        total = await analytics_store.rebuild()
+    finally:
+        await database.close()
+    print(f"✅ Stats rebuilt from {total} CVs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())